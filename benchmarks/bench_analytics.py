@@ -0,0 +1,100 @@
+"""
+Onboarding analytics: the incrementally maintained summary against
+aggregating the student table on every request.
+
+1. Reads: ``GET /api/analytics/`` (all dimensions, per month and in total)
+   through the WSGI application, against the same counts computed with one
+   GROUP BY over student_onboarding per dimension.
+2. Writes: the cost the summary adds to each create (one transaction, as
+   the API saves), with the pre/post_save receivers connected and
+   disconnected.
+3. ``rebuild_onboarding_summary`` time for the seeded table.
+
+    python benchmarks/bench_analytics.py --rows 200000
+"""
+import argparse
+import os
+import time
+
+from common import measure, print_table, seed_students, setup_django, student_row, summarize
+from drivers import Request, wsgi_environ
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--requests', type=int, default=20, help='requests per read measurement')
+    parser.add_argument('--creates', type=int, default=1000, help='students created per write measurement')
+    args = parser.parse_args()
+
+    db_path = setup_django(extra_settings='ALLOWED_HOSTS = ["*"]')
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import transaction
+    from django.db.models import Count
+    from django.db.models.functions import TruncMonth
+    from django.db.models.signals import post_save, pre_save
+    from onboarding import signals
+    from onboarding.analytics import DIMENSIONS, rebuild_summary
+    from onboarding.models import OnboardingDailySummary, StudentOnboarding
+
+    seed_students(args.rows, progress=False)
+    started = time.perf_counter()
+    rebuild_summary()
+    print(
+        f'rebuild: {args.rows:,} students -> {OnboardingDailySummary.objects.count():,} summary rows '
+        f'in {time.perf_counter() - started:.2f}s\n'
+    )
+
+    handler = WSGIHandler()
+
+    def endpoint(query):
+        def call():
+            body = handler(wsgi_environ(Request('GET', '/api/analytics/', query)), lambda *a: None)
+            b''.join(body)
+            body.close()
+        return call
+
+    def live(group):
+        def call():
+            for field, label, expression in DIMENSIONS.values():
+                rows = StudentOnboarding.objects.annotate(summary_value=expression)
+                if group:
+                    rows = rows.annotate(period=TruncMonth('created_at')).values('period', 'summary_value')
+                else:
+                    rows = rows.values('summary_value')
+                list(rows.annotate(students=Count('id')).order_by())
+        return call
+
+    rows = []
+    for name, group, query in (('per month', True, 'group_by=month'), ('total', False, 'group_by=total')):
+        for source, fn in (('GROUP BY students', live(group)), ('summary table', endpoint(query))):
+            stats = summarize(measure(fn, args.requests))
+            rows.append((name, source, f"{stats['mean_ms']:.1f}", f"{stats['p95_ms']:.1f}"))
+    print_table(('grouping', 'source', 'mean ms', 'p95 ms'), rows)
+
+    def creates(offset):
+        def create():
+            # As the API saves: the row and its summary counts in one transaction
+            with transaction.atomic():
+                StudentOnboarding(**student_row(offset + len(samples))).save(full_clean=False)
+        samples = []
+        for _ in range(args.creates):
+            started = time.perf_counter()
+            create()
+            samples.append(time.perf_counter() - started)
+        return summarize(samples)
+
+    with_summary = creates(10 ** 8)
+    pre_save.disconnect(signals.remember_summary_values, sender=StudentOnboarding)
+    post_save.disconnect(signals.update_daily_summary, sender=StudentOnboarding)
+    without_summary = creates(2 * 10 ** 8)
+    print()
+    print_table(('save()', 'mean ms', 'p95 ms'), [
+        ('without summary', f"{without_summary['mean_ms']:.3f}", f"{without_summary['p95_ms']:.3f}"),
+        ('with summary', f"{with_summary['mean_ms']:.3f}", f"{with_summary['p95_ms']:.3f}"),
+    ])
+    os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
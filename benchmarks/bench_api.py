@@ -0,0 +1,241 @@
+"""
+End-to-end load and latency suite for the onboarding API.
+
+Seeds a database with synthetic students, then drives every scenario through
+the WSGI and/or ASGI application at each concurrency level and reports
+throughput, p50/p95/p99 latency, errors and SQL queries per request.
+Results are written as JSON; ``--compare`` checks them against an earlier
+run and exits non-zero when a scenario regressed beyond ``--threshold``.
+
+    python benchmarks/bench_api.py --rows 100000 --clients 1 16 64 --output baseline.json
+    # ... change the code ...
+    python benchmarks/bench_api.py --rows 100000 --clients 1 16 64 --output after.json --compare baseline.json
+
+Seeding 1M rows takes a while; ``--db`` keeps the seeded file for later runs
+(rows already present are not seeded again).
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from common import ROOT, print_table, seed_students, setup_django, student_row, summarize
+from drivers import (
+    Request,
+    install_query_counter,
+    make_asgi_dispatch,
+    make_wsgi_dispatch,
+    run_clients,
+    use_async_views,
+)
+
+SCENARIOS = ('create', 'list', 'list_deep', 'list_cursor_deep', 'detail', 'update', 'dropdown')
+SERVERS = ('wsgi', 'asgi')
+
+# Depth of the "deep" list scenarios, as a fraction of the table
+DEEP_FRACTION = 0.9
+
+
+def build_scenarios(rows, seed):
+    """Map each scenario name to ``next_request(client, offset)``"""
+    from django.conf import settings
+    from onboarding.models import StudentOnboarding
+    from onboarding.pagination import encode_cursor
+
+    rng = random.Random(seed)
+    ids = list(StudentOnboarding.objects.values_list('id', flat=True))
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    deep_offset = int(len(ids) * DEEP_FRACTION)
+    deep_page = max(1, deep_offset // page_size)
+    deep_position = (
+        StudentOnboarding.objects.order_by('-created_at', '-id').values_list('created_at', 'id')[deep_offset]
+    )
+    deep_cursor = encode_cursor(deep_position)
+    # Emails must stay unique across runs that reuse a database
+    emails = itertools.count(max(ids, default=0) + 10 ** 8)
+
+    def create(client, offset):
+        row = student_row(next(emails), rng)
+        return Request('POST', '/api/student-onboarding/create/', body=json.dumps(row, default=str).encode())
+
+    def update(client, offset):
+        body = json.dumps({'mobile_number': f'+1{rng.randint(2000000000, 9999999999)}'}).encode()
+        return Request('PATCH', f'/api/student-onboarding/{rng.choice(ids)}/update/', body=body)
+
+    return {
+        'create': create,
+        'list': lambda client, offset: Request('GET', '/api/student-onboarding/'),
+        'list_deep': lambda client, offset: Request('GET', '/api/student-onboarding/', f'page={deep_page}'),
+        'list_cursor_deep': lambda client, offset: Request('GET', '/api/student-onboarding/', f'cursor={deep_cursor}'),
+        'detail': lambda client, offset: Request('GET', f'/api/student-onboarding/{rng.choice(ids)}/'),
+        'update': update,
+        'dropdown': lambda client, offset: Request('GET', '/api/dropdown-options/'),
+    }
+
+
+def run_scenario(dispatch, next_request, clients, requests):
+    per_client = max(1, math.ceil(requests / clients))
+    # Warm connections, caches and the CMS snapshot before timing
+    asyncio.run(run_clients(dispatch, next_request, min(clients, 4), 5))
+    latencies, query_counts, errors, elapsed = asyncio.run(
+        run_clients(dispatch, next_request, clients, per_client)
+    )
+    stats = summarize(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': len(latencies) / elapsed,
+        'mean_ms': stats['mean_ms'],
+        'p50_ms': stats['p50_ms'],
+        'p95_ms': stats['p95_ms'],
+        'p99_ms': stats['p99_ms'],
+        'queries_per_request': sum(query_counts) / len(query_counts),
+    }
+
+
+def environment():
+    import django
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Rows comparing ``results`` with matching baseline entries, and the list
+    of regressions: p95 or throughput worse than ``threshold`` (a fraction),
+    or more queries per request.
+    """
+    previous = {(r['scenario'], r['server'], r['clients']): r for r in baseline['results']}
+    rows, regressions = [], []
+    for result in results:
+        key = (result['scenario'], result['server'], result['clients'])
+        before = previous.get(key)
+        if before is None:
+            continue
+        p95_change = result['p95_ms'] / before['p95_ms'] - 1 if before['p95_ms'] else 0.0
+        throughput_change = result['throughput_rps'] / before['throughput_rps'] - 1 if before['throughput_rps'] else 0.0
+        query_change = result['queries_per_request'] - before['queries_per_request']
+        reasons = []
+        if p95_change > threshold:
+            reasons.append(f'p95 +{p95_change:.0%}')
+        if throughput_change < -threshold:
+            reasons.append(f'throughput {throughput_change:.0%}')
+        if query_change > 0.05:
+            reasons.append(f'queries +{query_change:.2f}')
+        if reasons:
+            regressions.append((key, reasons))
+        rows.append((
+            *key, f'{p95_change:+.0%}', f'{throughput_change:+.0%}', f'{query_change:+.2f}',
+            ', '.join(reasons) or 'ok',
+        ))
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000, help='students in the database (10k to 1M)')
+    parser.add_argument('--db', help='SQLite file to seed and keep (default: a temporary file)')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--servers', nargs='+', choices=SERVERS, default=list(SERVERS))
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 16, 64], help='concurrency levels')
+    parser.add_argument('--requests', type=int, default=400, help='requests per scenario and level')
+    parser.add_argument('--threads', type=int, default=8, help='WSGI worker threads')
+    parser.add_argument('--asgi-views', choices=('async', 'sync'), default='async',
+                        help='views served under ASGI (ONBOARDING_ASYNC_VIEWS)')
+    parser.add_argument('--queued-creates', action='store_true',
+                        help='create answers 202 and queues (ONBOARDING_QUEUED_CREATES); nothing drains the queue')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='bench_api_results.json')
+    parser.add_argument('--compare', help='earlier results JSON to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed p95/throughput change (0.10 = 10%%)')
+    args = parser.parse_args()
+
+    keep_db = args.db is not None
+    db_path = setup_django(args.db, extra_settings='ALLOWED_HOSTS = ["*"]')
+    from django.conf import settings
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+    from onboarding.models import StudentOnboarding
+
+    existing = StudentOnboarding.objects.count()
+    if existing < args.rows:
+        print(f'Seeding {args.rows - existing:,} rows...', file=sys.stderr)
+        seed_students(args.rows - existing, start=existing, seed=args.seed)
+    settings.ONBOARDING_QUEUED_CREATES = args.queued_creates
+    install_query_counter()
+    scenarios = build_scenarios(args.rows, args.seed)
+
+    factories = {
+        'wsgi': (False, lambda: make_wsgi_dispatch(get_wsgi_application(), args.threads)),
+        'asgi': (args.asgi_views == 'async', lambda: make_asgi_dispatch(get_asgi_application())),
+    }
+    results = []
+    for server in args.servers:
+        async_views, factory = factories[server]
+        use_async_views(async_views)
+        for name in args.scenarios:
+            for clients in args.clients:
+                dispatch, shutdown = factory()
+                try:
+                    result = run_scenario(dispatch, scenarios[name], clients, args.requests)
+                finally:
+                    shutdown()
+                results.append({'scenario': name, 'server': server, 'clients': clients, **result})
+                print(f'  {server} {name} x{clients}: {result["throughput_rps"]:,.0f} req/s', file=sys.stderr)
+
+    print_table(
+        ('scenario', 'server', 'clients', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'queries', 'errors'),
+        [(
+            r['scenario'], r['server'], r['clients'], f"{r['throughput_rps']:,.0f}", f"{r['p50_ms']:.1f}",
+            f"{r['p95_ms']:.1f}", f"{r['p99_ms']:.1f}", f"{r['queries_per_request']:.2f}", r['errors'],
+        ) for r in results],
+    )
+
+    report = {
+        'environment': environment(),
+        'config': {
+            'rows': StudentOnboarding.objects.count(), 'threads': args.threads,
+            'requests': args.requests, 'asgi_views': args.asgi_views, 'queued_creates': args.queued_creates,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2)
+    print(f'\nResults written to {args.output}')
+
+    if not keep_db:
+        os.unlink(db_path)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+        rows, regressions = compare(results, baseline, args.threshold)
+        print()
+        print_table(('scenario', 'server', 'clients', 'p95', 'req/s', 'queries', 'verdict'), rows)
+        if regressions:
+            print(f'\n{len(regressions)} regression(s) beyond {args.threshold:.0%}', file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Hot-tier size and read latency before and after archiving.
+
+Seeds ``--rows`` students created (and last updated) over the past year,
+then measures through the WSGI application:
+
+* the list's first page with its COUNT (page-number pagination) and the
+  first cursor page
+* the detail of random live students
+* the hot tables' size (student_onboarding, its indexes, the search index
+  and student_family_abroad), from SQLite's dbstat
+
+It then archives everything not updated for ``--keep-days`` days with
+``archive_students`` and measures again, adding the ``?include_archived=1``
+pages and the detail of archived students. The detail cache is off so every
+detail request reads the database.
+
+    python benchmarks/bench_archive.py --rows 100000 --keep-days 90
+"""
+import argparse
+import os
+import random
+import time
+from datetime import timedelta
+
+from common import measure, print_table, seed_students, setup_django, summarize
+from drivers import Request, wsgi_environ
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--keep-days', type=int, default=90, help='Students updated within this many days stay hot')
+    parser.add_argument('--repeat', type=int, default=200, help='Requests per measurement')
+    args = parser.parse_args()
+
+    db_path = setup_django(extra_settings='ALLOWED_HOSTS = ["*"]\nONBOARDING_DETAIL_CACHE_TIMEOUT = 0')
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.utils import timezone
+    from onboarding.archive import ARCHIVE_TABLES, HOT_TABLES, archive_students, tier_bytes
+    from onboarding.models import StudentArchiveEntry, StudentOnboarding
+
+    seed_students(args.rows)
+    handler = WSGIHandler()
+    rng = random.Random(7)
+
+    def call(path, query=''):
+        response = []
+        result = handler(wsgi_environ(Request('GET', path, query)), lambda status, headers: response.append(status))
+        b''.join(result)
+        result.close()
+        assert response[0].startswith('200'), response[0]
+
+    def detail(ids):
+        return lambda: call(f'/api/student-onboarding/{rng.choice(ids)}/')
+
+    def p50(fn):
+        return f"{summarize(measure(fn, args.repeat))['p50_ms']:.2f}"
+
+    def megabytes(tables):
+        size = tier_bytes(tables)
+        return 'n/a' if size is None else f'{size / 1024 / 1024:.1f}'
+
+    def measurements(suffix=''):
+        live = list(StudentOnboarding.objects.values_list('id', flat=True))
+        return {
+            'hot rows': f'{len(live):,}',
+            'hot MB': megabytes(HOT_TABLES),
+            'archive MB': megabytes(ARCHIVE_TABLES),
+            'list page + count ms': p50(lambda: call('/api/student-onboarding/', suffix)),
+            'cursor page ms': p50(lambda: call('/api/student-onboarding/', f'pagination=cursor&{suffix}')),
+            'live detail ms': p50(detail(live)),
+        }
+
+    before = measurements()
+    started = time.perf_counter()
+    moved = archive_students(timezone.now() - timedelta(days=args.keep_days))
+    print(f'Archived {moved:,} of {args.rows:,} students in {time.perf_counter() - started:.2f}s\n')
+    after = measurements()
+    with_archive = measurements('include_archived=1')
+    archived = list(StudentArchiveEntry.objects.values_list('id', flat=True))
+    if archived:
+        with_archive['live detail ms'] = after['live detail ms']
+        after['archived detail ms'] = with_archive['archived detail ms'] = p50(detail(archived))
+
+    print_table(
+        ('', 'before', 'after', 'after, include_archived'),
+        [(label, before.get(label, '-'), after[label], with_archive[label]) for label in after],
+    )
+    os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Data-cleanup updates: one PATCH per student against the bulk endpoint.
+
+Normalizes ``state`` on ``--updates`` students three ways, through the WSGI
+application with the query count of each:
+
+* per-row: ``PATCH /api/student-onboarding/{id}/update/`` for every student
+* bulk: ``PATCH /api/student-onboarding/bulk-update/`` with ``{id, changes}``
+  items, ``--batch`` per request
+* filter + set: one ``{"filter": ..., "set": ...}`` request, a single UPDATE
+
+    python benchmarks/bench_bulk_update.py --rows 50000 --updates 2000
+"""
+import argparse
+import json
+import os
+import time
+
+from common import print_table, seed_students, setup_django
+from drivers import Request, wsgi_environ
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--updates', type=int, default=2000, help='students changed per method')
+    parser.add_argument('--batch', type=int, default=500, help='items per bulk request')
+    args = parser.parse_args()
+
+    db_path = setup_django(extra_settings='ALLOWED_HOSTS = ["*"]')
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from onboarding.models import StudentOnboarding
+
+    seed_students(args.rows, progress=False)
+    handler = WSGIHandler()
+
+    def call(method, path, body):
+        response = []
+        result = handler(
+            wsgi_environ(Request(method, path, '', json.dumps(body).encode())),
+            lambda status, headers: response.append(status),
+        )
+        b''.join(result)
+        result.close()
+        assert response[0].startswith(('200', '207')), response[0]
+
+    ids = list(StudentOnboarding.objects.order_by('id').values_list('id', flat=True)[:3 * args.updates])
+    groups = [ids[i * args.updates:(i + 1) * args.updates] for i in range(3)]
+    rows = []
+
+    def run(name, fn):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - started
+        rows.append((name, f'{elapsed:.2f}', f'{args.updates / elapsed:,.0f}', f'{len(queries):,}'))
+
+    run('per-row PATCH', lambda: [
+        call('PATCH', f'/api/student-onboarding/{pk}/update/', {'state': 'Per Row'}) for pk in groups[0]
+    ])
+    run('bulk {id, changes}', lambda: [
+        call('PATCH', '/api/student-onboarding/bulk-update/', [
+            {'id': pk, 'changes': {'state': 'Bulk'}} for pk in groups[1][start:start + args.batch]
+        ]) for start in range(0, args.updates, args.batch)
+    ])
+    StudentOnboarding.objects.filter(id__in=groups[2]).update(state='Calif.')
+    run('filter + set', lambda: call(
+        'PATCH', '/api/student-onboarding/bulk-update/', {'filter': {'state': 'Calif.'}, 'set': {'state': 'CA'}}
+    ))
+    print_table(('method', 'seconds', 'students/s', 'queries'), rows)
+    os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
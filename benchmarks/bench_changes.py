@@ -0,0 +1,104 @@
+"""
+Incremental sync through the change feed against a full re-pull.
+
+A downstream copy of ``--rows`` students is refreshed after ``k`` of them
+change, for each ``--changes`` value, two ways through the WSGI application:
+
+* full re-pull: walk every cursor page of ``GET /api/student-onboarding/``
+  (``page_size=100``) and diff the result, as consumers did before the feed
+* change feed: follow ``GET /api/student-onboarding/changes/`` from the
+  cursor saved by the previous sync until ``has_more`` is false
+
+Both request the list fields. The table reports requests, response bytes
+and wall time per sync. ONBOARDING_CHANGES_SETTLE is set to 0 so the
+benchmark's own updates are served at once.
+
+    python benchmarks/bench_changes.py --rows 100000 --changes 0 10 1000 10000
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+from common import print_table, seed_students, setup_django
+from drivers import Request, wsgi_environ
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--changes', type=int, nargs='+', default=[0, 10, 1000, 10000])
+    parser.add_argument('--batch', type=int, default=1000, help='page_size of the change feed')
+    args = parser.parse_args()
+
+    db_path = setup_django(extra_settings='ALLOWED_HOSTS = ["*"]\nONBOARDING_CHANGES_SETTLE = 0')
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.utils import timezone
+    from onboarding.models import StudentOnboarding
+    from onboarding.representations import STUDENT_LIST_ITEM
+
+    seed_students(args.rows, progress=False)
+    handler = WSGIHandler()
+    fields = ','.join(STUDENT_LIST_ITEM.fields)
+
+    def call(path, query):
+        response = []
+        result = handler(wsgi_environ(Request('GET', path, query)), lambda status, headers: response.append(status))
+        body = b''.join(result)
+        result.close()
+        assert response[0].startswith('200'), response[0]
+        return body
+
+    def walk(path, query, next_query):
+        """Follow a paginated endpoint; returns (requests, bytes, last payload)"""
+        requests = size = 0
+        while True:
+            body = call(path, query)
+            requests += 1
+            size += len(body)
+            payload = json.loads(body)
+            query = next_query(payload)
+            if query is None:
+                return requests, size, payload
+
+    def full_pull():
+        return walk(
+            '/api/student-onboarding/', 'pagination=cursor&page_size=100',
+            lambda payload: payload['next'].split('?', 1)[1] if payload['next'] else None,
+        )
+
+    def feed(cursor):
+        query = f'page_size={args.batch}&fields={fields}'
+        return walk(
+            '/api/student-onboarding/changes/', query + (f'&cursor={cursor}' if cursor else ''),
+            lambda payload: f"{query}&cursor={payload['cursor']}" if payload['has_more'] else None,
+        )
+
+    started = time.perf_counter()
+    requests, size, payload = feed(None)
+    print(f'Initial feed sync: {requests:,} requests, {size / 1e6:.1f} MB in {time.perf_counter() - started:.2f}s\n')
+    cursor = payload['cursor']
+
+    ids = list(StudentOnboarding.objects.values_list('id', flat=True))
+    rng = random.Random(7)
+    rows = []
+    for changes in args.changes:
+        changed = rng.sample(ids, min(changes, len(ids)))
+        for start in range(0, len(changed), 500):
+            StudentOnboarding.objects.filter(id__in=changed[start:start + 500]).update(
+                city='Shelbyville', updated_at=timezone.now(),
+            )
+        for label, sync in (('full re-pull', full_pull), ('change feed', lambda: feed(cursor))):
+            started = time.perf_counter()
+            requests, size, payload = sync()
+            elapsed = time.perf_counter() - started
+            rows.append((f'{changes:,}', label, f'{requests:,}', f'{size / 1e3:,.0f}', f'{elapsed * 1000:,.1f}'))
+        cursor = payload['cursor']
+
+    print_table(('changed', 'sync', 'requests', 'KB', 'ms'), rows)
+    os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
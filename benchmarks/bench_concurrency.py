@@ -0,0 +1,119 @@
+"""
+Compare the sync DRF read views under WSGI with the async views under ASGI.
+
+Both applications are driven in-process, so the numbers reflect the
+framework and view code rather than a particular server or network stack.
+N concurrent clients each send a few requests back to back.
+
+- WSGI: each request runs on a fixed pool of worker threads, as a threaded
+  WSGI server does (``--threads``, default 8). Clients beyond the pool size
+  queue, and that wait shows up in their latency.
+- ASGI: every request runs as a task on one event loop with the async views
+  (ONBOARDING_ASYNC_VIEWS).
+
+``--io-wait-ms`` adds a fixed non-blocking wait to every request (a stand-in
+for a remote cache or auth call), which is where the thread pool saturates.
+``--middleware minimal`` drops the admin-oriented middleware: on Django 4.2
+each MiddlewareMixin hook costs an ASGI request a thread hop.
+
+    python benchmarks/bench_concurrency.py --rows 20000 --clients 100 250 500 1000
+    python benchmarks/bench_concurrency.py --io-wait-ms 20 --middleware minimal
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+from django.utils.decorators import sync_and_async_middleware
+
+from common import print_table, seed_students, setup_django, summarize
+from drivers import Request, make_asgi_dispatch, make_wsgi_dispatch, run_clients, use_async_views
+
+ENDPOINTS = ('list', 'detail', 'dropdown')
+MINIMAL_MIDDLEWARE = ['corsheaders.middleware.CorsMiddleware']
+
+
+@sync_and_async_middleware
+def io_wait_middleware(get_response):
+    """Wait BENCH_IO_WAIT_MS per request: blocking a thread under WSGI, yielding under ASGI"""
+    from django.conf import settings
+    delay = settings.BENCH_IO_WAIT_MS / 1000
+
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            await asyncio.sleep(delay)
+            return await get_response(request)
+    else:
+        def middleware(request):
+            time.sleep(delay)
+            return get_response(request)
+    return middleware
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--clients', type=int, nargs='+', default=[100, 250, 500, 1000])
+    parser.add_argument('--per-client', type=int, default=3, help='requests each client sends')
+    parser.add_argument('--threads', type=int, default=8, help='WSGI worker threads')
+    parser.add_argument('--endpoints', nargs='+', choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument('--io-wait-ms', type=float, default=0, help='simulated remote wait per request')
+    parser.add_argument('--middleware', choices=('project', 'minimal'), default='project')
+    args = parser.parse_args()
+
+    extra = ['ALLOWED_HOSTS = ["*"]']
+    if args.middleware == 'minimal':
+        extra.append(f'MIDDLEWARE = {MINIMAL_MIDDLEWARE!r}')
+    if args.io_wait_ms:
+        extra.append(f'BENCH_IO_WAIT_MS = {args.io_wait_ms}')
+        extra.append('MIDDLEWARE = MIDDLEWARE + ["bench_concurrency.io_wait_middleware"]')
+    setup_django(extra_settings='\n'.join(extra))
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+    from onboarding.models import StudentOnboarding
+
+    print(f'Seeding {args.rows:,} rows...')
+    seed_students(args.rows)
+    rng = random.Random(1)
+    ids = list(StudentOnboarding.objects.values_list('id', flat=True))
+    requests = {
+        'list': [Request('GET', '/api/student-onboarding/', 'pagination=cursor')],
+        'detail': [Request('GET', f'/api/student-onboarding/{pk}/') for pk in rng.sample(ids, min(len(ids), 500))],
+        'dropdown': [Request('GET', '/api/dropdown-options/')],
+    }
+
+    servers = (
+        ('wsgi', False, lambda: make_wsgi_dispatch(get_wsgi_application(), args.threads)),
+        ('asgi', True, lambda: make_asgi_dispatch(get_asgi_application())),
+    )
+    rows = []
+    for endpoint in args.endpoints:
+        for clients in args.clients:
+            for label, async_views, factory in servers:
+                use_async_views(async_views)
+                dispatch, shutdown = factory()
+                pool = requests[endpoint]
+
+                def next_request(client, offset):
+                    return pool[(client * args.per_client + offset) % len(pool)]
+
+                # Warm up connections, caches and the CMS snapshot before timing
+                asyncio.run(run_clients(dispatch, next_request, 10, 10))
+                latencies, _, errors, elapsed = asyncio.run(
+                    run_clients(dispatch, next_request, clients, args.per_client)
+                )
+                shutdown()
+                stats = summarize(latencies)
+                rows.append((
+                    endpoint, label, clients, f'{len(latencies) / elapsed:,.0f}',
+                    f"{stats['p50_ms']:.1f}", f"{stats['p95_ms']:.1f}", f"{stats['p99_ms']:.1f}", errors,
+                ))
+                print(f'  {endpoint} {label} {clients} clients done', file=sys.stderr)
+
+    print()
+    print_table(('endpoint', 'server', 'clients', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'errors'), rows)
+
+
+if __name__ == '__main__':
+    main()
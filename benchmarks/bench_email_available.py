@@ -0,0 +1,79 @@
+"""
+Email availability checks: the Bloom filter against the plain indexed query.
+
+1. Lookups: ``might_exist`` on free emails against
+   ``StudentOnboarding.objects.filter(email=...).exists()``, in lookups/s,
+   plus the filter's build time, size and observed false-positive rate.
+2. Requests: ``GET /api/email-available/`` through the WSGI application for
+   free and taken emails, with the filter and with every check forced to the
+   database.
+
+    python benchmarks/bench_email_available.py --rows 100000 --lookups 20000
+"""
+import argparse
+import os
+import time
+
+from common import print_table, seed_students, setup_django, student_row
+from drivers import Request, wsgi_environ
+
+
+def rate(fn, values):
+    started = time.perf_counter()
+    for value in values:
+        fn(value)
+    return len(values) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--lookups', type=int, default=20000, help='emails checked per measurement')
+    parser.add_argument('--requests', type=int, default=2000, help='requests per endpoint measurement')
+    args = parser.parse_args()
+
+    db_path = setup_django(extra_settings='ALLOWED_HOSTS = ["*"]')
+    from django.core.handlers.wsgi import WSGIHandler
+    from onboarding import views
+    from onboarding.bloom import email_index, might_exist
+    from onboarding.models import StudentOnboarding
+
+    seed_students(args.rows, progress=False)
+    taken = list(StudentOnboarding.objects.values_list('email', flat=True)[:args.lookups])
+    free = [student_row(index)['email'] for index in range(10 ** 8, 10 ** 8 + args.lookups)]
+
+    started = time.perf_counter()
+    bloom = email_index.get()
+    build = time.perf_counter() - started
+    false_positives = sum(email in bloom for email in free)
+    print(
+        f'filter: {args.rows:,} emails built in {build:.2f}s, {len(bloom.bits) / 1024:,.0f} KiB, '
+        f'{bloom.hashes} hashes, false positives {false_positives / len(free):.4%} '
+        f'(expected {bloom.false_positive_rate(email_index.count):.4%})\n'
+    )
+
+    exists = lambda email: StudentOnboarding.objects.filter(email=email).exists()  # noqa: E731
+    print_table(('lookup', 'free emails/s', 'taken emails/s'), [
+        ('database query', f'{rate(exists, free):,.0f}', f'{rate(exists, taken):,.0f}'),
+        ('bloom filter', f'{rate(might_exist, free):,.0f}', f'{rate(might_exist, taken):,.0f}'),
+    ])
+
+    handler = WSGIHandler()
+
+    def endpoint(emails):
+        def call(email):
+            body = handler(wsgi_environ(Request('GET', '/api/email-available/', f'email={email}')), lambda *a: None)
+            b''.join(body)
+            body.close()
+        return rate(call, emails[:args.requests])
+
+    rows = [('filter + fallback', f'{endpoint(free):,.0f}', f'{endpoint(taken):,.0f}')]
+    views.might_exist = lambda email: True
+    rows.insert(0, ('database only', f'{endpoint(free):,.0f}', f'{endpoint(taken):,.0f}'))
+    print()
+    print_table(('GET /email-available/', 'free req/s', 'taken req/s'), rows)
+    os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
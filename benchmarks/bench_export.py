@@ -0,0 +1,55 @@
+"""
+Measure streaming export throughput and peak memory for CSV and NDJSON.
+
+    python benchmarks/bench_export.py --rows 200000
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+from common import print_table, seed_students, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    from onboarding.exports import EXPORT_FIELDS, stream_export
+    from onboarding.models import StudentOnboarding
+
+    print(f'Seeding {args.rows:,} rows...')
+    seed_students(args.rows)
+
+    def drain(output_format):
+        size = 0
+        for chunk in stream_export(StudentOnboarding.objects.all(), output_format, EXPORT_FIELDS, args.chunk_size):
+            size += len(chunk)
+        return size
+
+    results = []
+    for output_format in ('csv', 'ndjson'):
+        started = time.perf_counter()
+        size = drain(output_format)
+        elapsed = time.perf_counter() - started
+        # tracemalloc slows Python down a lot, so measure memory in a separate pass
+        tracemalloc.start()
+        drain(output_format)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results.append((
+            output_format,
+            f'{args.rows / elapsed:,.0f}',
+            f'{size / elapsed / 1e6:.1f}',
+            f'{peak / 1e6:.1f}',
+        ))
+
+    print_table(('format', 'rows/s', 'MB/s', 'peak MB'), results)
+    os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+``?family_abroad_in=`` through the StudentFamilyAbroad index against a text
+scan of countries_abroad.
+
+For each country set the benchmark times the first list page (20 rows,
+newest first) and the total count, as the list endpoint runs them, once
+through ``filter_students`` (an EXISTS probe per row for the page, an
+``id IN (subquery)`` for the count) and once with the
+``countries_abroad__icontains`` filters a query over the free-text column
+needs. The seed gives 30% of
+students one of DE/FR/JP/UK abroad; a fifth of those name a second country,
+and one student in 200 has AU, the selective case. The StudentFamilyAbroad
+rows are built by the 0009 data migration.
+
+    python benchmarks/bench_family_abroad.py --rows 1000000 --repeat 20
+"""
+import argparse
+import importlib
+import os
+import time
+from functools import reduce
+from operator import or_
+from types import SimpleNamespace
+
+from common import measure, print_table, seed_students, setup_django, summarize
+
+COUNTRY_SETS = ['AU', 'JP', 'DE,FR', 'FR,JP,UK']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=20, help='queries per country set and path')
+    parser.add_argument('--page-size', type=int, default=20)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    from django.apps import apps
+    from django.db import connection
+    from django.db.models import Q
+    from onboarding.filters import filter_students
+    from onboarding.models import StudentFamilyAbroad, StudentOnboarding
+
+    print(f'Seeding {args.rows:,} rows...')
+    seed_students(args.rows)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE student_onboarding SET countries_abroad = countries_abroad || "
+            "CASE WHEN countries_abroad = 'DE' THEN ', FR' ELSE ', DE' END "
+            "WHERE countries_abroad IS NOT NULL AND id % 5 = 0"
+        )
+        cursor.execute("UPDATE student_onboarding SET countries_abroad = 'AU', has_family_abroad = 1 WHERE id % 200 = 1")
+    started = time.perf_counter()
+    migration = importlib.import_module('onboarding.migrations.0009_student_family_abroad')
+    migration.populate_family_abroad(apps, SimpleNamespace(connection=connection))
+    print(f'StudentFamilyAbroad: {StudentFamilyAbroad.objects.count():,} rows built in '
+          f'{time.perf_counter() - started:.2f}s\n')
+
+    def run(page_queryset, count_queryset):
+        page_queryset = page_queryset.order_by('-created_at', '-id')
+        page = summarize(measure(lambda: list(page_queryset[:args.page_size]), args.repeat))
+        count = summarize(measure(count_queryset.count, args.repeat))
+        return page['p50_ms'], count['p50_ms']
+
+    rows = []
+    students = StudentOnboarding.objects.all()
+    for codes in COUNTRY_SETS:
+        params = {'family_abroad_in': codes}
+        indexed = run(filter_students(students, params), filter_students(students, params, counting=True))
+        scan = students.filter(reduce(or_, (Q(countries_abroad__icontains=code) for code in codes.split(','))))
+        scan = run(scan, scan)
+        matched = filter_students(students, params, counting=True).count()
+        for label, (page, count) in (('family_abroad_in', indexed), ('icontains scan', scan)):
+            rows.append((codes, f'{matched:,}', label, f'{page:.2f}', f'{count:.2f}'))
+        rows.append((codes, '', 'speedup', f'{scan[0] / indexed[0]:.1f}x', f'{scan[1] / indexed[1]:.1f}x'))
+
+    print_table(('countries', 'matches', 'path', 'page p50 ms', 'count p50 ms'), rows)
+    os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Measure import_students throughput for different worker counts.
+
+Writes a synthetic NDJSON file (with a sprinkling of invalid rows), then
+imports it into a fresh database once per worker count.
+
+    python benchmarks/bench_import.py --rows 200000 --workers 0 2 4
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from common import print_table, setup_django, student_row
+
+
+def write_input(path, rows):
+    rng = random.Random(7)
+    with open(path, 'w', encoding='utf-8') as handle:
+        for index in range(rows):
+            row = student_row(index, rng)
+            if index % 50 == 0:
+                row['mobile_number'] = 'not-a-phone'
+            handle.write(json.dumps(row, default=str) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 2, 4])
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    from django.core.management import call_command
+    from onboarding.models import StudentOnboarding
+
+    directory = tempfile.mkdtemp(prefix='onboarding-import-')
+    input_path = os.path.join(directory, 'students.ndjson')
+    write_input(input_path, args.rows)
+
+    results = []
+    for workers in args.workers:
+        StudentOnboarding.objects.all().delete()
+        started = time.perf_counter()
+        with open(os.devnull, 'w') as devnull:
+            call_command(
+                'import_students', input_path, '--workers', str(workers),
+                '--chunk-size', str(args.chunk_size), stdout=devnull, stderr=devnull
+            )
+        elapsed = time.perf_counter() - started
+        results.append((workers, StudentOnboarding.objects.count(), f'{elapsed:.1f}', f'{args.rows / elapsed:,.0f}'))
+
+    print_table(('workers', 'imported', 'seconds', 'rows/s'), results)
+    os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Cost of RequestMetricsMiddleware per request and of the SQL recorder per query.
+
+1. Isolated: the middleware around a view that returns immediately, against
+   the bare view.
+2. Per query: ``SELECT 1`` with no recorder, with the recorder outside a
+   request, and with the recorder inside a request.
+3. End to end: the WSGI application with and without the middleware on the
+   dropdown (no SQL) and list (two queries) endpoints. Rounds alternate
+   between the two handlers and the median round is reported.
+
+    python benchmarks/bench_metrics.py --iterations 20000
+"""
+import argparse
+import os
+import statistics
+import time
+
+from common import print_table, seed_students, setup_django
+from drivers import Request, wsgi_environ
+
+
+def per_call_us(fn, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20000, help='calls per isolated measurement')
+    parser.add_argument('--requests', type=int, default=500, help='requests per end-to-end round')
+    parser.add_argument('--rounds', type=int, default=7)
+    args = parser.parse_args()
+
+    db_path = setup_django(extra_settings='ALLOWED_HOSTS = ["*"]')
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+    from django.urls import resolve
+    from onboarding import metrics
+
+    seed_students(1000, progress=False)
+    rows = []
+
+    # 1. Middleware around a trivial view
+    request = RequestFactory().get('/api/dropdown-options/')
+    request.resolver_match = resolve('/api/dropdown-options/')
+    response = HttpResponse(b'{}')
+    view = lambda request: response  # noqa: E731
+    middleware = metrics.RequestMetricsMiddleware(view)
+    bare = min(per_call_us(lambda: view(request), args.iterations) for _ in range(3))
+    wrapped = min(per_call_us(lambda: middleware(request), args.iterations) for _ in range(3))
+    rows.append(('middleware, trivial view', f'{bare:.2f}', f'{wrapped:.2f}', f'{wrapped - bare:+.2f}'))
+
+    # 2. SQL recorder per query
+    cursor = connection.cursor()
+    query = lambda: cursor.execute('SELECT 1')  # noqa: E731
+    connection.execute_wrappers.clear()
+    no_recorder = min(per_call_us(query, args.iterations) for _ in range(3))
+    metrics.install_query_recorder()
+    cursor = connection.cursor()
+    idle = min(per_call_us(query, args.iterations) for _ in range(3))
+    token = metrics._request_stats.set([0, 0.0])
+    recording = min(per_call_us(query, args.iterations) for _ in range(3))
+    metrics._request_stats.reset(token)
+    rows.append(('query, recorder idle', f'{no_recorder:.2f}', f'{idle:.2f}', f'{idle - no_recorder:+.2f}'))
+    rows.append(('query, recorder in request', f'{no_recorder:.2f}', f'{recording:.2f}', f'{recording - no_recorder:+.2f}'))
+
+    # 3. Full WSGI stack with and without the middleware
+    with_metrics = WSGIHandler()
+    settings.MIDDLEWARE = [name for name in settings.MIDDLEWARE if name != 'onboarding.metrics.RequestMetricsMiddleware']
+    without_metrics = WSGIHandler()
+    for label, path, query_string in (
+        ('dropdown (0 queries)', '/api/dropdown-options/', ''),
+        ('list (2 queries)', '/api/student-onboarding/', ''),
+    ):
+        request = Request('GET', path, query_string)
+
+        def run(handler):
+            started = time.perf_counter()
+            for _ in range(args.requests):
+                body = handler(wsgi_environ(request), lambda status, headers: None)
+                b''.join(body)
+                body.close()
+            return (time.perf_counter() - started) / args.requests * 1e6
+
+        run(with_metrics), run(without_metrics)
+        timings = {'off': [], 'on': []}
+        for _ in range(args.rounds):
+            timings['off'].append(run(without_metrics))
+            timings['on'].append(run(with_metrics))
+        off, on = statistics.median(timings['off']), statistics.median(timings['on'])
+        rows.append((f'request, {label}', f'{off:.1f}', f'{on:.1f}', f'{on - off:+.1f}'))
+
+    print_table(('measurement', 'without us', 'with us', 'added us'), rows)
+    os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare FTS5 search against the admin-style icontains search.
+
+One database grows through the requested sizes. For every search term the benchmark fetches
+the first page (20 rows) and the total count, as the list endpoint and the
+admin changelist do.
+
+    python benchmarks/bench_search.py --rows 100000 1000000 --queries 50
+"""
+import argparse
+import os
+import random
+
+from common import measure, print_table, seed_students, setup_django, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--queries', type=int, default=50, help='search terms per path and size')
+    parser.add_argument('--page-size', type=int, default=20)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    from django.db import connection
+    from onboarding.models import StudentOnboarding
+    from onboarding.search import FTS_TABLE, icontains_filter, search_students
+
+    rows = []
+    seeded = 0
+    for size in sorted(args.rows):
+        print(f'Seeding up to {size:,} rows...')
+        seed_students(size - seeded, start=seeded)
+        seeded = size
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+        rng = random.Random(size)
+        sample = list(
+            StudentOnboarding.objects.order_by('?').values_list('first_name', 'last_name', 'email')[:args.queries]
+        )
+        # Mix a selective term (email prefix) with a broad one (name prefixes)
+        terms = []
+        for first, last, email in sample:
+            terms.append(email.split('@')[0][:-1] if rng.random() < 0.5 else f'{first[:3]} {last[:4]}')
+
+        def run(build):
+            iterator = iter(terms)
+
+            def query():
+                queryset = build(StudentOnboarding.objects.all(), next(iterator))
+                list(queryset[:args.page_size])
+                queryset.count()
+            return summarize(measure(query, len(terms)))
+
+        fts = run(search_students)
+        like = run(lambda queryset, term: queryset.filter(icontains_filter(term)).order_by('-created_at', '-id'))
+        for label, stats in (('fts5', fts), ('icontains', like)):
+            rows.append((f'{size:,}', label, f"{stats['p50_ms']:.2f}", f"{stats['p95_ms']:.2f}", f"{stats['mean_ms']:.2f}"))
+        rows.append((f'{size:,}', 'speedup', f"{like['p50_ms'] / fts['p50_ms']:.1f}x", '', ''))
+
+    print()
+    print_table(('rows', 'path', 'p50 ms', 'p95 ms', 'mean ms'), rows)
+    os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
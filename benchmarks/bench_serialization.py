@@ -0,0 +1,71 @@
+"""
+Per-row cost of the DRF serializers against the compiled representations.
+
+For the list and detail shapes it times serialization alone (rows already
+fetched) and the full read: the query plus serialization, i.e. model
+instances + ModelSerializer against ``.values()`` rows + CompiledSerializer.
+
+    python benchmarks/bench_serialization.py --rows 5000 --repeat 5
+"""
+import argparse
+import gc
+import os
+import time
+
+from common import print_table, seed_students, setup_django
+
+
+def per_row_us(fn, rows, repeat):
+    """Best-of-``repeat`` time per row in microseconds, with GC paused as timeit does"""
+    best = float('inf')
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return best / rows * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5, help='best of N timings')
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    from onboarding.models import StudentOnboarding
+    from onboarding.representations import STUDENT_DETAIL, STUDENT_LIST_ITEM
+    from onboarding.serializers import StudentOnboardingListSerializer, StudentOnboardingSerializer
+
+    seed_students(args.rows)
+    queryset = StudentOnboarding.objects.order_by('id')
+    instances = list(queryset)
+
+    rows = []
+    for label, serializer_class, compiled in (
+        ('list', StudentOnboardingListSerializer, STUDENT_LIST_ITEM),
+        ('detail', StudentOnboardingSerializer, STUDENT_DETAIL),
+    ):
+        values = list(compiled.values(queryset))
+        timings = {
+            'serialize': (
+                per_row_us(lambda: serializer_class(instances, many=True).data, len(instances), args.repeat),
+                per_row_us(lambda: compiled.many(values), len(values), args.repeat),
+            ),
+            'query+serialize': (
+                per_row_us(lambda: serializer_class(list(queryset), many=True).data, len(instances), args.repeat),
+                per_row_us(lambda: compiled.many(compiled.values(queryset)), len(values), args.repeat),
+            ),
+        }
+        for stage, (drf, fast) in timings.items():
+            rows.append((label, stage, f'{drf:.1f}', f'{fast:.1f}', f'{drf / fast:.1f}x'))
+
+    print_table(('shape', 'stage', 'drf us/row', 'compiled us/row', 'speedup'), rows)
+    os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Concurrent-writer stress test for the SQLite database profiles.
+
+Starts ``--processes`` worker processes against one database file; each
+drives ``--threads`` concurrent clients through the WSGI application, half
+creating students and half updating them (``--update-ratio``). The same
+workload runs once with the base settings (rollback journal, a connection
+per request, unserialized writes) and once with
+student_onboarding.settings_production (WAL, tuned pragmas, persistent
+connections, serialized writes with retries). Reports throughput, latency
+percentiles and "database is locked" errors per profile.
+
+    python benchmarks/bench_sqlite_writes.py --processes 4 --threads 16 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+from common import print_table, seed_students, setup_django, student_row, summarize
+from drivers import Request, make_wsgi_dispatch, run_clients
+
+PROFILES = {
+    'default': 'student_onboarding.settings',
+    'production': 'student_onboarding.settings_production',
+}
+EXTRA_SETTINGS = 'ALLOWED_HOSTS = ["*"]'
+
+
+def worker(args):
+    """One writer process: wait for the parent's go, run the workload, print JSON"""
+    setup_django(args.db, PROFILES[args.profile], migrate=False, extra_settings=EXTRA_SETTINGS)
+    from django.core.signals import got_request_exception
+    from django.core.wsgi import get_wsgi_application
+    from onboarding.database import is_lock_error
+    from onboarding.models import StudentOnboarding
+
+    lock_errors = []
+    got_request_exception.connect(
+        lambda sender, request=None, **kwargs: lock_errors.append(1) if is_lock_error(sys.exc_info()[1]) else None,
+        weak=False,
+    )
+    ids = list(StudentOnboarding.objects.values_list('id', flat=True))
+    rng = random.Random(args.worker_index)
+    # Unique per process and per profile run so creates never collide on email
+    emails = iter(range((args.worker_index + 1) * 10 ** 7 + args.run * 10 ** 6, 10 ** 9))
+
+    def next_request(client, offset):
+        if rng.random() < args.update_ratio:
+            body = json.dumps({'mobile_number': f'+1{rng.randint(2000000000, 9999999999)}'}).encode()
+            return Request('PATCH', f'/api/student-onboarding/{rng.choice(ids)}/update/', body=body)
+        row = student_row(next(emails), rng)
+        return Request('POST', '/api/student-onboarding/create/', body=json.dumps(row, default=str).encode())
+
+    dispatch, shutdown = make_wsgi_dispatch(get_wsgi_application(), args.threads)
+    print('ready', flush=True)
+    sys.stdin.readline()
+    try:
+        latencies, _, errors, elapsed = asyncio.run(
+            run_clients(dispatch, next_request, args.threads, max(1, args.requests // args.threads))
+        )
+    finally:
+        shutdown()
+    print(json.dumps({'latencies': latencies, 'errors': errors, 'lock_errors': len(lock_errors), 'elapsed': elapsed}))
+
+
+def run_profile(args, profile, run):
+    command = [
+        sys.executable, os.path.abspath(__file__), '--worker', '--profile', profile, '--db', args.db,
+        '--threads', str(args.threads), '--requests', str(args.requests),
+        '--update-ratio', str(args.update_ratio), '--run', str(run),
+    ]
+    processes = [
+        subprocess.Popen(command + ['--worker-index', str(index)], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        if process.stdout.readline().strip() != 'ready':
+            sys.exit(f'{profile} worker failed to start')
+    # Release every process at once so they contend from the first request
+    for process in processes:
+        process.stdin.write('go\n')
+        process.stdin.flush()
+    results = [json.loads(process.communicate()[0]) for process in processes]
+
+    latencies = [latency for result in results for latency in result['latencies']]
+    stats = summarize(latencies)
+    return {
+        'profile': profile,
+        'requests': len(latencies),
+        'errors': sum(result['errors'] for result in results),
+        'lock_errors': sum(result['lock_errors'] for result in results),
+        'throughput_rps': len(latencies) / max(result['elapsed'] for result in results),
+        **{key: stats[key] for key in ('p50_ms', 'p95_ms', 'p99_ms')},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000, help='students seeded before the run')
+    parser.add_argument('--processes', type=int, default=4, help='writer processes')
+    parser.add_argument('--threads', type=int, default=16, help='concurrent clients per process')
+    parser.add_argument('--requests', type=int, default=200, help='requests per process')
+    parser.add_argument('--update-ratio', type=float, default=0.5, help='fraction of requests that update')
+    parser.add_argument('--profiles', nargs='+', choices=PROFILES, default=list(PROFILES))
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--profile', choices=PROFILES, help=argparse.SUPPRESS)
+    parser.add_argument('--worker-index', type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument('--run', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        return worker(args)
+
+    args.db = setup_django(extra_settings=EXTRA_SETTINGS)
+    from django.db import connection
+
+    seed_students(args.rows, progress=False)
+    results = []
+    for run, profile in enumerate(args.profiles):
+        # WAL is a property of the file; start the base profile from the rollback journal
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode = ' + ('WAL' if profile == 'production' else 'DELETE'))
+        connection.close()
+        started = time.perf_counter()
+        results.append(run_profile(args, profile, run))
+        print(f'  {profile}: {time.perf_counter() - started:.1f}s', file=sys.stderr)
+
+    print_table(
+        ('profile', 'requests', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'errors', 'lock errors'),
+        [(
+            r['profile'], r['requests'], f"{r['throughput_rps']:,.0f}", f"{r['p50_ms']:.1f}",
+            f"{r['p95_ms']:.1f}", f"{r['p99_ms']:.1f}", r['errors'], r['lock_errors'],
+        ) for r in results],
+    )
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(args.db + suffix):
+            os.unlink(args.db + suffix)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Cold start of the WSGI and ASGI applications under each settings profile.
+
+For every profile and server, a fresh interpreter imports
+``student_onboarding.wsgi`` or ``student_onboarding.asgi`` (``django.setup()``,
+app loading and the middleware chain), then sends its first request,
+``GET /api/student-onboarding/``, followed by ``--requests`` more. The table
+reports the median over ``--runs`` processes of:
+
+* setup: importing the application module
+* first request: URLconf, view modules and the first query
+* warm p50: later requests, i.e. the per-request middleware and renderer cost
+* modules: entries in sys.modules after the first request
+
+Profiles: ``full`` is settings_production (admin, sessions, messages,
+staticfiles, the browsable API), ``api`` is settings_api.
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from common import print_table, seed_students, setup_django, write_settings_module
+
+PROFILES = {
+    'full': 'student_onboarding.settings_production',
+    'api': 'student_onboarding.settings_api',
+}
+SERVERS = ('wsgi', 'asgi')
+PATH = '/api/student-onboarding/'
+
+
+def child(server, requests):
+    """Runs in the measured interpreter; prints one JSON line"""
+    started = time.perf_counter()
+    application = importlib.import_module(f'student_onboarding.{server}').application
+    loaded = time.perf_counter()
+
+    from drivers import Request, make_asgi_dispatch, make_wsgi_dispatch
+    if server == 'wsgi':
+        dispatch, shutdown = make_wsgi_dispatch(application, 1)
+    else:
+        dispatch, shutdown = make_asgi_dispatch(application)
+
+    async def run():
+        status, queries = await dispatch(Request('GET', PATH))
+        assert status == 200, status
+        first = time.perf_counter()
+        samples = []
+        for _ in range(requests):
+            sent = time.perf_counter()
+            await dispatch(Request('GET', PATH))
+            samples.append(time.perf_counter() - sent)
+        return first, samples
+
+    first, samples = asyncio.run(run())
+    shutdown()
+    print(json.dumps({
+        'setup_ms': (loaded - started) * 1000,
+        'first_ms': (first - loaded) * 1000,
+        'warm_ms': statistics.median(samples) * 1000 if samples else 0.0,
+        'modules': len(sys.modules),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Fresh processes per profile and server')
+    parser.add_argument('--requests', type=int, default=200, help='Requests after the first, for the warm p50')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--child', choices=SERVERS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child, args.requests)
+
+    # Migrated with the full profile: it owns the admin and session tables
+    db_path = setup_django(settings_module=PROFILES['full'], extra_settings='ALLOWED_HOSTS = ["*"]')
+    seed_students(args.rows, progress=False)
+    environments = {}
+    for profile, module in PROFILES.items():
+        write_settings_module(db_path, module, 'ALLOWED_HOSTS = ["*"]')
+        environments[profile] = dict(os.environ)
+
+    rows = []
+    for profile, environment in environments.items():
+        for server in SERVERS:
+            results = []
+            for _ in range(args.runs):
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--child', server, '--requests', str(args.requests)],
+                    env=environment, capture_output=True, text=True, check=True,
+                ).stdout
+                results.append(json.loads(output.splitlines()[-1]))
+
+            def median(key):
+                return statistics.median(result[key] for result in results)
+
+            rows.append((
+                profile, server, f"{median('setup_ms'):.1f}", f"{median('first_ms'):.1f}",
+                f"{median('setup_ms') + median('first_ms'):.1f}", f"{median('warm_ms'):.2f}", f"{median('modules'):.0f}",
+            ))
+
+    print_table(('profile', 'server', 'setup ms', 'first request ms', 'cold total ms', 'warm p50 ms', 'modules'), rows)
+    for path in (db_path, f'{db_path}-wal', f'{db_path}-shm'):
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+if __name__ == '__main__':
+    main()
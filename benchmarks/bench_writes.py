@@ -0,0 +1,95 @@
+"""
+Per-create cost of the API write path: the earlier two-pass validation
+against the single-pass serializer.
+
+* two-pass: the serializer with its UniqueValidator SELECT, then save()
+  running full_clean() (field validators again plus a second SELECT)
+* single-pass: StudentOnboardingSerializer as shipped; validation runs once
+  and the unique email check is the INSERT itself
+
+Both render the response with STUDENT_DETAIL, so the difference is the
+validation and the statements issued. Also times the phone/email validators
+with precompiled patterns against re.match on pattern strings.
+
+    python benchmarks/bench_writes.py --creates 2000
+"""
+import argparse
+import json
+import os
+import random
+import re
+import time
+
+from common import measure, print_table, setup_django, student_row, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--creates', type=int, default=2000, help='students created per path')
+    parser.add_argument('--iterations', type=int, default=100000, help='calls per validator measurement')
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.validators import UniqueValidator
+    from onboarding import validators
+    from onboarding.models import StudentOnboarding
+    from onboarding.representations import STUDENT_DETAIL
+    from onboarding.serializers import StudentOnboardingSerializer
+
+    class TwoPassSerializer(StudentOnboardingSerializer):
+        class Meta(StudentOnboardingSerializer.Meta):
+            extra_kwargs = {'email': {'validators': [UniqueValidator(queryset=StudentOnboarding.objects.all())]}}
+
+        def create(self, validated_data):
+            return StudentOnboarding.objects.create(**validated_data)
+
+    rng = random.Random(42)
+    # JSON round trip so the serializers parse strings, as they do for requests
+    payloads = [json.loads(json.dumps(student_row(index, rng), default=str)) for index in range(args.creates * 2)]
+    rows = []
+    for label, serializer_class, batch in (
+        ('two-pass (before)', TwoPassSerializer, payloads[:args.creates]),
+        ('single-pass', StudentOnboardingSerializer, payloads[args.creates:]),
+    ):
+        rows_iter = iter(batch)
+        counts = []
+
+        def create():
+            with CaptureQueriesContext(connection) as queries:
+                serializer = serializer_class(data=next(rows_iter))
+                serializer.is_valid(raise_exception=True)
+                STUDENT_DETAIL.from_instance(serializer.save())
+            counts.append(len(queries))
+
+        stats = summarize(measure(create, len(batch)))
+        rows.append((
+            label, f'{sum(counts) / len(counts):.2f}', f'{stats["mean_ms"] * 1000:.0f}',
+            f'{stats["p50_ms"] * 1000:.0f}', f'{stats["p95_ms"] * 1000:.0f}',
+        ))
+    print_table(('path', 'queries/create', 'mean us', 'p50 us', 'p95 us'), rows)
+
+    print()
+    phone, email = '+1 (234) 567-8901', 'someone.else@example.com'
+
+    def inline_patterns():
+        re.match(r'^\+?1?\d{9,15}$', re.sub(r'[^\d+]', '', phone))
+        re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email)
+
+    def precompiled():
+        validators.validate_phone_number(phone)
+        validators.validate_email_format(email)
+
+    timings = []
+    for label, fn in (('re.match on pattern strings', inline_patterns), ('precompiled', precompiled)):
+        started = time.perf_counter()
+        for _ in range(args.iterations):
+            fn()
+        timings.append((label, f'{(time.perf_counter() - started) / args.iterations * 1e9:.0f}'))
+    print_table(('phone + email validators', 'ns/call'), timings)
+    os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
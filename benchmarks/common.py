@@ -0,0 +1,181 @@
+"""Shared helpers for the standalone benchmark scripts in this directory"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import unicodedata
+from datetime import date
+from decimal import Decimal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+FIRST_NAMES = [
+    'Aarav', 'Aisha', 'Amelia', 'Ananya', 'Arjun', 'Ava', 'Benjamin', 'Chloe', 'Daniel', 'Diya',
+    'Elijah', 'Emma', 'Ethan', 'Fatima', 'Grace', 'Hannah', 'Harper', 'Isabella', 'Ishaan', 'Jack',
+    'James', 'Kabir', 'Liam', 'Lucas', 'Maya', 'Mia', 'Noah', 'Olivia', 'Oliver', 'Priya',
+    'Riya', 'Rohan', 'Saanvi', 'Samuel', 'Sofia', 'Sophie', 'Thomas', 'Vihaan', 'William', 'Zara',
+]
+LAST_NAMES = [
+    'Anderson', 'Brown', 'Chen', 'Das', 'Davis', 'Fischer', 'Garcia', 'Gupta', 'Iyer', 'Johnson',
+    'Khan', 'Kumar', 'Lee', 'Martin', 'Mehta', 'Miller', 'Moore', 'Müller', 'Nair', 'Patel',
+    'Reddy', 'Roy', 'Schmidt', 'Sharma', 'Singh', 'Smith', 'Taylor', 'Thomas', 'Wilson', 'Wong',
+]
+STATES = ['CA', 'NY', 'TX', 'FL', 'IL']
+COUNTRIES = ['United States', 'Canada', 'United Kingdom', 'India', 'Australia']
+PROFESSIONS = ['engineer', 'doctor', 'teacher', 'lawyer', 'business', 'other']
+CITIZENSHIPS = ['US', 'CA', 'UK', 'IN', 'AU', 'OTHER']
+
+
+def write_settings_module(db_path, base='student_onboarding.settings', extra=''):
+    """
+    Write a settings module that points ``base`` at ``db_path`` and select it.
+
+    A real module (rather than patching django.conf.settings in memory) means
+    worker processes and subprocesses started by a benchmark see the same
+    database. Returns the module name.
+    """
+    directory = tempfile.mkdtemp(prefix='onboarding-bench-settings-')
+    name = 'bench_settings'
+    with open(os.path.join(directory, f'{name}.py'), 'w', encoding='utf-8') as handle:
+        handle.write(
+            f'from {base} import *  # noqa: F401,F403\n'
+            f'DATABASES = {{**DATABASES, "default": {{**DATABASES["default"], "NAME": {str(db_path)!r}}}}}\n'
+            f'DEBUG = False\n'
+            f'{extra}\n'
+        )
+    sys.path.insert(0, directory)
+    os.environ['PYTHONPATH'] = os.pathsep.join(filter(None, [directory, ROOT, os.environ.get('PYTHONPATH')]))
+    os.environ['DJANGO_SETTINGS_MODULE'] = name
+    return name
+
+
+def setup_django(db_path=None, settings_module='student_onboarding.settings', migrate=True, extra_settings=''):
+    """
+    Configure Django against a throwaway SQLite file and apply migrations.
+
+    DEBUG is forced off so connection.queries does not grow while seeding.
+    Returns the database path.
+    """
+    if db_path is None:
+        handle, db_path = tempfile.mkstemp(prefix='onboarding-bench-', suffix='.sqlite3')
+        os.close(handle)
+        os.unlink(db_path)
+    write_settings_module(db_path, settings_module, extra_settings)
+
+    import django
+    django.setup()
+    if migrate:
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+    return db_path
+
+
+def ascii_slug(name):
+    """Lower-case ASCII form of a name for email local parts ('Müller' -> 'muller')"""
+    return unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode().lower()
+
+
+def student_row(index, rng=random):
+    """Field values for one synthetic, valid StudentOnboarding row"""
+    first = rng.choice(FIRST_NAMES)
+    last = rng.choice(LAST_NAMES)
+    has_family_abroad = rng.random() < 0.3
+    return {
+        'first_name': first,
+        'last_name': last,
+        'date_of_birth': date(rng.randint(1995, 2015), rng.randint(1, 12), rng.randint(1, 28)),
+        'gender': rng.choice('MFO'),
+        'email': f'{ascii_slug(first)}.{ascii_slug(last)}{index}@example.com',
+        'mobile_number': f'+1{rng.randint(200000000, 999999999)}{index % 10}',
+        'address_line_1': f'{rng.randint(1, 9999)} Main St',
+        'city': 'Springfield',
+        'state': rng.choice(STATES),
+        'country': rng.choice(COUNTRIES),
+        'zipcode': f'{rng.randint(10000, 99999)}',
+        'citizenship': rng.choice(CITIZENSHIPS),
+        'guardian_name': f'{rng.choice(FIRST_NAMES)} {last}',
+        'guardian_relationship': rng.choice(['Mother', 'Father', 'Guardian']),
+        'guardian_phone': f'+1{rng.randint(200000000, 999999999)}{index % 10}',
+        'guardian_email': f'guardian{index}@example.com',
+        'father_name': f'{rng.choice(FIRST_NAMES)} {last}',
+        'father_profession': rng.choice(PROFESSIONS),
+        'mother_name': f'{rng.choice(FIRST_NAMES)} {last}',
+        'mother_profession': rng.choice(PROFESSIONS),
+        'family_income': Decimal(rng.randint(5000, 500000)).quantize(Decimal('0.01')),
+        'number_of_siblings': rng.randint(0, 5),
+        'has_family_abroad': has_family_abroad,
+        'countries_abroad': rng.choice(['DE', 'FR', 'JP', 'UK']) if has_family_abroad else None,
+    }
+
+
+def seed_students(count, start=0, batch_size=10000, seed=42, spread_days=365, progress=True):
+    """
+    Insert ``count`` synthetic students with bulk_create, then spread created_at
+    and updated_at over the last ``spread_days`` days so date filters are realistic.
+    """
+    from django.db import connection, transaction
+    from onboarding.models import StudentOnboarding
+
+    rng = random.Random(seed + start)
+    started = time.perf_counter()
+    for offset in range(start, start + count, batch_size):
+        stop = min(offset + batch_size, start + count)
+        with transaction.atomic():
+            StudentOnboarding.objects.bulk_create(
+                StudentOnboarding(**student_row(index, rng)) for index in range(offset, stop)
+            )
+        if progress:
+            done = stop - start
+            rate = done / (time.perf_counter() - started)
+            print(f'  seeded {done:>9,}/{count:,} rows ({rate:,.0f} rows/s)', end='\r', file=sys.stderr)
+    if progress:
+        print(file=sys.stderr)
+    if spread_days:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE student_onboarding SET "
+                "created_at = datetime('now', '-' || (abs(random()) %% %s) || ' seconds')",
+                [spread_days * 86400],
+            )
+            cursor.execute('UPDATE student_onboarding SET updated_at = created_at')
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Latency summary in milliseconds for a list of durations in seconds"""
+    return {
+        'count': len(samples),
+        'mean_ms': statistics.fmean(samples) * 1000 if samples else 0.0,
+        'p50_ms': percentile(samples, 0.50) * 1000,
+        'p95_ms': percentile(samples, 0.95) * 1000,
+        'p99_ms': percentile(samples, 0.99) * 1000,
+    }
+
+
+def measure(fn, repeat):
+    """Call ``fn`` ``repeat`` times and return the individual durations in seconds"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    line = '  '.join(f'{{:>{width}}}' for width in widths)
+    print(line.format(*headers))
+    for row in rows:
+        print(line.format(*row))
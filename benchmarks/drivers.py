@@ -0,0 +1,156 @@
+"""
+In-process HTTP drivers for the WSGI and ASGI applications.
+
+The load benchmarks call the Django applications directly (no sockets), so
+they measure the framework, middleware and view code. Each driver returns
+``(status, queries)`` per request; queries are counted through a database
+execute wrapper tied to the request's context.
+"""
+import asyncio
+import collections
+import contextvars
+import importlib
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+Request = collections.namedtuple('Request', 'method path query body', defaults=('', b''))
+
+_query_counter = contextvars.ContextVar('bench_query_counter', default=None)
+
+
+def _count_queries(execute, sql, params, many, context):
+    counter = _query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+    return execute(sql, params, many, context)
+
+
+def install_query_counter():
+    """Count queries per request on every connection, including ones worker threads open later"""
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def attach(sender, connection, **kwargs):
+        if _count_queries not in connection.execute_wrappers:
+            connection.execute_wrappers.append(_count_queries)
+
+    connection_created.connect(attach, weak=False)
+    for connection in connections.all():
+        attach(None, connection)
+
+
+def use_async_views(enabled):
+    """Switch the project URLconf between the DRF views and the async views"""
+    from django.conf import settings
+    from django.urls import clear_url_caches
+    import student_onboarding.urls
+
+    settings.ONBOARDING_ASYNC_VIEWS = enabled
+    importlib.reload(student_onboarding.urls)
+    clear_url_caches()
+
+
+def wsgi_environ(request):
+    environ = {
+        'REQUEST_METHOD': request.method,
+        'PATH_INFO': request.path,
+        'QUERY_STRING': request.query,
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'localhost',
+        'wsgi.input': io.BytesIO(request.body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.url_scheme': 'http',
+    }
+    if request.body:
+        environ['CONTENT_TYPE'] = 'application/json'
+        environ['CONTENT_LENGTH'] = str(len(request.body))
+    return environ
+
+
+def make_wsgi_dispatch(application, threads):
+    """
+    Run requests on a fixed pool of threads, as a threaded WSGI server does.
+    Returns ``(dispatch, shutdown)``.
+    """
+    pool = ThreadPoolExecutor(threads)
+
+    def call(request):
+        counter = [0]
+        _query_counter.set(counter)
+        statuses = []
+        body = application(wsgi_environ(request), lambda status, headers: statuses.append(status))
+        try:
+            b''.join(body)
+        finally:
+            body.close()
+        return int(statuses[0].split()[0]), counter[0]
+
+    async def dispatch(request):
+        return await asyncio.get_running_loop().run_in_executor(pool, call, request)
+    return dispatch, pool.shutdown
+
+
+def make_asgi_dispatch(application):
+    """Run every request as a task on the event loop. Returns ``(dispatch, shutdown)``."""
+    async def dispatch(request):
+        headers = [(b'host', b'localhost')]
+        if request.body:
+            headers += [(b'content-type', b'application/json'), (b'content-length', str(len(request.body)).encode())]
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': request.method,
+            'scheme': 'http', 'path': request.path, 'raw_path': request.path.encode(),
+            'query_string': request.query.encode(), 'root_path': '', 'headers': headers,
+            'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+        }
+        received = []
+        disconnected = asyncio.Event()
+
+        async def receive():
+            if not received:
+                received.append(None)
+                return {'type': 'http.request', 'body': request.body, 'more_body': False}
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        statuses = []
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                statuses.append(message['status'])
+
+        # sync_to_async copies the context, so queries in worker threads land in this counter
+        counter = [0]
+        _query_counter.set(counter)
+        await application(scope, receive, send)
+        return statuses[0], counter[0]
+    return dispatch, lambda: None
+
+
+async def run_clients(dispatch, next_request, clients, per_client):
+    """
+    Drive ``clients`` concurrent clients, each sending ``per_client`` requests
+    back to back. ``next_request(client, offset)`` builds each Request.
+    Returns ``(latencies, query_counts, errors, elapsed)``.
+    """
+    latencies = []
+    query_counts = []
+    errors = 0
+
+    async def client(number):
+        nonlocal errors
+        for offset in range(per_client):
+            request = next_request(number, offset)
+            started = time.perf_counter()
+            status, queries = await dispatch(request)
+            latencies.append(time.perf_counter() - started)
+            query_counts.append(queries)
+            if status >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(clients)))
+    return latencies, query_counts, errors, time.perf_counter() - started
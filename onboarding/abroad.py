@@ -0,0 +1,110 @@
+"""
+Indexed storage for StudentOnboarding.countries_abroad.
+
+The text column keeps its API shape but holds normalized codes from the
+dropdown ``countries`` list, joined with ', ' (``"DE, FR"``). Each code also
+has a StudentFamilyAbroad row, whose (country, student) index answers
+``?family_abroad_in=DE,FR`` without a LIKE scan over the text.
+
+The rows are rewritten wherever countries_abroad is written: model saves
+(signals), bulk_create_students, bulk_update_students and update_matching.
+"""
+import re
+
+from django.core.exceptions import ValidationError
+
+from .cms import get_choices
+from .models import StudentFamilyAbroad
+
+SEPARATOR_RE = re.compile(r'[,;/|]')
+
+
+def parse_countries_abroad(value, choices):
+    """
+    Country codes in ``value``, free text such as ``"france; DE"``, matched
+    against ``(code, label)`` choices by code or label, case-insensitively.
+    Returns ``(codes, unknown)`` with both lists in input order.
+    """
+    lookup = {}
+    for code, label in choices:
+        lookup[code.casefold()] = code
+        lookup[label.casefold()] = code
+    codes, unknown = [], []
+    for token in SEPARATOR_RE.split(value or ''):
+        token = token.strip()
+        if not token:
+            continue
+        code = lookup.get(token.casefold())
+        if code is None:
+            unknown.append(token)
+        elif code not in codes:
+            codes.append(code)
+    return codes, unknown
+
+
+def format_countries_abroad(codes):
+    return ', '.join(codes) or None
+
+
+def split_countries_abroad(value):
+    """Codes of an already normalized countries_abroad value"""
+    return [code for code in (token.strip() for token in (value or '').split(',')) if code]
+
+
+def normalize_countries_abroad(value):
+    """The stored form of a countries_abroad input; unknown countries raise a ValidationError"""
+    codes, unknown = parse_countries_abroad(value, get_choices('countries'))
+    if unknown:
+        raise ValidationError(f'Unknown countries: {", ".join(unknown)}.')
+    return format_countries_abroad(codes)
+
+
+# Student ids per DELETE, well under SQLite's bound parameter limit
+SYNC_CHUNK_SIZE = 500
+
+
+def sync_family_abroad(students, created=False):
+    """Rewrite the StudentFamilyAbroad rows of saved ``students`` from their countries_abroad"""
+    rows = []
+    for start in range(0, len(students), SYNC_CHUNK_SIZE):
+        chunk = students[start:start + SYNC_CHUNK_SIZE]
+        if not created:
+            StudentFamilyAbroad.objects.filter(student_id__in=[student.pk for student in chunk]).delete()
+        rows.extend(
+            StudentFamilyAbroad(student_id=student.pk, country=code)
+            for student in chunk
+            for code in split_countries_abroad(student.countries_abroad)
+        )
+    StudentFamilyAbroad.objects.bulk_create(rows, batch_size=1000)
+
+
+# Marks instances whose stored countries_abroad is unknown (deferred, or never loaded)
+UNKNOWN = object()
+
+
+def countries_abroad_changed(instance, value):
+    """Whether ``value`` differs from the countries_abroad ``instance`` last loaded or saved"""
+    stored = getattr(instance, '_stored_countries_abroad', UNKNOWN)
+    return stored is UNKNOWN or stored != value
+
+
+def remember_change(instance):
+    """pre_save: whether the save changes countries_abroad, judged against the last loaded or saved value"""
+    instance._countries_abroad_changed = countries_abroad_changed(instance, instance.countries_abroad)
+
+
+def record_save(instance, created):
+    """post_save: rewrite the rows of a new student, or of an update that changed countries_abroad"""
+    if created or getattr(instance, '_countries_abroad_changed', True):
+        sync_family_abroad([instance], created=created)
+    instance._stored_countries_abroad = instance.countries_abroad
+
+
+def sync_family_abroad_ids(ids, countries_abroad):
+    """``sync_family_abroad`` for rows that all received the same countries_abroad"""
+    codes = split_countries_abroad(countries_abroad)
+    for start in range(0, len(ids), SYNC_CHUNK_SIZE):
+        StudentFamilyAbroad.objects.filter(student_id__in=ids[start:start + SYNC_CHUNK_SIZE]).delete()
+    StudentFamilyAbroad.objects.bulk_create(
+        [StudentFamilyAbroad(student_id=pk, country=code) for pk in ids for code in codes], batch_size=1000
+    )
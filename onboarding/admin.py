@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import StudentOnboarding
+from .models import DropdownOption, OnboardingSubmission, StudentOnboarding
+from .search import fts_enabled, search_students
 
 @admin.register(StudentOnboarding)
 class StudentOnboardingAdmin(admin.ModelAdmin):
@@ -7,7 +8,14 @@ class StudentOnboardingAdmin(admin.ModelAdmin):
     list_filter = ('gender', 'citizenship', 'has_family_abroad', 'created_at')
     search_fields = ('first_name', 'last_name', 'email', 'mobile_number')
     readonly_fields = ('created_at', 'updated_at')
-    
+
+    def get_search_results(self, request, queryset, search_term):
+        # Serve the changelist search from the FTS5 index instead of LIKE scans
+        search_term = search_term.strip()
+        if search_term and fts_enabled(queryset.db):
+            return search_students(queryset, search_term), False
+        return super().get_search_results(request, queryset, search_term)
+
     fieldsets = (
         ('Personal Information', {
             'fields': ('first_name', 'last_name', 'date_of_birth', 'gender', 'email', 'mobile_number')
@@ -31,4 +39,17 @@ class StudentOnboardingAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    ) 
\ No newline at end of file
+    ) 
+
+@admin.register(DropdownOption)
+class DropdownOptionAdmin(admin.ModelAdmin):
+    list_display = ('category', 'value', 'label', 'sort_order', 'is_active', 'updated_at')
+    list_editable = ('label', 'sort_order', 'is_active')
+    list_filter = ('category', 'is_active')
+    search_fields = ('value', 'label')
+
+@admin.register(OnboardingSubmission)
+class OnboardingSubmissionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'student', 'created_at', 'processed_at')
+    list_filter = ('status',)
+    readonly_fields = ('payload', 'student', 'errors', 'created_at', 'claimed_at', 'processed_at')
@@ -0,0 +1,265 @@
+"""
+Pre-aggregated onboarding analytics.
+
+OnboardingDailySummary holds, per creation day, dimension and value, the
+number of students. The table is maintained incrementally:
+
+* post_save of a new student adds one to each of its (day, dimension, value)
+  rows; an update moves the counts of the dimensions whose value changed,
+  comparing against the values loaded from the database
+* post_delete subtracts
+* bulk_create_students and bulk_update_students apply the deltas of a whole
+  batch at once, and update_matching computes its deltas with one GROUP BY
+  before its UPDATE
+
+Writes that bypass all of these (``QuerySet.update()``, raw SQL) leave the
+table stale until ``manage.py rebuild_onboarding_summary``. The analytics
+endpoint reads a few hundred of these rows instead of scanning students.
+Archived students (onboarding.archive) stay counted.
+"""
+from collections import Counter
+from decimal import Decimal
+
+from django.db import connections, router, transaction
+from django.db.models import Case, CharField, Count, F, Sum, Value, When
+from django.db.models.functions import Cast, TruncDate, TruncMonth, TruncWeek, TruncYear
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import serializers
+
+from .archive import archived_students
+from .models import OnboardingDailySummary, StudentOnboarding
+
+# Lower bounds of the family_income buckets; each runs up to the next bound
+INCOME_BOUNDS = (0, 25000, 50000, 100000, 250000, 500000)
+
+
+def income_bucket(income):
+    label = None
+    for lower, upper in zip(INCOME_BOUNDS, (*INCOME_BOUNDS[1:], None)):
+        if income >= lower:
+            label = f'{lower}-{upper}' if upper is not None else f'{lower}+'
+    return label
+
+
+def _income_expression():
+    whens = [
+        When(family_income__lt=upper, then=Value(f'{lower}-{upper}'))
+        for lower, upper in zip(INCOME_BOUNDS, INCOME_BOUNDS[1:])
+    ]
+    return Case(*whens, default=Value(f'{INCOME_BOUNDS[-1]}+'), output_field=CharField())
+
+
+# dimension -> (student field, Python value -> label, SQL expression for the rebuild)
+DIMENSIONS = {
+    'citizenship': ('citizenship', str, F('citizenship')),
+    'gender': ('gender', str, F('gender')),
+    'country': ('country', str, F('country')),
+    'number_of_siblings': ('number_of_siblings', str, Cast('number_of_siblings', CharField())),
+    'has_family_abroad': (
+        'has_family_abroad',
+        lambda flag: 'true' if flag else 'false',
+        Case(When(has_family_abroad=True, then=Value('true')), default=Value('false'), output_field=CharField()),
+    ),
+    'family_income': ('family_income', lambda income: income_bucket(Decimal(income)), _income_expression()),
+}
+SOURCE_FIELDS = ('created_at',) + tuple(field for field, label, expression in DIMENSIONS.values())
+
+# Rows per upsert statement, four parameters each: under SQLite's 999 variable limit
+UPSERT_BATCH_SIZE = 200
+
+GROUPINGS = {'day': None, 'week': TruncWeek, 'month': TruncMonth, 'year': TruncYear, 'total': None}
+
+
+def summary_keys(values):
+    """``(day, dimension, value)`` keys for a mapping of student field values"""
+    day = timezone.localdate(values['created_at'])
+    return [
+        (day, dimension, label(values[field]))
+        for dimension, (field, label, expression) in DIMENSIONS.items()
+    ]
+
+
+def _current_values(instance):
+    return {field: getattr(instance, field) for field in SOURCE_FIELDS}
+
+
+def apply_deltas(deltas, using='default'):
+    """
+    Add a Counter of ``(day, dimension, value) -> change`` to the summary.
+    A create touches one row per dimension, so they go in a single
+    multi-row upsert (and a single commit outside a transaction).
+    """
+    connection = connections[using]
+    rows = [
+        (connection.ops.adapt_datefield_value(day), dimension, value, change)
+        for (day, dimension, value), change in deltas.items() if change
+    ]
+    table = connection.ops.quote_name(OnboardingDailySummary._meta.db_table)
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[start:start + UPSERT_BATCH_SIZE]
+            cursor.execute(
+                f'INSERT INTO {table} (day, dimension, value, students) VALUES '
+                + ', '.join(['(%s, %s, %s, %s)'] * len(batch))
+                + f' ON CONFLICT (dimension, day, value) DO UPDATE SET students = {table}.students + excluded.students',
+                [param for row in batch for param in row],
+            )
+
+
+def record_save(instance, created, using):
+    """post_save: count a new student, or move the counts of the dimensions an update changed"""
+    current = _current_values(instance)
+    deltas = Counter(summary_keys(current))
+    if not created:
+        previous = getattr(instance, '_loaded_values', None)
+        if previous is None or any(field not in previous for field in SOURCE_FIELDS):
+            previous = getattr(instance, '_summary_previous', None)
+        if previous is None:
+            # Neither loaded nor fetched in pre_save; a rebuild will reconcile
+            return
+        deltas.subtract(summary_keys(previous))
+    apply_deltas(deltas, using)
+    instance._loaded_values = current
+
+
+def remember_previous(instance, using):
+    """pre_save: fetch the stored values of an update whose instance did not load them"""
+    loaded = getattr(instance, '_loaded_values', None)
+    if instance.pk is None or (loaded is not None and all(field in loaded for field in SOURCE_FIELDS)):
+        return
+    instance._summary_previous = (
+        StudentOnboarding.objects.using(using).filter(pk=instance.pk).values(*SOURCE_FIELDS).first()
+    )
+
+
+def record_delete(instance, using):
+    deltas = Counter(summary_keys(_current_values(instance)))
+    apply_deltas(Counter({key: -change for key, change in deltas.items()}), using)
+
+
+def record_bulk_create(instances, using='default'):
+    deltas = Counter()
+    for instance in instances:
+        deltas.update(summary_keys(_current_values(instance)))
+    apply_deltas(deltas, using)
+
+
+def record_bulk_update(instances, using='default'):
+    """bulk_update sends no post_save: move the counts of rows loaded with their previous values"""
+    deltas = Counter()
+    for instance in instances:
+        current = _current_values(instance)
+        deltas.update(summary_keys(current))
+        deltas.subtract(summary_keys(instance._loaded_values))
+        instance._loaded_values = current
+    apply_deltas(deltas, using)
+
+
+def update_deltas(queryset, values):
+    """
+    Deltas for setting ``values`` on every row of ``queryset``, read with one
+    GROUP BY over the days and current values of the dimensions it changes.
+    """
+    changed = {dimension: spec for dimension, spec in DIMENSIONS.items() if spec[0] in values}
+    if not changed:
+        return Counter()
+    groups = (
+        queryset
+        .annotate(summary_day=TruncDate('created_at'),
+                  **{f'summary_{dimension}': expression for dimension, (field, label, expression) in changed.items()})
+        .values('summary_day', *(f'summary_{dimension}' for dimension in changed))
+        .annotate(students=Count('id'))
+        .order_by()
+    )
+    deltas = Counter()
+    for group in groups:
+        for dimension, (field, label, expression) in changed.items():
+            deltas[(group['summary_day'], dimension, group[f'summary_{dimension}'])] -= group['students']
+            deltas[(group['summary_day'], dimension, label(values[field]))] += group['students']
+    return deltas
+
+
+def rebuild_summary(student_model=StudentOnboarding, summary_model=OnboardingDailySummary, using=None):
+    """
+    Recompute the whole table with one GROUP BY per dimension, in a single
+    transaction. Archived students are counted along with the live ones.
+    Returns the number of summary rows written.
+    """
+    using = using or router.db_for_write(summary_model)
+    sources = [student_model.objects.using(using)]
+    if student_model is StudentOnboarding:
+        sources.append(archived_students(('number_of_siblings', 'family_income')).using(using))
+    written = 0
+    with transaction.atomic(using):
+        summary_model.objects.using(using).all().delete()
+        for dimension, (field, label, expression) in DIMENSIONS.items():
+            counts = Counter()
+            for source in sources:
+                groups = (
+                    source.annotate(summary_day=TruncDate('created_at'), summary_value=expression)
+                    .values('summary_day', 'summary_value')
+                    .annotate(students=Count('id'))
+                    .order_by()
+                )
+                for group in groups:
+                    counts[group['summary_day'], group['summary_value']] += group['students']
+            rows = [
+                summary_model(day=day, dimension=dimension, value=value, students=students)
+                for (day, value), students in counts.items()
+            ]
+            summary_model.objects.using(using).bulk_create(rows, batch_size=1000)
+            written += len(rows)
+    return written
+
+
+def query_summary(params):
+    """
+    Counts per period and value for the requested dimensions. Parameters:
+    ``dimensions`` (comma separated, default all), ``start``/``end`` (ISO
+    dates, both inclusive) and ``group_by`` (day, week, month, year or total).
+    Invalid values raise a ValidationError so the view answers 400.
+    """
+    names = [name.strip() for name in params.get('dimensions', '').split(',') if name.strip()] or list(DIMENSIONS)
+    invalid = [name for name in names if name not in DIMENSIONS]
+    if invalid:
+        raise serializers.ValidationError({'dimensions': [f'Invalid dimension: {", ".join(invalid)}.']})
+    group_by = params.get('group_by', 'day')
+    if group_by not in GROUPINGS:
+        raise serializers.ValidationError({'group_by': [f'Must be one of: {", ".join(GROUPINGS)}.']})
+
+    rows = OnboardingDailySummary.objects.filter(dimension__in=names)
+    bounds = {}
+    for name, lookup in (('start', 'gte'), ('end', 'lte')):
+        raw = params.get(name)
+        if raw:
+            try:
+                bounds[name] = parse_date(raw)
+            except ValueError:
+                bounds[name] = None
+            if bounds[name] is None:
+                raise serializers.ValidationError({name: ['Must be an ISO 8601 date.']})
+            rows = rows.filter(**{f'day__{lookup}': bounds[name]})
+
+    if group_by == 'total':
+        rows = rows.values('dimension', 'value')
+    elif group_by == 'day':
+        rows = rows.annotate(period=F('day')).values('dimension', 'period', 'value')
+    else:
+        rows = rows.annotate(period=GROUPINGS[group_by]('day')).values('dimension', 'period', 'value')
+    rows = rows.annotate(total=Sum('students')).filter(total__gt=0).order_by(*rows.query.values_select)
+
+    results = {name: {} for name in names}
+    for row in rows:
+        period = row.get('period')
+        key = period.isoformat() if period is not None else None
+        results[row['dimension']].setdefault(key, {})[row['value']] = row['total']
+    return {
+        'group_by': group_by,
+        'start': bounds['start'].isoformat() if 'start' in bounds else None,
+        'end': bounds['end'].isoformat() if 'end' in bounds else None,
+        'dimensions': {
+            name: [{'period': period, 'counts': counts} for period, counts in periods.items()]
+            for name, periods in results.items()
+        },
+    }
@@ -3,4 +3,11 @@ from django.apps import AppConfig
 
 class OnboardingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'onboarding' 
\ No newline at end of file
+    name = 'onboarding'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .bloom import email_index
+
+        # File only, no queries: the first availability check catches up from the database
+        email_index.load_snapshot()
\ No newline at end of file
@@ -0,0 +1,310 @@
+"""
+Cold storage for old onboarding records.
+
+``manage.py archive_students`` moves students whose updated_at is older
+than a cutoff (ONBOARDING_ARCHIVE_AFTER_DAYS) out of student_onboarding, in
+id order and in blocks of ONBOARDING_ARCHIVE_BLOCK_SIZE students:
+
+* StudentArchiveBlock holds the PACKED_COLUMNS of its students as one
+  zlib-compressed JSON document; neighbouring records compress far better
+  together than one by one
+* StudentArchiveEntry keeps, per student, the id, the block and
+  uncompressed the ENTRY_COLUMNS the list orders and filters on, plus the
+  email under a unique index
+
+The live table, its indexes, the search index and StudentFamilyAbroad lose
+the archived rows. ``archived_students()`` reads entries back with the
+columns of student_onboarding: the ``onboarding_archived()`` SQL function,
+registered on every SQLite connection, decompresses the blocks a query
+touches. The detail endpoint falls through to it when an id is not live,
+and list and export read both tiers with ``?include_archived=1``
+(``filtered_students``).
+
+Archived records are read-only (update endpoints answer 404) and are not
+searchable. Their emails stay taken: model validation (and so the API
+writes), the bulk writes and the email availability check look them up in
+the archive too, the single writes only when the email filter may hold them. The move bypasses model
+signals: the analytics summary keeps counting archived students, their
+cached details stay valid, and the change feed does not report them.
+"""
+import json
+import zlib
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.db.models import F, Func, Value
+from rest_framework import serializers
+
+from .database import run_write
+from .filters import filter_students, parse_boolean
+from .models import StudentArchiveBlock, StudentArchiveEntry, StudentOnboarding
+
+ARCHIVED_FUNCTION = 'onboarding_archived'
+# Decompressed blocks kept per connection; reads in id or created_at order revisit recent blocks
+CACHED_BLOCKS = 32
+
+# Copied to StudentArchiveEntry as stored: list ordering, pagination and filters read them, and
+# the email uniqueness checks
+ENTRY_COLUMNS = (
+    'id', 'email', 'gender', 'citizenship', 'country', 'has_family_abroad', 'countries_abroad', 'created_at',
+    'updated_at',
+)
+# Everything else, compressed into the block
+PACKED_COLUMNS = tuple(
+    field.column for field in StudentOnboarding._meta.concrete_fields if field.column not in ENTRY_COLUMNS
+)
+
+# Tables (with their indexes) archiving shrinks, and the archive's own
+HOT_TABLES = ('student_onboarding', 'student_family_abroad', 'student_onboarding_fts%')
+ARCHIVE_TABLES = ('student_archive_entry', 'student_archive_block')
+
+
+def archive_after_days():
+    return getattr(settings, 'ONBOARDING_ARCHIVE_AFTER_DAYS', 365)
+
+
+def archive_block_size():
+    return getattr(settings, 'ONBOARDING_ARCHIVE_BLOCK_SIZE', 64)
+
+
+def pack_block(ids, rows):
+    """Compress the PACKED_COLUMNS value lists ``rows`` of students ``ids``"""
+    document = {'columns': PACKED_COLUMNS, 'ids': ids, 'rows': rows}
+    return zlib.compress(json.dumps(document, separators=(',', ':')).encode(), 9)
+
+
+def unpack_block(payload):
+    """``{id: {column: value}}`` of a block; each block names its columns, so older blocks stay readable"""
+    document = json.loads(zlib.decompress(payload))
+    columns = document['columns']
+    return {pk: dict(zip(columns, row)) for pk, row in zip(document['ids'], document['rows'])}
+
+
+class BlockReader:
+    """``onboarding_archived(payload, id, column)``: one packed column of an archived student"""
+
+    def __init__(self, size=CACHED_BLOCKS):
+        self.size = size
+        self.blocks = OrderedDict()
+
+    def __call__(self, payload, pk, column):
+        students = self.blocks.get(payload)
+        if students is None:
+            students = self.blocks[payload] = unpack_block(payload)
+            if len(self.blocks) > self.size:
+                self.blocks.popitem(last=False)
+        else:
+            self.blocks.move_to_end(payload)
+        return students[pk].get(column)
+
+
+def register_archive_function(connection):
+    if connection.vendor != 'sqlite':
+        return
+    # One reader per connection: Django does not share connections between threads
+    connection.connection.create_function(ARCHIVED_FUNCTION, 3, BlockReader(), deterministic=True)
+
+
+class ArchivedColumn(Func):
+    """A packed column of StudentArchiveEntry rows, typed like the student_onboarding column"""
+    function = ARCHIVED_FUNCTION
+
+    def __init__(self, column):
+        field = StudentOnboarding._meta.get_field(column).clone()
+        super().__init__(F('block__payload'), F('id'), Value(column), output_field=field)
+
+
+def archived_students(columns=PACKED_COLUMNS):
+    """StudentArchiveEntry rows annotated with packed ``columns``, under their student_onboarding names"""
+    return StudentArchiveEntry.objects.annotate(**{column: ArchivedColumn(column) for column in columns})
+
+
+def _version_query(queryset, student_id):
+    live = queryset.filter(id=student_id).annotate(archived=Value(False)).values_list('updated_at', 'archived')
+    archived = StudentArchiveEntry.objects.using(queryset.db).filter(id=student_id).annotate(
+        archived=Value(True),
+    ).values_list('updated_at', 'archived')
+    return live.union(archived, all=True)[:1]
+
+
+def student_version(queryset, student_id):
+    """``(updated_at, archived)`` of a live or archived student in one query, or None"""
+    rows = list(_version_query(queryset, student_id))
+    return rows[0] if rows else None
+
+
+async def astudent_version(queryset, student_id):
+    """``student_version`` for async views"""
+    rows = [row async for row in _version_query(queryset, student_id)]
+    return rows[0] if rows else None
+
+
+class WithArchive:
+    """
+    Live and archived students read as one: a StudentOnboarding queryset and
+    a StudentArchiveEntry queryset with the same filters, combined with
+    UNION ALL when evaluated. SQLite merges the two ordered index scans, so a
+    page reads about as many rows as on the live table alone.
+
+    Supports what the list, its paginators and the export use: filter(),
+    order_by(), values(), slicing and iteration of values() rows,
+    values_list().iterator() and (a)count().
+    """
+
+    def __init__(self, live, archived, ordering=None, fields=None, tuples=False):
+        self.live = live
+        self.archived = archived
+        self.ordering = tuple(live.query.order_by) if ordering is None else tuple(ordering)
+        self.fields = fields
+        self.tuples = tuples
+
+    def _clone(self, **changes):
+        state = {'live': self.live, 'archived': self.archived, 'ordering': self.ordering,
+                 'fields': self.fields, 'tuples': self.tuples}
+        state.update(changes)
+        return WithArchive(**state)
+
+    @property
+    def ordered(self):
+        return bool(self.ordering)
+
+    def filter(self, *args, **kwargs):
+        return self._clone(live=self.live.filter(*args, **kwargs), archived=self.archived.filter(*args, **kwargs))
+
+    def order_by(self, *ordering):
+        return self._clone(ordering=ordering)
+
+    def values(self, *fields):
+        return self._clone(fields=fields, tuples=False)
+
+    def values_list(self, *fields):
+        return self._clone(fields=fields, tuples=True)
+
+    def count(self):
+        return self.live.count() + self.archived.count()
+
+    async def acount(self):
+        return await self.live.acount() + await self.archived.acount()
+
+    def combined(self):
+        """
+        The UNION ALL queryset and its column order. Both sides must select
+        the same columns in the same order, and the archive side lists its
+        annotations after its fields, so entry columns come first; ordering
+        columns are added when not requested.
+        """
+        requested = list(self.fields or (field.column for field in StudentOnboarding._meta.concrete_fields))
+        selected = requested + [name.lstrip('-') for name in self.ordering if name.lstrip('-') not in requested]
+        columns = [name for name in selected if name in ENTRY_COLUMNS]
+        columns += [name for name in selected if name not in ENTRY_COLUMNS]
+        archived = self.archived.order_by().annotate(
+            **{name: ArchivedColumn(name) for name in columns if name not in ENTRY_COLUMNS}
+        )
+        if self.tuples:
+            combined = self.live.order_by().values_list(*columns).union(archived.values_list(*columns), all=True)
+        else:
+            combined = self.live.order_by().values(*columns).union(archived.values(*columns), all=True)
+        return combined.order_by(*self.ordering), columns, requested
+
+    def __getitem__(self, key):
+        return self.combined()[0][key]
+
+    def __iter__(self):
+        return self.iterator()
+
+    def __aiter__(self):
+        return self.combined()[0].__aiter__()
+
+    def iterator(self, chunk_size=None):
+        combined, columns, requested = self.combined()
+        rows = combined.iterator(chunk_size=chunk_size)
+        if self.tuples and columns != requested:
+            positions = [columns.index(name) for name in requested]
+            return (tuple(row[position] for position in positions) for row in rows)
+        return rows
+
+
+def include_archived(params):
+    raw = params.get('include_archived')
+    return bool(raw) and parse_boolean('include_archived', raw)
+
+
+def filtered_students(queryset, params, counting=False):
+    """``filter_students`` over ``queryset``, and over the archive too with ``?include_archived=1``"""
+    if not include_archived(params):
+        return filter_students(queryset, params, counting)
+    return WithArchive(
+        filter_students(queryset, params, counting),
+        filter_students(StudentArchiveEntry.objects.all(), params, counting),
+    )
+
+
+def check_searchable(queryset):
+    if isinstance(queryset, WithArchive):
+        raise serializers.ValidationError({'q': ['Archived records are not searchable; drop include_archived.']})
+
+
+def archive_block(cutoff, size, after=0, using=DEFAULT_DB_ALIAS):
+    """
+    Move the next ``size`` students (by id, from ``after``) last updated
+    before ``cutoff`` into one new block, in one transaction. Returns the
+    ids moved.
+    """
+    connection = connections[using]
+    with transaction.atomic(using), connection.cursor() as cursor:
+        # json_array keeps the values as SQLite stores them, ready for the column converters on the way out
+        cursor.execute(
+            f'SELECT id, json_array({", ".join(PACKED_COLUMNS)}) FROM student_onboarding '
+            'WHERE id > %s AND updated_at < %s ORDER BY id LIMIT %s',
+            [after, connection.ops.adapt_datetimefield_value(cutoff), size],
+        )
+        selected = cursor.fetchall()
+        if not selected:
+            return []
+        ids = [pk for pk, values in selected]
+        block = StudentArchiveBlock.objects.using(using).create(
+            students=len(ids), payload=pack_block(ids, [json.loads(values) for pk, values in selected]),
+        )
+        placeholders = ', '.join(['%s'] * len(ids))
+        columns = ', '.join(ENTRY_COLUMNS)
+        cursor.execute(
+            f'INSERT INTO student_archive_entry ({columns}, block_id) '
+            f'SELECT {columns}, %s FROM student_onboarding WHERE id IN ({placeholders})',
+            [block.pk, *ids],
+        )
+        # Raw deletes: the model signals would take the students out of the analytics summary
+        cursor.execute(f'DELETE FROM student_family_abroad WHERE student_id IN ({placeholders})', ids)
+        cursor.execute(f'DELETE FROM student_onboarding WHERE id IN ({placeholders})', ids)
+    return ids
+
+
+def archive_students(cutoff, size=None, using=DEFAULT_DB_ALIAS, progress=None):
+    """Archive every student last updated before ``cutoff``, block by block; returns how many moved"""
+    size = size or archive_block_size()
+    moved, after = 0, 0
+    while True:
+        ids = run_write(lambda: archive_block(cutoff, size, after, using), using)
+        if not ids:
+            return moved
+        moved += len(ids)
+        after = ids[-1]
+        if progress is not None:
+            progress(moved)
+
+
+def tier_bytes(tables, using=DEFAULT_DB_ALIAS):
+    """
+    Bytes held by ``tables`` (LIKE patterns) and their indexes, from SQLite's
+    dbstat table; None when SQLite is built without it.
+    """
+    names = ' OR '.join(['tbl_name LIKE %s'] * len(tables))
+    with connections[using].cursor() as cursor:
+        try:
+            cursor.execute(
+                f'SELECT SUM(pgsize) FROM dbstat WHERE name IN (SELECT name FROM sqlite_schema WHERE {names})',
+                list(tables),
+            )
+        except OperationalError:
+            return None
+        return cursor.fetchone()[0] or 0
@@ -0,0 +1,46 @@
+"""
+URL configuration serving the read endpoints with the async views.
+
+Same paths and names as ``onboarding.urls``; the write endpoints stay on the
+DRF views. Selected by ``ONBOARDING_ASYNC_VIEWS`` in the project urls.
+"""
+from django.urls import path
+from .async_views import (
+    DropdownOptionsAsyncView,
+    StudentOnboardingAsyncChangesView,
+    StudentOnboardingAsyncDetailView,
+    StudentOnboardingAsyncListView,
+)
+from .views import (
+    StudentOnboardingCreateView,
+    StudentOnboardingBatchCreateView,
+    StudentOnboardingBulkUpdateView,
+    StudentOnboardingExportView,
+    StudentOnboardingSubmissionView,
+    StudentOnboardingUpdateView,
+    api_documentation,
+    email_available,
+    onboarding_analytics,
+    profile_report_detail,
+    profile_report_download,
+    profile_report_list,
+)
+
+urlpatterns = [
+    path('', api_documentation, name='api-docs'),
+    path('student-onboarding/', StudentOnboardingAsyncListView.as_view(), name='student-onboarding-list'),
+    path('student-onboarding/create/', StudentOnboardingCreateView.as_view(), name='student-onboarding-create'),
+    path('student-onboarding/changes/', StudentOnboardingAsyncChangesView.as_view(), name='student-onboarding-changes'),
+    path('student-onboarding/export/', StudentOnboardingExportView.as_view(), name='student-onboarding-export'),
+    path('student-onboarding/submissions/<uuid:submission_id>/', StudentOnboardingSubmissionView.as_view(), name='student-onboarding-submission'),
+    path('student-onboarding/batch/', StudentOnboardingBatchCreateView.as_view(), name='student-onboarding-batch-create'),
+    path('student-onboarding/bulk-update/', StudentOnboardingBulkUpdateView.as_view(), name='student-onboarding-bulk-update'),
+    path('student-onboarding/<int:student_id>/', StudentOnboardingAsyncDetailView.as_view(), name='student-onboarding-detail'),
+    path('student-onboarding/<int:student_id>/update/', StudentOnboardingUpdateView.as_view(), name='student-onboarding-update'),
+    path('profiles/', profile_report_list, name='profile-report-list'),
+    path('profiles/<str:report_id>/', profile_report_detail, name='profile-report-detail'),
+    path('profiles/<str:report_id>/download/', profile_report_download, name='profile-report-download'),
+    path('email-available/', email_available, name='email-available'),
+    path('analytics/', onboarding_analytics, name='onboarding-analytics'),
+    path('dropdown-options/', DropdownOptionsAsyncView.as_view(), name='dropdown-options'),
+]
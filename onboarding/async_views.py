@@ -0,0 +1,130 @@
+"""
+Async versions of the read endpoints, served by ``onboarding.async_urls``.
+
+They produce the same JSON as the DRF views in ``views.py`` but run on the
+event loop under ASGI: rows come from the async ORM, the detail cache and CMS
+snapshot are read without a thread hop when warm, and responses are rendered
+straight to JSON (no browsable API or content negotiation).
+"""
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views import View
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.request import Request
+
+from . import cms
+from .archive import archived_students, astudent_version, check_searchable, filtered_students
+from .cache import (
+    abuild_detail_entry, aget_cached_detail, detail_cache_timeout, detail_version, sparse_detail_entry,
+)
+from .changes import ChangeFeed
+from .models import StudentOnboarding
+from .pagination import StudentKeysetPagination, StudentOnboardingPagination
+from .responses import api_exception_response, json_response
+from .representations import STUDENT_DETAIL, STUDENT_LIST_ITEM, sparse_serializer
+from .search import asearch_students
+
+
+class StudentOnboardingAsyncListView(View):
+    """List student onboarding records (async counterpart of StudentOnboardingListView)"""
+    pagination_class = StudentOnboardingPagination
+
+    async def get(self, request, *args, **kwargs):
+        # DRF's Request only wraps the query string and URL helpers here; it does no I/O
+        drf_request = Request(request)
+        params = drf_request.query_params
+        try:
+            fieldset = sparse_serializer(STUDENT_LIST_ITEM, params)
+            if params.get('family_abroad_in'):
+                # The filter validates codes against the CMS countries list
+                await cms.aload_snapshot()
+            queryset = filtered_students(StudentOnboarding.objects.order_by('-created_at', '-id'), params)
+            count_queryset = filtered_students(StudentOnboarding.objects.all(), params, counting=True)
+            term = params.get('q', '').strip()
+            if term:
+                check_searchable(queryset)
+                queryset = await asearch_students(queryset, term)
+                count_queryset = await asearch_students(count_queryset, term)
+            paginator = self.pagination_class()
+            extra = StudentKeysetPagination.position_fields if paginator.use_keyset(drf_request) else ()
+            page = await paginator.apaginate_queryset(fieldset.values(queryset, extra), drf_request, count_queryset)
+        except APIException as exc:
+            return api_exception_response(exc)
+        return json_response(paginator.get_paginated_data(fieldset.many(page)))
+
+
+class StudentOnboardingAsyncChangesView(View):
+    """Change feed (async counterpart of StudentOnboardingChangesView); long polls wait on the event loop"""
+
+    async def get(self, request, *args, **kwargs):
+        drf_request = Request(request)
+        try:
+            feed = ChangeFeed(drf_request.query_params)
+            rows = await feed.aread()
+        except APIException as exc:
+            return api_exception_response(exc)
+        return json_response(feed.response_data(rows, drf_request))
+
+
+class StudentOnboardingAsyncDetailView(View):
+    """Retrieve one student onboarding record (async counterpart of StudentOnboardingDetailView)"""
+
+    async def get(self, request, student_id, *args, **kwargs):
+        try:
+            fieldset = sparse_serializer(STUDENT_DETAIL, request.GET)
+        except APIException as exc:
+            return api_exception_response(exc)
+        queryset = StudentOnboarding.objects.all()
+        entry = version = None
+        if detail_cache_timeout():
+            # Cached entries are looked up by version, as in the sync view
+            version = await astudent_version(queryset, student_id)
+            if version is None:
+                return api_exception_response(NotFound())
+            entry = await aget_cached_detail(student_id, version[0])
+        if entry is None:
+            row = None
+            if version is None or not version[1]:
+                row = await fieldset.values(queryset, ('id', 'updated_at')).filter(id=student_id).afirst()
+            if row is None:
+                # Not live: the record may have been archived, as in the sync view
+                archived = archived_students().using(queryset.db)
+                row = await fieldset.values(archived, ('id', 'updated_at')).filter(id=student_id).afirst()
+            if row is None:
+                return api_exception_response(NotFound())
+            if fieldset is STUDENT_DETAIL:
+                entry = await abuild_detail_entry(row['id'], row['updated_at'], STUDENT_DETAIL.to_representation(row))
+            else:
+                # Sparse misses read only the requested columns and are not cached
+                entry = dict(detail_version(row['id'], row['updated_at']), data=fieldset.to_representation(row))
+        if fieldset is not STUDENT_DETAIL:
+            entry = sparse_detail_entry(entry, fieldset.fields)
+
+        response = get_conditional_response(
+            request, etag=entry['etag'], last_modified=entry['last_modified']
+        )
+        if response is None:
+            response = json_response(entry['data'])
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(entry['last_modified'])
+        return response
+
+
+class DropdownOptionsAsyncView(View):
+    """Dropdown options from the CMS store (async counterpart of get_dropdown_options)"""
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            fields = cms.resolve_option_fields(request.GET.get('fields'))
+        except APIException as exc:
+            return api_exception_response(exc)
+
+        data, content, etag = await cms.aget_encoded_options(fields)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, content_type='application/json')
+        response['ETag'] = etag
+        response['Cache-Control'] = f"public, max-age={getattr(settings, 'ONBOARDING_DROPDOWN_MAX_AGE', 3600)}"
+        return response
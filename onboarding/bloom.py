@@ -0,0 +1,273 @@
+"""
+In-memory Bloom filter of stored student emails for the availability check.
+
+A miss in the filter means the email is definitely not stored, so
+``GET /email-available/`` answers those without touching the database. Only
+possible hits (stored emails and false positives, about
+ONBOARDING_EMAIL_FILTER_ERROR_RATE of free ones) fall back to an indexed
+lookup.
+
+Each process loads the snapshot written by ``manage.py rebuild_email_filter``
+(ONBOARDING_EMAIL_FILTER_PATH) when the app loads. Without one, the first
+check builds the filter from the database, since Django discourages queries
+during app loading; deployments that want no such scan per process ship a
+snapshot. Every process adds emails on every save and bulk insert, and every
+ONBOARDING_EMAIL_FILTER_SYNC_INTERVAL seconds adds the rows other processes
+wrote since, found through the (updated_at, id) index. Builds and syncs
+query outside the lock, one thread at a time; concurrent checks meanwhile use
+the current filter, or the indexed lookup until the first build completes.
+Archived students (onboarding.archive) keep their emails taken, so builds
+include them. Emails a process has not synced yet can be reported free; the
+unique constraint on INSERT stays the authority. Bloom filters cannot delete, so
+changed or deleted emails only cost extra fallbacks until the next rebuild.
+The filter reads the primary, since a lagging replica would move the sync
+watermark past rows it has not seen.
+"""
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import struct
+import threading
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'OBLM1'
+# Rows committed this long before a sync point may still be in flight elsewhere
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one blake2b digest"""
+
+    def __init__(self, bits, hashes):
+        self.size = max(8, bits)
+        self.hashes = max(1, hashes)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate, max_bytes=None):
+        """Size for ``capacity`` keys at ``error_rate``, capped at ``max_bytes``"""
+        capacity = max(1, capacity)
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        if max_bytes:
+            bits = min(bits, max_bytes * 8)
+        return cls(bits, round(bits / capacity * math.log(2)))
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, second = struct.unpack('<QQ', digest)
+        second |= 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def false_positive_rate(self, count):
+        """Expected false-positive rate after ``count`` insertions"""
+        return (1 - math.exp(-self.hashes * count / self.size)) ** self.hashes
+
+
+def _settings():
+    return (
+        getattr(settings, 'ONBOARDING_EMAIL_FILTER_ERROR_RATE', 0.001),
+        getattr(settings, 'ONBOARDING_EMAIL_FILTER_MAX_BYTES', 16 * 1024 * 1024),
+    )
+
+
+def filter_capacity(count):
+    """Keys a filter built over ``count`` emails is sized for: room to grow before a rebuild"""
+    return max(count * 2, 1000)
+
+
+def build_filter(emails, count):
+    error_rate, max_bytes = _settings()
+    bloom = BloomFilter.for_capacity(filter_capacity(count), error_rate, max_bytes)
+    for email in emails:
+        bloom.add(email)
+    return bloom
+
+
+class EmailIndex:
+    """
+    The process-wide email filter and its sync watermark. ``count`` is an
+    upper bound on the keys added (updates and resyncs can count an email
+    twice), so the filter is rebuilt a little early rather than late.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.filter = None
+            self.count = 0
+            self.capacity = 0
+            self.synced_at = None
+            self.next_sync = 0.0
+            self.snapshot_mtime = None
+            self._recent = set()
+            self._refreshing = False
+
+    def _snapshot_mtime(self):
+        path = getattr(settings, 'ONBOARDING_EMAIL_FILTER_PATH', None)
+        try:
+            return os.stat(path).st_mtime if path else None
+        except FileNotFoundError:
+            return None
+
+    def load_snapshot(self):
+        """
+        Start from the rebuild_email_filter snapshot, if configured, without
+        touching the database (app loading); the first check catches up with
+        the rows written since.
+        """
+        mtime = self._snapshot_mtime()
+        if mtime is None:
+            return
+        bloom, header = read_snapshot(settings.ONBOARDING_EMAIL_FILTER_PATH)
+        with self._lock:
+            self._install(bloom, header['count'], header['capacity'], datetime.fromisoformat(header['built_at']))
+            self.snapshot_mtime = mtime
+            self.next_sync = 0.0
+
+    def _install(self, bloom, count, capacity, synced_at):
+        """Swap in a loaded or built filter; called with the lock held"""
+        self.filter, self.count, self.capacity, self.synced_at = bloom, count, capacity, synced_at
+        self._recent = set()
+        self._schedule_sync()
+
+    def _load(self):
+        if self._snapshot_mtime() is not None:
+            self.load_snapshot()
+            self._sync()
+        else:
+            self._build()
+
+    def _build(self):
+        synced_at = timezone.now()
+        count, emails = stored_emails()
+        bloom = build_filter(emails, count)
+        with self._lock:
+            self._install(bloom, count, filter_capacity(count), synced_at)
+            self.snapshot_mtime = None
+
+    def _sync(self):
+        from .models import StudentOnboarding
+
+        synced_at = timezone.now()
+        emails = set(
+            StudentOnboarding.objects.using(DEFAULT_DB_ALIAS)
+            .filter(updated_at__gte=self.synced_at - SYNC_OVERLAP).values_list('email', flat=True)
+        )
+        with self._lock:
+            for email in emails:
+                self.filter.add(email)
+            # The overlap window was mostly covered by the previous sync
+            self.count += len(emails - self._recent)
+            self._recent = emails
+            self.synced_at = synced_at
+            self._schedule_sync()
+            full = self.count > self.capacity
+        if full:
+            logger.info('Email filter past its capacity of %d; rebuilding', self.capacity)
+            self._build()
+
+    def _schedule_sync(self):
+        self.next_sync = time.monotonic() + getattr(settings, 'ONBOARDING_EMAIL_FILTER_SYNC_INTERVAL', 1.0)
+
+    def get(self):
+        """
+        The current filter, building or syncing it first when due. The
+        queries run outside the lock and one thread at a time: meanwhile other
+        threads get the current filter, or None before the first build.
+        """
+        with self._lock:
+            if self._refreshing or (self.filter is not None and time.monotonic() < self.next_sync):
+                return self.filter
+            self._refreshing = True
+        try:
+            # A fresh snapshot from rebuild_email_filter replaces the filter in place
+            if self.filter is None or self._snapshot_mtime() != self.snapshot_mtime:
+                self._load()
+            else:
+                self._sync()
+        finally:
+            with self._lock:
+                self._refreshing = False
+        return self.filter
+
+    def add(self, emails):
+        """Record emails this process just wrote; a no-op until the filter is built"""
+        with self._lock:
+            if self.filter is None:
+                return
+            for email in emails:
+                self.filter.add(email)
+                self.count += 1
+
+
+email_index = EmailIndex()
+
+
+def might_exist(email, build=True):
+    """False only for an email the filter rules out; with ``build=False`` a filter not built yet stays unbuilt"""
+    bloom = email_index.get() if build or email_index.filter is not None else None
+    # None while another thread builds the first filter: fall back to the lookup
+    return bloom is None or email in bloom
+
+
+def stored_emails():
+    """``(count, emails)`` over live and archived students, read from the primary"""
+    from .models import StudentArchiveEntry, StudentOnboarding
+
+    tiers = [model.objects.using(DEFAULT_DB_ALIAS) for model in (StudentOnboarding, StudentArchiveEntry)]
+    count = sum(tier.count() for tier in tiers)
+    return count, itertools.chain.from_iterable(tier.values_list('email', flat=True).iterator(2000) for tier in tiers)
+
+
+def rebuild_snapshot(path):
+    """Build a filter from every stored email and write it to ``path``; returns ``(filter, count)``"""
+    built_at = timezone.now()
+    count, emails = stored_emails()
+    bloom = build_filter(emails, count)
+    write_snapshot(path, bloom, count, filter_capacity(count), built_at)
+    return bloom, count
+
+
+def write_snapshot(path, bloom, count, capacity, built_at):
+    """Write the filter atomically: magic, JSON header length and header, then the bits"""
+    header = json.dumps({
+        'size': bloom.size, 'hashes': bloom.hashes, 'count': count,
+        'capacity': capacity, 'built_at': built_at.isoformat(),
+    }).encode()
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as handle:
+        handle.write(SNAPSHOT_MAGIC + struct.pack('<I', len(header)) + header)
+        handle.write(bloom.bits)
+    os.replace(temporary, path)
+
+
+def read_snapshot(path):
+    with open(path, 'rb') as handle:
+        if handle.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f'{path} is not an email filter snapshot')
+        (length,) = struct.unpack('<I', handle.read(4))
+        header = json.loads(handle.read(length))
+        bloom = BloomFilter(header['size'], header['hashes'])
+        bloom.bits = bytearray(handle.read())
+    return bloom, header
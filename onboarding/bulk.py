@@ -0,0 +1,167 @@
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models.sql import UpdateQuery
+from django.utils import timezone
+
+from .abroad import sync_family_abroad, sync_family_abroad_ids
+from .analytics import apply_deltas, record_bulk_create, record_bulk_update, update_deltas
+from .bloom import email_index
+from .models import StudentArchiveEntry, StudentOnboarding
+
+
+DUPLICATE_EMAIL_ERROR = 'student onboarding with this email already exists.'
+
+
+def taken_emails(emails):
+    """
+    The ``emails`` held by live or archived students, in one query: archived
+    students left the live table and its unique index but keep their emails.
+    """
+    emails = set(emails)
+    live = StudentOnboarding.objects.filter(email__in=emails).values_list('email', flat=True)
+    archived = StudentArchiveEntry.objects.filter(email__in=emails).values_list('email', flat=True)
+    return set(live.union(archived, all=True))
+
+
+def find_email_conflicts(emails):
+    """
+    One error dict (or None) per email for addresses already stored or repeated
+    earlier in the same list. Runs a single query for the whole list.
+    """
+    taken = taken_emails(emails)
+    seen = set()
+    conflicts = []
+    for email in emails:
+        if email in taken:
+            conflicts.append({'email': [DUPLICATE_EMAIL_ERROR]})
+        elif email in seen:
+            conflicts.append({'email': ['Duplicate email within this batch.']})
+        else:
+            seen.add(email)
+            conflicts.append(None)
+    return conflicts
+
+
+def get_bulk_chunk_size():
+    """Rows written per bulk_create statement"""
+    return getattr(settings, 'ONBOARDING_BULK_CHUNK_SIZE', 500)
+
+
+def bulk_create_students(rows, chunk_size=None):
+    """
+    Insert already validated rows with chunked bulk_create inside one transaction.
+
+    Returns a list aligned with ``rows`` holding either the created instance or an
+    error dict for rows that lost a unique race with a concurrent writer.
+    """
+    chunk_size = chunk_size or get_bulk_chunk_size()
+    results = []
+    with transaction.atomic():
+        for start in range(0, len(rows), chunk_size):
+            chunk = [StudentOnboarding(**row) for row in rows[start:start + chunk_size]]
+            try:
+                with transaction.atomic():
+                    results.extend(StudentOnboarding.objects.bulk_create(chunk))
+            except IntegrityError:
+                # Someone else inserted one of these emails after validation;
+                # retry the chunk row by row so only the conflicting rows fail.
+                results.extend(_insert_one_by_one(chunk))
+        created = [result for result in results if isinstance(result, StudentOnboarding)]
+        # The summary counts and family-abroad rows commit with the rows they describe
+        record_bulk_create(created)
+        sync_family_abroad(created, created=True)
+    email_index.add([student.email for student in created])
+    return results
+
+
+def _insert_one_by_one(instances):
+    results = []
+    for instance in instances:
+        try:
+            with transaction.atomic():
+                StudentOnboarding.objects.bulk_create([instance])
+            results.append(instance)
+        except IntegrityError:
+            results.append({'email': [DUPLICATE_EMAIL_ERROR]})
+    return results
+
+
+def bulk_update_students(updates, chunk_size=None):
+    """
+    Apply validated ``(instance, changes)`` pairs with chunked bulk_update
+    inside one transaction, each chunk writing only the columns its rows
+    change (plus updated_at).
+
+    Returns a list aligned with ``updates`` holding either the updated instance
+    or an error dict for rows that lost a unique email race.
+    """
+    chunk_size = chunk_size or get_bulk_chunk_size()
+    updated_at = timezone.now()
+    results = []
+    with transaction.atomic():
+        for start in range(0, len(updates), chunk_size):
+            chunk = updates[start:start + chunk_size]
+            fields = list(dict.fromkeys(name for instance, changes in chunk for name in changes)) + ['updated_at']
+            for instance, changes in chunk:
+                for attr, value in changes.items():
+                    setattr(instance, attr, value)
+                instance.updated_at = updated_at
+            instances = [instance for instance, changes in chunk]
+            try:
+                with transaction.atomic():
+                    StudentOnboarding.objects.bulk_update(instances, fields)
+                results.extend(instances)
+            except IntegrityError:
+                # Another writer took one of the new emails after validation
+                results.extend(_update_one_by_one(instances, fields))
+        updated = [result for result in results if isinstance(result, StudentOnboarding)]
+        record_bulk_update(updated)
+        sync_family_abroad([
+            result for result, (instance, changes) in zip(results, updates)
+            if result is instance and 'countries_abroad' in changes
+        ])
+    email_index.add([student.email for student in updated])
+    return results
+
+
+def _update_one_by_one(instances, fields):
+    results = []
+    for instance in instances:
+        try:
+            with transaction.atomic():
+                StudentOnboarding.objects.bulk_update([instance], fields)
+            results.append(instance)
+        except IntegrityError:
+            results.append({'email': [DUPLICATE_EMAIL_ERROR]})
+    return results
+
+
+def update_matching(lookups, values):
+    """
+    Set ``values`` on every row matching ``lookups`` with a single
+    ``UPDATE ... RETURNING id``, which also bumps updated_at (and so the
+    version cached details are keyed by). Returns the updated ids.
+    """
+    # The raw cursor bypasses the router, so ask it for the write alias: that is how
+    # replica routing learns the request wrote (read-your-writes cookie)
+    queryset = StudentOnboarding.objects.using(router.db_for_write(StudentOnboarding)).filter(**lookups)
+    values = dict(values, updated_at=timezone.now())
+    query = queryset.query.chain(UpdateQuery)
+    query.add_update_values(values)
+    try:
+        sql, params = query.get_compiler(queryset.db).as_sql()
+    except EmptyResultSet:
+        # The filter can match nothing (e.g. an empty IN list)
+        return []
+    connection = connections[queryset.db]
+    with transaction.atomic(queryset.db):
+        # Read before the UPDATE: the counts move away from the old values
+        deltas = update_deltas(queryset, values)
+        with connection.cursor() as cursor:
+            cursor.execute(f'{sql} RETURNING {connection.ops.quote_name("id")}', params)
+            ids = [row[0] for row in cursor.fetchall()]
+        apply_deltas(deltas, queryset.db)
+        if 'countries_abroad' in values:
+            sync_family_abroad_ids(ids, values['countries_abroad'])
+    return ids
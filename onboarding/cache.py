@@ -0,0 +1,81 @@
+"""
+Serialized detail payloads, cached under the record's version.
+
+Keys carry the student's id and updated_at, which every write path bumps
+(saves, the bulk endpoints, update_matching). The detail views read
+updated_at first and look up that version, so a process never serves a
+payload another process's write has superseded, whatever cache backend is
+configured: superseded entries are never read again and simply expire.
+"""
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+DETAIL_CACHE_PREFIX = 'onboarding:student-detail'
+
+
+def detail_cache_timeout():
+    """Seconds to keep serialized detail payloads; 0 or None disables the cache"""
+    return getattr(settings, 'ONBOARDING_DETAIL_CACHE_TIMEOUT', 300)
+
+
+def version_stamp(updated_at):
+    return int(updated_at.timestamp() * 1000000)
+
+
+def detail_cache_key(student_id, updated_at):
+    return f'{DETAIL_CACHE_PREFIX}:{student_id}:{version_stamp(updated_at)}'
+
+
+def detail_version(student_id, updated_at):
+    """Validators for conditional GET derived from the record's updated_at"""
+    return {
+        'etag': f'"{student_id}-{version_stamp(updated_at)}"',
+        'last_modified': int(updated_at.timestamp()),
+    }
+
+
+def sparse_detail_entry(entry, fields):
+    """
+    A detail entry narrowed to a sparse fieldset. The ETag carries a tag of
+    the fieldset so a conditional GET never matches another variant's body.
+    """
+    tag = zlib.crc32(','.join(fields).encode())
+    return {
+        'etag': f'{entry["etag"][:-1]}-{tag:08x}"',
+        'last_modified': entry['last_modified'],
+        'data': {name: entry['data'][name] for name in fields},
+    }
+
+
+def get_cached_detail(student_id, updated_at):
+    """Cached ``{'etag', 'last_modified', 'data'}`` entry for this version of a student, or None"""
+    if not detail_cache_timeout():
+        return None
+    return cache.get(detail_cache_key(student_id, updated_at))
+
+
+async def aget_cached_detail(student_id, updated_at):
+    """``get_cached_detail`` for async views"""
+    if not detail_cache_timeout():
+        return None
+    return await cache.aget(detail_cache_key(student_id, updated_at))
+
+
+def build_detail_entry(student_id, updated_at, data):
+    """Build (and cache when enabled) the detail entry for a serialized student"""
+    entry = dict(detail_version(student_id, updated_at), data=data)
+    timeout = detail_cache_timeout()
+    if timeout:
+        cache.set(detail_cache_key(student_id, updated_at), entry, timeout)
+    return entry
+
+
+async def abuild_detail_entry(student_id, updated_at, data):
+    """``build_detail_entry`` for async views"""
+    entry = dict(detail_version(student_id, updated_at), data=data)
+    timeout = detail_cache_timeout()
+    if timeout:
+        await cache.aset(detail_cache_key(student_id, updated_at), entry, timeout)
+    return entry
@@ -0,0 +1,144 @@
+"""
+Change feed for incremental downstream sync.
+
+``GET /student-onboarding/changes/`` returns the students created or updated
+after an opaque ``(updated_at, id)`` cursor, oldest change first, in batches
+read as one range of the (updated_at, id) index. Consumers store the
+``cursor`` of each response and send it back, so each call transfers only
+what changed since the last one. ``?wait=`` long-polls: an empty batch is
+retried until changes arrive or the wait runs out.
+
+A row is served once its updated_at is ONBOARDING_CHANGES_SETTLE seconds old.
+updated_at is set before a write waits for SQLite's lock, so a row could
+still commit behind a younger one that a cursor has already passed.
+The feed reads the primary for the same reason: a lagging replica could
+miss rows that the cursor then moves past.
+
+Deletes, and writes that leave updated_at alone (raw SQL, ``QuerySet.update()``
+without it), do not appear in the feed.
+"""
+import asyncio
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+
+from .models import StudentOnboarding
+from .pagination import decode_cursor, encode_cursor
+from .representations import STUDENT_DETAIL, sparse_serializer
+
+DEFAULT_BATCH_SIZE = 100
+MAX_BATCH_SIZE = 1000
+# Columns each row carries for the next cursor
+POSITION_FIELDS = ('updated_at', 'id')
+
+
+def settle_seconds():
+    return getattr(settings, 'ONBOARDING_CHANGES_SETTLE', 5.0)
+
+
+def max_wait():
+    return getattr(settings, 'ONBOARDING_CHANGES_MAX_WAIT', 30.0)
+
+
+def poll_interval():
+    return getattr(settings, 'ONBOARDING_CHANGES_POLL_INTERVAL', 0.5)
+
+
+def parse_batch_size(raw):
+    if raw is None:
+        return DEFAULT_BATCH_SIZE
+    try:
+        return max(1, min(int(raw), MAX_BATCH_SIZE))
+    except ValueError:
+        raise serializers.ValidationError({'page_size': ['Must be an integer.']})
+
+
+def parse_wait(raw):
+    if raw is None:
+        return 0.0
+    try:
+        wait = float(raw)
+    except ValueError:
+        wait = -1
+    if not 0 <= wait <= max_wait():
+        raise serializers.ValidationError({'wait': [f'Must be a number of seconds between 0 and {max_wait():g}.']})
+    return wait
+
+
+def changes_after(position, horizon):
+    """Students changed after ``position`` (None for the start) and before ``horizon``, oldest first"""
+    queryset = StudentOnboarding.objects.using(DEFAULT_DB_ALIAS).filter(updated_at__lt=horizon)
+    if position is not None:
+        updated_at, pk = position
+        # The redundant range on updated_at lets SQLite seek into the index, as in keyset pagination
+        queryset = queryset.filter(Q(updated_at__gte=updated_at), Q(updated_at__gt=updated_at) | Q(id__gt=pk))
+    return queryset.order_by('updated_at', 'id')
+
+
+class ChangeFeed:
+    """
+    One change feed request: ``?cursor=``, ``?page_size=`` (at most
+    MAX_BATCH_SIZE), ``?wait=`` seconds and the ``?fields=``/``?exclude=``
+    sparse fieldsets over the detail representation. Invalid parameters
+    raise a ValidationError (400); an invalid cursor raises NotFound, as in
+    the list endpoint.
+    """
+
+    def __init__(self, params):
+        self.fieldset = sparse_serializer(STUDENT_DETAIL, params)
+        self.batch_size = parse_batch_size(params.get('page_size'))
+        self.wait = parse_wait(params.get('wait'))
+        self.cursor = params.get('cursor') or None
+        self.position = None
+        if self.cursor:
+            try:
+                self.position, _ = decode_cursor(self.cursor)
+            except ValueError:
+                raise NotFound('Invalid cursor')
+
+    def batch(self):
+        """The lazily evaluated next batch, plus one look-ahead row"""
+        horizon = timezone.now() - timedelta(seconds=settle_seconds())
+        queryset = changes_after(self.position, horizon)
+        return self.fieldset.values(queryset, POSITION_FIELDS)[:self.batch_size + 1]
+
+    def read(self):
+        deadline = time.monotonic() + self.wait
+        rows = list(self.batch())
+        while not rows and time.monotonic() < deadline:
+            time.sleep(min(poll_interval(), max(0.0, deadline - time.monotonic())))
+            rows = list(self.batch())
+        return rows
+
+    async def aread(self):
+        """``read`` for async views: waiting does not hold a thread"""
+        deadline = time.monotonic() + self.wait
+        rows = [row async for row in self.batch()]
+        while not rows and time.monotonic() < deadline:
+            await asyncio.sleep(min(poll_interval(), max(0.0, deadline - time.monotonic())))
+            rows = [row async for row in self.batch()]
+        return rows
+
+    def response_data(self, rows, request):
+        """
+        ``results`` plus the cursor to resume from: past the last row, or the
+        request's own cursor when nothing changed. ``has_more`` says whether
+        another batch is ready now.
+        """
+        has_more = len(rows) > self.batch_size
+        rows = rows[:self.batch_size]
+        cursor = encode_cursor((rows[-1]['updated_at'], rows[-1]['id'])) if rows else self.cursor
+        next_url = replace_query_param(request.build_absolute_uri(), 'cursor', cursor) if cursor else None
+        return {
+            'cursor': cursor,
+            'next': next_url,
+            'has_more': has_more,
+            'results': self.fieldset.many(rows),
+        }
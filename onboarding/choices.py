@@ -0,0 +1,54 @@
+# Seed values for the CMS dropdown store (DropdownOption). The model choices
+# below are derived from the same lists so the form options and the values
+# StudentOnboarding accepts cannot drift apart.
+DEFAULT_DROPDOWN_OPTIONS = {
+    'gender': [
+        ('M', 'Male'),
+        ('F', 'Female'),
+        ('O', 'Other'),
+    ],
+    'citizenship': [
+        ('US', 'United States'),
+        ('CA', 'Canada'),
+        ('UK', 'United Kingdom'),
+        ('IN', 'India'),
+        ('AU', 'Australia'),
+        ('OTHER', 'Other'),
+    ],
+    'countries': [
+        ('US', 'United States'),
+        ('CA', 'Canada'),
+        ('UK', 'United Kingdom'),
+        ('IN', 'India'),
+        ('AU', 'Australia'),
+        ('DE', 'Germany'),
+        ('FR', 'France'),
+        ('JP', 'Japan'),
+    ],
+    'states': [
+        ('CA', 'California'),
+        ('NY', 'New York'),
+        ('TX', 'Texas'),
+        ('FL', 'Florida'),
+        ('IL', 'Illinois'),
+    ],
+    'professions': [
+        ('engineer', 'Engineer'),
+        ('doctor', 'Doctor'),
+        ('teacher', 'Teacher'),
+        ('lawyer', 'Lawyer'),
+        ('business', 'Business'),
+        ('other', 'Other'),
+    ],
+}
+
+DROPDOWN_CATEGORIES = list(DEFAULT_DROPDOWN_OPTIONS)
+
+GENDER_CHOICES = DEFAULT_DROPDOWN_OPTIONS['gender']
+CITIZENSHIP_CHOICES = DEFAULT_DROPDOWN_OPTIONS['citizenship']
+
+# StudentOnboarding field -> dropdown category validated against the CMS store
+MODEL_CHOICE_CATEGORIES = {
+    'gender': 'gender',
+    'citizenship': 'citizenship',
+}
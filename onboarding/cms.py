@@ -0,0 +1,132 @@
+import hashlib
+import json
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import serializers
+
+from .choices import DROPDOWN_CATEGORIES
+
+_lock = threading.Lock()
+_state = {'expires_at': 0.0, 'snapshot': None}
+
+
+def cache_ttl():
+    """
+    Seconds an in-process snapshot is trusted. Saves in this process invalidate
+    immediately; the TTL bounds how long other worker processes can lag.
+    """
+    return getattr(settings, 'ONBOARDING_DROPDOWN_CACHE_TTL', 60)
+
+
+def encode_json(data):
+    """Encode like DRF's JSONRenderer with the default compact, unicode settings"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _load():
+    from .models import DropdownOption
+
+    options = {category: [] for category in DROPDOWN_CATEGORIES}
+    # The primary, not a replica: a snapshot loaded after invalidate() must include that save
+    rows = (
+        DropdownOption.objects.using(DEFAULT_DB_ALIAS)
+        .filter(is_active=True).values_list('category', 'value', 'label')
+    )
+    for category, value, label in rows:
+        options.setdefault(category, []).append({'value': value, 'label': label})
+    version = hashlib.sha1(encode_json(options)).hexdigest()[:16]
+    return options, version
+
+
+def _fresh_snapshot():
+    snapshot = _state['snapshot']
+    if snapshot is None or time.monotonic() >= _state['expires_at']:
+        return None
+    return snapshot
+
+
+def _snapshot():
+    # Each reload builds a new snapshot dict, so readers holding the old one
+    # never see a half-updated mix of options, version and encodings.
+    snapshot = _state['snapshot']
+    if snapshot is None or time.monotonic() >= _state['expires_at']:
+        with _lock:
+            snapshot = _state['snapshot']
+            if snapshot is None or time.monotonic() >= _state['expires_at']:
+                options, version = _load()
+                snapshot = {'options': options, 'version': version, 'encoded': {}}
+                _state['snapshot'] = snapshot
+                _state['expires_at'] = time.monotonic() + cache_ttl()
+    return snapshot
+
+
+def invalidate():
+    """Drop the in-process snapshot; the next read reloads from the database"""
+    with _lock:
+        _state['snapshot'] = None
+
+
+def get_dropdown_options():
+    """All active options as ``{category: [{'value', 'label'}, ...]}``"""
+    return _snapshot()['options']
+
+
+def get_options_version():
+    """Short content hash that changes whenever any option changes"""
+    return _snapshot()['version']
+
+
+def get_choices(category):
+    """Active ``(value, label)`` pairs for one category"""
+    return [(option['value'], option['label']) for option in get_dropdown_options().get(category, [])]
+
+
+def get_encoded_options(fields=None):
+    """
+    Pre-encoded JSON bytes and ETag for all categories or the ``fields`` subset.
+
+    Encodings are memoized per subset until the snapshot is invalidated.
+    """
+    return _encoded_options(_snapshot(), fields)
+
+
+async def aget_encoded_options(fields=None):
+    """
+    ``get_encoded_options`` for async views. A fresh snapshot is served on the
+    event loop; only a reload hops to a thread for the database read.
+    """
+    snapshot = _fresh_snapshot() or await sync_to_async(_snapshot)()
+    return _encoded_options(snapshot, fields)
+
+
+async def aload_snapshot():
+    """Reload a stale snapshot in a thread, so sync readers called on the event loop stay query-free"""
+    if _fresh_snapshot() is None:
+        await sync_to_async(_snapshot)()
+
+
+def resolve_option_fields(requested):
+    """Validate a comma separated category list; None or empty means every category"""
+    if not requested:
+        return None
+    names = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = [name for name in names if name not in DROPDOWN_CATEGORIES]
+    if unknown:
+        raise serializers.ValidationError({'fields': [f'Unknown option lists: {", ".join(unknown)}.']})
+    return [name for name in DROPDOWN_CATEGORIES if name in names]
+
+
+def _encoded_options(snapshot, fields):
+    key = tuple(fields) if fields else ()
+    cached = snapshot['encoded'].get(key)
+    if cached is None:
+        options = snapshot['options']
+        data = {name: options[name] for name in fields} if fields else options
+        suffix = f'-{hashlib.sha1(",".join(key).encode()).hexdigest()[:8]}' if key else ''
+        cached = (data, encode_json(data), f'"{snapshot["version"]}{suffix}"')
+        snapshot['encoded'][key] = cached
+    return cached
@@ -0,0 +1,56 @@
+"""
+SQLite connection tuning and the serialized write path.
+
+``apply_sqlite_pragmas`` runs ONBOARDING_SQLITE_PRAGMAS on every new SQLite
+connection (wired to connection_created in signals.py). ``run_write`` runs a
+write while holding a process-wide lock, so the threads of one process never
+race each other for SQLite's single write lock. It retries with jittered
+exponential backoff when another process holds the database ("database is
+locked"). Both are off in the base settings and enabled by
+student_onboarding.settings_production.
+"""
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+
+_write_lock = threading.RLock()
+
+LOCK_ERRORS = ('database is locked', 'database table is locked', 'database is busy')
+
+
+def apply_sqlite_pragmas(connection):
+    pragmas = getattr(settings, 'ONBOARDING_SQLITE_PRAGMAS', None)
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    # Straight on the sqlite3 connection so execute wrappers do not count them
+    for name, value in pragmas.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+def is_lock_error(exc):
+    return isinstance(exc, OperationalError) and any(message in str(exc) for message in LOCK_ERRORS)
+
+
+def run_write(write, using=None):
+    """
+    Call ``write()`` under the process-wide write lock, retrying lock errors
+    up to ONBOARDING_WRITE_RETRIES times. Inside an outer transaction a
+    failed statement cannot be replayed, so errors there are raised at once.
+    """
+    if not getattr(settings, 'ONBOARDING_SERIALIZE_WRITES', False):
+        return write()
+    retries = getattr(settings, 'ONBOARDING_WRITE_RETRIES', 5)
+    backoff = getattr(settings, 'ONBOARDING_WRITE_BACKOFF', 0.01)
+    in_transaction = transaction.get_connection(using).in_atomic_block
+    for attempt in range(retries + 1):
+        try:
+            with _write_lock:
+                return write()
+        except OperationalError as exc:
+            if not is_lock_error(exc) or in_transaction or attempt == retries:
+                raise
+        # Sleep outside the lock so the other threads of this process keep writing
+        time.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.0))
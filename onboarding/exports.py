@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import StudentOnboarding
+from .representations import field_converter, resolve_fieldset
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_FIELDS = [field.name for field in StudentOnboarding._meta.concrete_fields]
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Rows rendered per yielded chunk; keeps per-row generator overhead low
+LINES_PER_CHUNK = 500
+
+
+def export_chunk_size():
+    """Rows fetched from SQLite per round trip while exporting"""
+    return getattr(settings, 'ONBOARDING_EXPORT_CHUNK_SIZE', 2000)
+
+
+def resolve_export_fields(requested, excluded=None):
+    """Validate comma separated field and exclude lists; no fields means every field"""
+    params = {'fields': requested, 'exclude': excluded}
+    return list(resolve_fieldset(params, EXPORT_FIELDS, EXPORT_FIELDS))
+
+
+def build_row_converter(fields):
+    """
+    Return a function turning a ``values_list`` tuple into a list of JSON/CSV
+    friendly values. Converters are resolved once per export, and only the
+    date, datetime and decimal columns are touched per row.
+    """
+    tz = timezone.get_current_timezone()
+    converters = []
+    for index, name in enumerate(fields):
+        converter = field_converter(StudentOnboarding._meta.get_field(name))
+        if converter is not None:
+            converters.append((index, converter))
+
+    def convert(row):
+        row = list(row)
+        for index, converter in converters:
+            if row[index] is not None:
+                row[index] = converter(row[index], tz)
+        return row
+
+    return convert
+
+
+def export_rows(queryset, fields, chunk_size=None):
+    """Stream value tuples in id order without materializing model instances"""
+    return queryset.order_by('id').values_list(*fields).iterator(chunk_size=chunk_size or export_chunk_size())
+
+
+def _chunks(rows, render):
+    buffer = []
+    for row in rows:
+        buffer.append(render(row))
+        if len(buffer) >= LINES_PER_CHUNK:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def csv_stream(rows, fields):
+    """Yield CSV text chunks: a header line, then one line per row"""
+    output = io.StringIO()
+    writer = csv.writer(output)
+
+    convert = build_row_converter(fields)
+
+    def render(row):
+        output.seek(0)
+        output.truncate()
+        writer.writerow(row)
+        return output.getvalue()
+
+    yield render(fields)
+    yield from _chunks((convert(row) for row in rows), render)
+
+
+def ndjson_stream(rows, fields):
+    """Yield NDJSON text chunks, one JSON object per row"""
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    convert = build_row_converter(fields)
+
+    def render(row):
+        return encode(dict(zip(fields, convert(row)))) + '\n'
+
+    yield from _chunks(rows, render)
+
+
+def stream_export(queryset, output_format, fields, chunk_size=None):
+    """Text chunks for ``queryset`` in ``output_format`` (``csv`` or ``ndjson``)"""
+    return stream_rows(export_rows(queryset, fields, chunk_size), output_format, fields)
+
+
+def stream_rows(rows, output_format, fields):
+    """Text chunks for the ``values_list`` tuples ``rows`` in ``output_format``"""
+    if output_format == 'csv':
+        return csv_stream(rows, fields)
+    return ndjson_stream(rows, fields)
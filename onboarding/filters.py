@@ -0,0 +1,121 @@
+import re
+from datetime import datetime, time
+
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import serializers
+
+from .cms import get_choices
+from .models import StudentArchiveEntry, StudentFamilyAbroad, StudentOnboarding
+
+TRUE_VALUES = {'1', 'true', 'yes'}
+FALSE_VALUES = {'0', 'false', 'no'}
+
+# query parameter -> (model field, lookup)
+RANGE_FILTERS = {
+    'created_after': ('created_at', 'gte'),
+    'created_before': ('created_at', 'lt'),
+    'updated_after': ('updated_at', 'gte'),
+    'updated_before': ('updated_at', 'lt'),
+}
+
+CHOICE_FILTERS = {
+    'gender': StudentOnboarding.GENDER_CHOICES,
+    'citizenship': StudentOnboarding.CITIZENSHIP_CHOICES,
+}
+
+
+def parse_boolean(name, value):
+    """Parse a query-string boolean such as ``true``/``false``/``1``/``0``"""
+    lowered = value.lower()
+    if lowered in TRUE_VALUES:
+        return True
+    if lowered in FALSE_VALUES:
+        return False
+    raise serializers.ValidationError({name: ['Must be true or false.']})
+
+
+def parse_timestamp(name, value):
+    """Parse an ISO datetime or date into an aware datetime"""
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            parsed = datetime.combine(day, time.min) if day is not None else None
+    except ValueError:
+        # Well formed but impossible, such as 2024-02-30 or 25:00
+        parsed = None
+    if parsed is None:
+        raise serializers.ValidationError({name: ['Must be an ISO 8601 date or datetime.']})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, timezone.get_default_timezone())
+    return parsed
+
+
+def filter_students(queryset, params, counting=False):
+    """
+    Apply the list endpoint filters to a StudentOnboarding (or StudentArchiveEntry) queryset.
+
+    Supported parameters: ``gender`` and ``citizenship`` (comma separated
+    choice values), ``country``, ``has_family_abroad``, ``family_abroad_in``
+    (comma separated dropdown country codes, any of them) and the
+    ``created_after``/``created_before``/``updated_after``/``updated_before``
+    ranges (after is inclusive, before is exclusive). Invalid values raise a
+    ValidationError so the view answers 400.
+
+    ``counting`` builds the queryset to COUNT rather than to page through;
+    ``family_abroad_in`` has a different best plan for each.
+    """
+    for name, choices in CHOICE_FILTERS.items():
+        raw = params.get(name)
+        if not raw:
+            continue
+        allowed = {value for value, label in choices}
+        values = [value.strip() for value in raw.split(',') if value.strip()]
+        invalid = [value for value in values if value not in allowed]
+        if invalid:
+            raise serializers.ValidationError({name: [f'Invalid choice: {", ".join(invalid)}.']})
+        if len(values) == 1:
+            queryset = queryset.filter(**{name: values[0]})
+        else:
+            queryset = queryset.filter(**{f'{name}__in': values})
+
+    country = params.get('country')
+    if country:
+        queryset = queryset.filter(country=country)
+
+    has_family_abroad = params.get('has_family_abroad')
+    if has_family_abroad:
+        # `exact` on a boolean compiles to a bare `WHERE "has_family_abroad"`,
+        # which SQLite cannot match against an index column; `IN (x)` can.
+        flag = parse_boolean('has_family_abroad', has_family_abroad)
+        queryset = queryset.filter(has_family_abroad__in=[flag])
+
+    family_abroad_in = params.get('family_abroad_in')
+    if family_abroad_in:
+        allowed = {value for value, label in get_choices('countries')}
+        codes = [code.strip() for code in family_abroad_in.split(',') if code.strip()]
+        invalid = [code for code in codes if code not in allowed]
+        if invalid:
+            raise serializers.ValidationError({'family_abroad_in': [f'Invalid choice: {", ".join(invalid)}.']})
+        # Matches come from the (country, student) index, not a LIKE over countries_abroad
+        matches = StudentFamilyAbroad.objects.filter(country__in=codes)
+        if queryset.model is StudentArchiveEntry:
+            # Archived students have no StudentFamilyAbroad rows; match the stored codes ("DE, FR")
+            pattern = '|'.join(re.escape(code) for code in codes)
+            queryset = queryset.filter(countries_abroad__regex=rf'(^|, )({pattern})(,|$)')
+        elif counting:
+            # One primary key probe per match, whatever the table size
+            queryset = queryset.filter(id__in=matches.values('student_id'))
+        else:
+            # Pages walk the created_at index and stop once they are full; an
+            # IN (subquery) would fetch and sort every match first
+            queryset = queryset.filter(Exists(matches.filter(student_id=OuterRef('pk'))))
+
+    for name, (field, lookup) in RANGE_FILTERS.items():
+        raw = params.get(name)
+        if raw:
+            queryset = queryset.filter(**{f'{field}__{lookup}': parse_timestamp(name, raw)})
+
+    return queryset
@@ -0,0 +1,110 @@
+import csv
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+
+from .validators import validate_email_format, validate_phone_number, validate_zipcode
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+# Columns an export carries that an import must not write
+IGNORED_COLUMNS = {'id', 'created_at', 'updated_at'}
+
+_row_serializer = None
+
+
+def detect_format(path):
+    """Guess the input format from the file extension"""
+    return 'ndjson' if path.endswith(('.ndjson', '.jsonl', '.json')) else 'csv'
+
+
+def read_rows(path, input_format, skip_lines=0):
+    """
+    Yield ``(line_number, row)`` pairs from a CSV or NDJSON file without loading it.
+
+    Line numbers count data rows from 1 (the CSV header is not a row). Rows up
+    to ``skip_lines`` are skipped so an import can resume from a checkpoint.
+    Empty CSV cells are dropped so optional fields fall back to their defaults.
+    """
+    with open(path, encoding='utf-8', newline='') as handle:
+        if input_format == 'csv':
+            source = csv.DictReader(handle)
+        else:
+            source = (line for line in handle if line.strip())
+        for line_number, item in enumerate(source, start=1):
+            if line_number <= skip_lines:
+                continue
+            if input_format == 'csv':
+                row = {key: value for key, value in item.items() if key and value != ''}
+            else:
+                try:
+                    row = json.loads(item)
+                except ValueError as exc:
+                    yield line_number, {'__error__': f'Invalid JSON: {exc}'}
+                    continue
+            if isinstance(row, dict):
+                row = {key: value for key, value in row.items() if key not in IGNORED_COLUMNS}
+            yield line_number, row
+
+
+def init_worker():
+    """Process pool initializer: make Django usable in a spawned worker"""
+    import django
+    from django.db import connections
+
+    django.setup()
+    # Never reuse a connection inherited from the parent process
+    connections.close_all()
+
+
+def _get_row_serializer():
+    # One serializer per process; run_validation reuses its bound fields the
+    # way ListSerializer does, instead of rebuilding them for every row.
+    global _row_serializer
+    if _row_serializer is None:
+        from .serializers import StudentOnboardingBatchSerializer
+        _row_serializer = StudentOnboardingBatchSerializer()
+    return _row_serializer
+
+
+def _precheck(row):
+    errors = {}
+    for field, validator in (
+        ('email', validate_email_format),
+        ('mobile_number', validate_phone_number),
+        ('guardian_phone', validate_phone_number),
+        ('zipcode', validate_zipcode),
+    ):
+        if isinstance(row.get(field), str):
+            try:
+                validator(row[field])
+            except DjangoValidationError as exc:
+                errors[field] = exc.messages
+    return errors
+
+
+def validate_chunk(chunk):
+    """
+    Validate a list of ``(line_number, row)`` pairs; runs inside pool workers.
+
+    Returns ``(line_number, row, validated_data, errors)`` tuples where exactly
+    one of ``validated_data`` and ``errors`` is set. Email uniqueness against
+    the database is left to the parent, which checks a whole chunk at once.
+    """
+    serializer = _get_row_serializer()
+    results = []
+    for line_number, row in chunk:
+        if not isinstance(row, dict) or '__error__' in row:
+            message = row.get('__error__') if isinstance(row, dict) else 'Expected an object.'
+            results.append((line_number, row, None, {'non_field_errors': [message]}))
+            continue
+        errors = _precheck(row)
+        if errors:
+            results.append((line_number, row, None, errors))
+            continue
+        try:
+            results.append((line_number, row, serializer.run_validation(row), None))
+        except serializers.ValidationError as exc:
+            results.append((line_number, row, None, exc.detail))
+    return results
@@ -0,0 +1,106 @@
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from onboarding.archive import (
+    ARCHIVE_TABLES, HOT_TABLES, archive_after_days, archive_block_size, archive_students, tier_bytes,
+)
+from onboarding.models import StudentOnboarding
+from onboarding.representations import STUDENT_LIST_ITEM
+
+# Timed runs per query in the report
+REPORT_RUNS = 5
+
+
+def parse_cutoff(raw):
+    value = parse_datetime(raw)
+    if value is None:
+        day = parse_date(raw)
+        if day is None:
+            raise CommandError(f'--before: not an ISO date or datetime: {raw}')
+        value = datetime.combine(day, datetime.min.time())
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def p50_ms(query):
+    timings = []
+    for _ in range(REPORT_RUNS):
+        started = time.perf_counter()
+        query()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def megabytes(size):
+    return 'n/a' if size is None else f'{size / 1024 / 1024:.1f}'
+
+
+class Command(BaseCommand):
+    help = (
+        'Move students not updated since a cutoff (default: ONBOARDING_ARCHIVE_AFTER_DAYS ago) out of the live '
+        'table into compressed archive blocks, and report the hot tier before and after'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, help='Default: ONBOARDING_ARCHIVE_AFTER_DAYS')
+        parser.add_argument('--before', help='ISO date or datetime cutoff; overrides --older-than-days')
+        parser.add_argument('--block-size', type=int, help='Students per block (default: ONBOARDING_ARCHIVE_BLOCK_SIZE)')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the students that would move')
+        parser.add_argument('--vacuum', action='store_true', help='VACUUM afterwards so the file shrinks too')
+
+    def handle(self, *args, **options):
+        if options['before']:
+            cutoff = parse_cutoff(options['before'])
+        else:
+            days = archive_after_days() if options['older_than_days'] is None else options['older_than_days']
+            cutoff = timezone.now() - timedelta(days=days)
+        size = options['block_size'] or archive_block_size()
+        if size < 1:
+            raise CommandError('--block-size must be positive')
+
+        due = StudentOnboarding.objects.using(DEFAULT_DB_ALIAS).filter(updated_at__lt=cutoff).count()
+        if options['dry_run']:
+            self.stdout.write(f'{due:,} students last updated before {cutoff.isoformat()} would be archived')
+            return
+
+        before = self.measure()
+        started = time.perf_counter()
+        moved = archive_students(
+            cutoff, size, progress=lambda moved: self.stderr.write(f'\rArchived {moved:,}/{due:,}', ending=''),
+        )
+        if moved:
+            self.stderr.write('')
+        elapsed = time.perf_counter() - started
+        if options['vacuum']:
+            with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+                cursor.execute('VACUUM')
+        after = self.measure()
+
+        self.stdout.write(f'{"":<22}{"before":>12}{"after":>12}')
+        for label, key in (
+            ('hot rows', 'rows'), ('hot MB', 'hot'), ('archive MB', 'archive'),
+            ('list page p50 ms', 'page'), ('count p50 ms', 'count'),
+        ):
+            self.stdout.write(f'{label:<22}{before[key]:>12}{after[key]:>12}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {moved:,} students in {-(-moved // size):,} blocks of up to {size} ({elapsed:.2f}s)'
+        ))
+
+    def measure(self):
+        """The hot tier's size and the latency of the list endpoint's queries"""
+        students = StudentOnboarding.objects.using(DEFAULT_DB_ALIAS)
+        page = students.order_by('-created_at', '-id').values(*STUDENT_LIST_ITEM.fields)
+        return {
+            'rows': f'{students.count():,}',
+            'hot': megabytes(tier_bytes(HOT_TABLES)),
+            'archive': megabytes(tier_bytes(ARCHIVE_TABLES)),
+            'page': f'{p50_ms(lambda: list(page[:20])):.2f}',
+            'count': f'{p50_ms(students.count):.2f}',
+        }
@@ -0,0 +1,136 @@
+import collections
+import itertools
+import json
+import multiprocessing
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from onboarding.bulk import bulk_create_students, find_email_conflicts
+from onboarding.importing import IMPORT_FORMATS, detect_format, init_worker, read_rows, validate_chunk
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bounded_imap(pool, function, iterable, window):
+    """
+    Ordered ``pool.imap`` that keeps at most ``window`` chunks in flight.
+
+    ``Pool.imap`` drains its input eagerly, which would pull a multi-million
+    row file into memory while the parent is still committing early chunks.
+    """
+    pending = collections.deque()
+    for item in iterable:
+        pending.append(pool.apply_async(function, (item,)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+class Command(BaseCommand):
+    help = (
+        'Import student onboarding records from a CSV or NDJSON file: validate in a process '
+        'pool, insert with chunked bulk_create, log rejected rows and checkpoint progress'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='CSV (with header) or NDJSON file')
+        parser.add_argument('--input-format', choices=IMPORT_FORMATS, help='Default: from the file extension')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows validated and committed together')
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Validation processes; 0 validates in this process'
+        )
+        parser.add_argument('--rejects', help='NDJSON file for rejected rows (default: <input>.rejects.ndjson)')
+        parser.add_argument('--checkpoint', help='Progress file (default: <input>.checkpoint.json)')
+        parser.add_argument('--resume', action='store_true', help='Continue after the last committed chunk')
+
+    def handle(self, *args, **options):
+        path = options['input']
+        if not os.path.exists(path):
+            raise CommandError(f'Input file not found: {path}')
+        input_format = options['input_format'] or detect_format(path)
+        rejects_path = options['rejects'] or f'{path}.rejects.ndjson'
+        checkpoint_path = options['checkpoint'] or f'{path}.checkpoint.json'
+
+        state = {'line': 0, 'created': 0, 'rejected': 0}
+        if options['resume'] and os.path.exists(checkpoint_path):
+            with open(checkpoint_path, encoding='utf-8') as handle:
+                state.update(json.load(handle))
+            self.stderr.write(f"Resuming after line {state['line']}")
+
+        chunks = chunked(read_rows(path, input_format, skip_lines=state['line']), options['chunk_size'])
+        pool = None
+        if options['workers'] > 0:
+            pool = multiprocessing.get_context('spawn').Pool(options['workers'], initializer=init_worker)
+            validated_chunks = bounded_imap(pool, validate_chunk, chunks, options['workers'] * 2)
+        else:
+            validated_chunks = map(validate_chunk, chunks)
+
+        started = time.perf_counter()
+        processed = 0
+        try:
+            with open(rejects_path, 'a' if options['resume'] else 'w', encoding='utf-8') as rejects:
+                for results in validated_chunks:
+                    created, rejected = self.commit_chunk(results, rejects)
+                    processed += len(results)
+                    state['line'] = results[-1][0]
+                    state['created'] += created
+                    state['rejected'] += rejected
+                    rejects.flush()
+                    self.write_checkpoint(checkpoint_path, state)
+                    rate = processed / (time.perf_counter() - started)
+                    self.stderr.write(
+                        f"line {state['line']}: {state['created']} created, "
+                        f"{state['rejected']} rejected ({rate:,.0f} rows/s)"
+                    )
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {state['created']} rows, rejected {state['rejected']} "
+            f"({processed / elapsed if elapsed else 0:,.0f} rows/s)"
+        ))
+
+    def commit_chunk(self, results, rejects):
+        """Insert the valid rows of one chunk and log the rest; returns (created, rejected)"""
+        failures = [(line, row, errors) for line, row, data, errors in results if errors]
+        valid = [(line, row, data) for line, row, data, errors in results if not errors]
+
+        conflicts = find_email_conflicts([data['email'] for line, row, data in valid])
+        insertable = []
+        for (line, row, data), conflict in zip(valid, conflicts):
+            if conflict:
+                failures.append((line, row, conflict))
+            else:
+                insertable.append((line, row, data))
+
+        outcomes = bulk_create_students([data for line, row, data in insertable])
+        created = 0
+        for (line, row, data), outcome in zip(insertable, outcomes):
+            if isinstance(outcome, dict):
+                failures.append((line, row, outcome))
+            else:
+                created += 1
+
+        for line, row, errors in sorted(failures, key=lambda failure: failure[0]):
+            rejects.write(json.dumps({'line': line, 'row': row, 'errors': errors}, default=str) + '\n')
+        return created, len(failures)
+
+    def write_checkpoint(self, path, state):
+        # Write then rename so a crash never leaves a truncated checkpoint
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as handle:
+            json.dump(state, handle)
+        os.replace(temporary, path)
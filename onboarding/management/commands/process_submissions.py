@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from onboarding.submissions import claim_batch, get_submission_batch_size, process_batch, requeue_stale
+
+
+class Command(BaseCommand):
+    help = (
+        'Drain the queued onboarding submissions: validate each batch, bulk-insert the valid rows '
+        'and record every submission outcome. Runs until stopped unless --once is given'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=get_submission_batch_size(),
+                            help='Submissions claimed and inserted together')
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--stale-after', type=float, default=300,
+                            help='Requeue submissions left processing this many seconds (a crashed worker)')
+
+    def handle(self, *args, **options):
+        totals = {'created': 0, 'failed': 0}
+        try:
+            while True:
+                requeued = requeue_stale(options['stale_after'])
+                if requeued:
+                    self.stderr.write(f'Requeued {requeued} stale submissions')
+                submissions = claim_batch(options['batch_size'])
+                if not submissions:
+                    if options['once']:
+                        break
+                    time.sleep(options['interval'])
+                    continue
+                started = time.perf_counter()
+                created, failed = process_batch(submissions)
+                totals['created'] += created
+                totals['failed'] += failed
+                self.stderr.write(
+                    f'Processed {len(submissions)} submissions in {time.perf_counter() - started:.2f}s '
+                    f'({created} created, {failed} failed)'
+                )
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed submissions: {totals['created']} created, {totals['failed']} failed"
+        ))
@@ -0,0 +1,28 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from onboarding.bloom import rebuild_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the email availability Bloom filter from every stored email and write the snapshot '
+        'that running processes reload (within ONBOARDING_EMAIL_FILTER_SYNC_INTERVAL) and new ones start from'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('-o', '--output', help='Snapshot file (default: ONBOARDING_EMAIL_FILTER_PATH)')
+
+    def handle(self, *args, **options):
+        path = options['output'] or getattr(settings, 'ONBOARDING_EMAIL_FILTER_PATH', None)
+        if not path:
+            raise CommandError('Set ONBOARDING_EMAIL_FILTER_PATH or pass --output')
+        started = time.perf_counter()
+        bloom, count = rebuild_snapshot(str(path))
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {path}: {count:,} emails, {len(bloom.bits) / 1024 / 1024:.1f} MiB, {bloom.hashes} hashes, '
+            f'expected false-positive rate {bloom.false_positive_rate(count):.4%} '
+            f'({time.perf_counter() - started:.2f}s)'
+        ))
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from onboarding.analytics import rebuild_summary
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the onboarding analytics summary from every stored student, archived ones included, '
+        'correcting drift from writes that bypass model signals (QuerySet.update(), raw SQL)'
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        written = rebuild_summary()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt the analytics summary: {written:,} rows ({time.perf_counter() - started:.2f}s)'
+        ))
@@ -0,0 +1,51 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError
+
+from onboarding.replicas import max_lag, replica_aliases, sync_replica
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy the primary database into the read replicas (ONBOARDING_READ_REPLICAS) with the SQLite '
+        'backup API. Runs until stopped unless --once is given; the interval must stay well under '
+        'ONBOARDING_REPLICA_MAX_LAG or reads fall back to the primary'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('aliases', nargs='*', help='Replicas to sync (default: all)')
+        parser.add_argument('--once', action='store_true', help='Sync each replica once and exit')
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds between syncs of each replica')
+
+    def handle(self, *args, **options):
+        aliases = options['aliases'] or list(replica_aliases())
+        unknown = [alias for alias in aliases if alias not in replica_aliases()]
+        if unknown:
+            raise CommandError(f'Not in ONBOARDING_READ_REPLICAS: {", ".join(unknown)}')
+        if not aliases:
+            raise CommandError('No read replicas configured (ONBOARDING_READ_REPLICAS)')
+        if not options['once'] and options['interval'] >= max_lag():
+            self.stderr.write(self.style.WARNING(
+                f"--interval {options['interval']}s is not under ONBOARDING_REPLICA_MAX_LAG ({max_lag()}s): "
+                'replicas will go stale between syncs'
+            ))
+        try:
+            while True:
+                started = time.perf_counter()
+                for alias in aliases:
+                    synced = time.perf_counter()
+                    try:
+                        sync_replica(alias)
+                    except (OperationalError, sqlite3.Error) as exc:
+                        # A lagging replica only sends reads to the primary; try again next round
+                        self.stderr.write(f'Sync of {alias} failed: {exc}')
+                        continue
+                    self.stderr.write(f'Synced {alias} in {time.perf_counter() - synced:.2f}s')
+                if options['once']:
+                    break
+                time.sleep(max(0.0, options['interval'] - (time.perf_counter() - started)))
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'Synced replicas: {", ".join(aliases)}'))
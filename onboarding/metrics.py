@@ -0,0 +1,217 @@
+"""
+Per-endpoint request metrics, exposed in the Prometheus text format.
+
+``RequestMetricsMiddleware`` records, per URL name and method: request count
+by status code, latency, request and response body sizes, and the number and
+total time of SQL queries. SQL is measured by an execute wrapper attached to
+every database connection that reports into the current request's context,
+so queries run from sync_to_async threads under ASGI are counted too.
+
+Metrics live in process memory; with several worker processes, scrape each
+process (or run a single process per scrape target).
+"""
+import bisect
+import contextvars
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+UNMATCHED_VIEW = '<unmatched>'
+
+_request_stats = contextvars.ContextVar('onboarding_request_stats', default=None)
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``counts`` are per bucket, made cumulative on render"""
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def samples(self):
+        """``(le, cumulative_count)`` pairs ending with ``+Inf``"""
+        cumulative = 0
+        for bound, count in zip((*self.buckets, '+Inf'), self.counts):
+            cumulative += count
+            yield bound, cumulative
+
+
+class EndpointMetrics:
+    __slots__ = ('latency', 'request_size', 'response_size', 'queries', 'query_seconds')
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.request_size = Histogram(SIZE_BUCKETS)
+        self.response_size = Histogram(SIZE_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.query_seconds = 0.0
+
+
+HISTOGRAMS = (
+    ('latency', 'onboarding_http_request_duration_seconds', 'Request latency in seconds.'),
+    ('request_size', 'onboarding_http_request_size_bytes', 'Request body size in bytes.'),
+    ('response_size', 'onboarding_http_response_size_bytes', 'Response body size in bytes (streamed bodies excluded).'),
+    ('queries', 'onboarding_db_queries_per_request', 'SQL queries issued per request.'),
+)
+
+
+def _labels(**labels):
+    return ','.join(f'{name}="{value}"' for name, value in labels.items())
+
+
+class MetricsRegistry:
+    """Thread-safe store of the metrics for one process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._statuses = {}
+            self._endpoints = {}
+
+    def observe(self, view, method, status, duration, request_bytes, response_bytes, queries, query_seconds):
+        with self._lock:
+            key = (view, method, status)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+            endpoint = self._endpoints.get((view, method))
+            if endpoint is None:
+                endpoint = self._endpoints[(view, method)] = EndpointMetrics()
+            endpoint.latency.observe(duration)
+            endpoint.request_size.observe(request_bytes)
+            if response_bytes is not None:
+                endpoint.response_size.observe(response_bytes)
+            endpoint.queries.observe(queries)
+            endpoint.query_seconds += query_seconds
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (0.0.4)"""
+        lines = [
+            '# HELP onboarding_http_requests_total Requests by URL name, method and status code.',
+            '# TYPE onboarding_http_requests_total counter',
+        ]
+        with self._lock:
+            for (view, method, status), count in sorted(self._statuses.items()):
+                labels = _labels(view=view, method=method, status=status)
+                lines.append(f'onboarding_http_requests_total{{{labels}}} {count}')
+
+            endpoints = sorted(self._endpoints.items())
+            for attribute, metric, help_text in HISTOGRAMS:
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} histogram')
+                for (view, method), metrics in endpoints:
+                    histogram = getattr(metrics, attribute)
+                    labels = _labels(view=view, method=method)
+                    for bound, count in histogram.samples():
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f'{metric}_sum{{{labels}}} {histogram.total}')
+                    lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+
+            lines.append('# HELP onboarding_db_query_duration_seconds_total Time spent in SQL queries.')
+            lines.append('# TYPE onboarding_db_query_duration_seconds_total counter')
+            for (view, method), metrics in endpoints:
+                labels = _labels(view=view, method=method)
+                lines.append(f'onboarding_db_query_duration_seconds_total{{{labels}}} {metrics.query_seconds}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats[0] += 1
+        stats[1] += time.perf_counter() - started
+
+
+def _attach_query_recorder(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def install_query_recorder():
+    """Attach the SQL recorder to current and future database connections (idempotent)"""
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(_attach_query_recorder, dispatch_uid='onboarding-metrics-queries')
+    for connection in connections.all(initialized_only=True):
+        _attach_query_recorder(None, connection)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record per-endpoint metrics into ``registry``. Put it first in MIDDLEWARE
+    so the latency covers the whole middleware stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        install_query_recorder()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        stats = [0, 0.0]
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        self.record(request, response, time.perf_counter() - started, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats = [0, 0.0]
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        self.record(request, response, time.perf_counter() - started, stats)
+        return response
+
+    def record(self, request, response, duration, stats):
+        match = request.resolver_match
+        try:
+            request_bytes = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            request_bytes = 0
+        response_bytes = None if response.streaming else len(response.content)
+        registry.observe(
+            (match.url_name or match.view_name) if match else UNMATCHED_VIEW,
+            request.method,
+            response.status_code,
+            duration,
+            request_bytes,
+            response_bytes,
+            stats[0],
+            stats[1],
+        )
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:38
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentOnboarding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_name', models.CharField(max_length=100)),
+                ('last_name', models.CharField(max_length=100)),
+                ('date_of_birth', models.DateField()),
+                ('gender', models.CharField(choices=[('M', 'Male'), ('F', 'Female'), ('O', 'Other')], max_length=1)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('mobile_number', models.CharField(max_length=15, validators=[django.core.validators.RegexValidator(message='Phone number must be entered in the format: +1234567890', regex='^\\+?1?\\d{9,15}$')])),
+                ('address_line_1', models.CharField(max_length=255)),
+                ('address_line_2', models.CharField(blank=True, max_length=255, null=True)),
+                ('city', models.CharField(max_length=100)),
+                ('state', models.CharField(max_length=100)),
+                ('country', models.CharField(max_length=100)),
+                ('zipcode', models.CharField(max_length=20)),
+                ('citizenship', models.CharField(choices=[('US', 'United States'), ('CA', 'Canada'), ('UK', 'United Kingdom'), ('IN', 'India'), ('AU', 'Australia'), ('OTHER', 'Other')], max_length=10)),
+                ('guardian_name', models.CharField(max_length=200)),
+                ('guardian_relationship', models.CharField(max_length=50)),
+                ('guardian_phone', models.CharField(max_length=15, validators=[django.core.validators.RegexValidator(message='Phone number must be entered in the format: +1234567890', regex='^\\+?1?\\d{9,15}$')])),
+                ('guardian_email', models.EmailField(max_length=254)),
+                ('father_name', models.CharField(blank=True, max_length=200, null=True)),
+                ('father_profession', models.CharField(blank=True, max_length=100, null=True)),
+                ('mother_name', models.CharField(blank=True, max_length=200, null=True)),
+                ('mother_profession', models.CharField(blank=True, max_length=100, null=True)),
+                ('family_income', models.DecimalField(decimal_places=2, max_digits=12, validators=[django.core.validators.MinValueValidator(0)])),
+                ('number_of_siblings', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(20)])),
+                ('has_family_abroad', models.BooleanField(default=False)),
+                ('countries_abroad', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Student Onboarding',
+                'verbose_name_plural': 'Student Onboardings',
+                'db_table': 'student_onboarding',
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentonboarding',
+            index=models.Index(fields=['-created_at', '-id'], name='student_created_id_idx'),
+        ),
+    ]
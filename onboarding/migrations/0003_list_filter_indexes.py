@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0002_student_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentonboarding',
+            index=models.Index(fields=['citizenship', 'created_at'], name='student_citizen_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentonboarding',
+            index=models.Index(fields=['citizenship', 'has_family_abroad', 'created_at'], name='student_cit_abroad_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentonboarding',
+            index=models.Index(fields=['gender', 'created_at'], name='student_gender_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentonboarding',
+            index=models.Index(fields=['country', 'created_at'], name='student_country_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentonboarding',
+            index=models.Index(fields=['updated_at', 'id'], name='student_updated_id_idx'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+from django.db import migrations
+
+# Frozen copy of the index as this migration creates it: later edits to
+# onboarding.search must not change what an old migration runs
+CREATE_FTS_SQL = [
+    """
+    CREATE VIRTUAL TABLE student_onboarding_fts USING fts5(
+        first_name, last_name, email, mobile_number,
+        content='student_onboarding', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER student_onboarding_fts_ai AFTER INSERT ON student_onboarding BEGIN
+        INSERT INTO student_onboarding_fts(rowid, first_name, last_name, email, mobile_number)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.mobile_number);
+    END
+    """,
+    """
+    CREATE TRIGGER student_onboarding_fts_ad AFTER DELETE ON student_onboarding BEGIN
+        INSERT INTO student_onboarding_fts(student_onboarding_fts, rowid, first_name, last_name, email, mobile_number)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.mobile_number);
+    END
+    """,
+    """
+    CREATE TRIGGER student_onboarding_fts_au AFTER UPDATE OF first_name, last_name, email, mobile_number
+    ON student_onboarding BEGIN
+        INSERT INTO student_onboarding_fts(student_onboarding_fts, rowid, first_name, last_name, email, mobile_number)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.mobile_number);
+        INSERT INTO student_onboarding_fts(rowid, first_name, last_name, email, mobile_number)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.mobile_number);
+    END
+    """,
+    "INSERT INTO student_onboarding_fts(student_onboarding_fts) VALUES ('rebuild')",
+]
+
+DROP_FTS_SQL = [
+    'DROP TRIGGER IF EXISTS student_onboarding_fts_ai',
+    'DROP TRIGGER IF EXISTS student_onboarding_fts_ad',
+    'DROP TRIGGER IF EXISTS student_onboarding_fts_au',
+    'DROP TABLE IF EXISTS student_onboarding_fts',
+]
+
+
+def sqlite_supports_fts5(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def create_fts_index(apps, schema_editor):
+    # Other backends (and SQLite builds without FTS5) fall back to icontains search
+    if not sqlite_supports_fts5(schema_editor.connection):
+        return
+    for statement in CREATE_FTS_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_FTS_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0003_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0004_student_search_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DropdownOption',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('gender', 'gender'), ('citizenship', 'citizenship'), ('countries', 'countries'), ('states', 'states'), ('professions', 'professions')], max_length=50)),
+                ('value', models.CharField(max_length=50)),
+                ('label', models.CharField(max_length=100)),
+                ('sort_order', models.PositiveIntegerField(default=0)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Dropdown Option',
+                'verbose_name_plural': 'Dropdown Options',
+                'db_table': 'dropdown_option',
+                'ordering': ['category', 'sort_order', 'id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dropdownoption',
+            constraint=models.UniqueConstraint(fields=('category', 'value'), name='dropdown_option_category_value_uniq'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+from django.db import migrations
+
+# Frozen copy of onboarding.choices.DEFAULT_DROPDOWN_OPTIONS as first seeded; the
+# live lists may change without changing what this migration inserts
+SEED_OPTIONS = {
+    'gender': [
+        ('M', 'Male'),
+        ('F', 'Female'),
+        ('O', 'Other'),
+    ],
+    'citizenship': [
+        ('US', 'United States'),
+        ('CA', 'Canada'),
+        ('UK', 'United Kingdom'),
+        ('IN', 'India'),
+        ('AU', 'Australia'),
+        ('OTHER', 'Other'),
+    ],
+    'countries': [
+        ('US', 'United States'),
+        ('CA', 'Canada'),
+        ('UK', 'United Kingdom'),
+        ('IN', 'India'),
+        ('AU', 'Australia'),
+        ('DE', 'Germany'),
+        ('FR', 'France'),
+        ('JP', 'Japan'),
+    ],
+    'states': [
+        ('CA', 'California'),
+        ('NY', 'New York'),
+        ('TX', 'Texas'),
+        ('FL', 'Florida'),
+        ('IL', 'Illinois'),
+    ],
+    'professions': [
+        ('engineer', 'Engineer'),
+        ('doctor', 'Doctor'),
+        ('teacher', 'Teacher'),
+        ('lawyer', 'Lawyer'),
+        ('business', 'Business'),
+        ('other', 'Other'),
+    ],
+}
+
+
+def seed_dropdown_options(apps, schema_editor):
+    DropdownOption = apps.get_model('onboarding', 'DropdownOption')
+    DropdownOption.objects.bulk_create([
+        DropdownOption(category=category, value=value, label=label, sort_order=position)
+        for category, options in SEED_OPTIONS.items()
+        for position, (value, label) in enumerate(options)
+    ])
+
+
+def remove_dropdown_options(apps, schema_editor):
+    apps.get_model('onboarding', 'DropdownOption').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0005_dropdown_option'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_dropdown_options, remove_dropdown_options),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0006_seed_dropdown_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OnboardingSubmission',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('payload', models.JSONField()),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('processing', 'Processing'), ('created', 'Created'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('errors', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('student', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='onboarding.studentonboarding')),
+            ],
+            options={
+                'verbose_name': 'Onboarding Submission',
+                'verbose_name_plural': 'Onboarding Submissions',
+                'db_table': 'onboarding_submission',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='submission_status_created_idx')],
+            },
+        ),
+    ]
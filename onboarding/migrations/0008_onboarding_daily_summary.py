@@ -0,0 +1,78 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:22
+
+from django.db import migrations, models
+from django.db.models import Case, CharField, Count, F, Value, When
+from django.db.models.functions import Cast, TruncDate
+
+# Frozen copy of onboarding.analytics' dimensions and rebuild as of this migration
+INCOME_BOUNDS = (0, 25000, 50000, 100000, 250000, 500000)
+
+
+def dimensions():
+    income = Case(
+        *[
+            When(family_income__lt=upper, then=Value(f'{lower}-{upper}'))
+            for lower, upper in zip(INCOME_BOUNDS, INCOME_BOUNDS[1:])
+        ],
+        default=Value(f'{INCOME_BOUNDS[-1]}+'), output_field=CharField(),
+    )
+    return {
+        'citizenship': F('citizenship'),
+        'gender': F('gender'),
+        'country': F('country'),
+        'number_of_siblings': Cast('number_of_siblings', CharField()),
+        'has_family_abroad': Case(
+            When(has_family_abroad=True, then=Value('true')), default=Value('false'), output_field=CharField(),
+        ),
+        'family_income': income,
+    }
+
+
+def populate_summary(apps, schema_editor):
+    StudentOnboarding = apps.get_model('onboarding', 'StudentOnboarding')
+    OnboardingDailySummary = apps.get_model('onboarding', 'OnboardingDailySummary')
+    using = schema_editor.connection.alias
+    for dimension, expression in dimensions().items():
+        groups = (
+            StudentOnboarding.objects.using(using)
+            .annotate(summary_day=TruncDate('created_at'), summary_value=expression)
+            .values('summary_day', 'summary_value')
+            .annotate(students=Count('id'))
+            .order_by()
+        )
+        OnboardingDailySummary.objects.using(using).bulk_create([
+            OnboardingDailySummary(
+                day=group['summary_day'], dimension=dimension, value=group['summary_value'], students=group['students'],
+            )
+            for group in groups
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0007_onboarding_submission'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OnboardingDailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('dimension', models.CharField(max_length=30)),
+                ('value', models.CharField(max_length=100)),
+                ('students', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Onboarding Daily Summary',
+                'verbose_name_plural': 'Onboarding Daily Summaries',
+                'db_table': 'onboarding_daily_summary',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='onboardingdailysummary',
+            constraint=models.UniqueConstraint(fields=('dimension', 'day', 'value'), name='summary_dimension_day_value_uniq'),
+        ),
+        migrations.RunPython(populate_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+import re
+
+# Frozen copies of onboarding.abroad's parsing as of this migration
+SEPARATOR_RE = re.compile(r'[,;/|]')
+
+
+def parse_countries_abroad(value, choices):
+    lookup = {}
+    for code, label in choices:
+        lookup[code.casefold()] = code
+        lookup[label.casefold()] = code
+    codes, unknown = [], []
+    for token in SEPARATOR_RE.split(value or ''):
+        token = token.strip()
+        if not token:
+            continue
+        code = lookup.get(token.casefold())
+        if code is None:
+            unknown.append(token)
+        elif code not in codes:
+            codes.append(code)
+    return codes, unknown
+
+
+def format_countries_abroad(codes):
+    return ', '.join(codes) or None
+
+
+def populate_family_abroad(apps, schema_editor):
+    StudentOnboarding = apps.get_model('onboarding', 'StudentOnboarding')
+    StudentFamilyAbroad = apps.get_model('onboarding', 'StudentFamilyAbroad')
+    DropdownOption = apps.get_model('onboarding', 'DropdownOption')
+    using = schema_editor.connection.alias
+
+    # Inactive options too: older rows may name countries since retired from the form
+    choices = list(DropdownOption.objects.using(using).filter(category='countries').values_list('value', 'label'))
+    students = (
+        StudentOnboarding.objects.using(using)
+        .exclude(countries_abroad__isnull=True).exclude(countries_abroad='')
+        .values_list('id', 'countries_abroad')
+    )
+    rows, normalized = [], []
+    for pk, text in students.iterator(2000):
+        codes, unknown = parse_countries_abroad(text, choices)
+        rows.extend(StudentFamilyAbroad(student_id=pk, country=code) for code in codes)
+        # Text naming unrecognized countries is kept as is rather than losing them
+        if not unknown and format_countries_abroad(codes) != text:
+            normalized.append((pk, format_countries_abroad(codes)))
+        if len(rows) >= 10000:
+            StudentFamilyAbroad.objects.using(using).bulk_create(rows, batch_size=1000)
+            rows = []
+    StudentFamilyAbroad.objects.using(using).bulk_create(rows, batch_size=1000)
+    StudentOnboarding.objects.using(using).bulk_update(
+        [StudentOnboarding(id=pk, countries_abroad=text) for pk, text in normalized], ['countries_abroad'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0008_onboarding_daily_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentFamilyAbroad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('country', models.CharField(max_length=10)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='family_abroad', to='onboarding.studentonboarding')),
+            ],
+            options={
+                'verbose_name': 'Student Family Abroad',
+                'verbose_name_plural': 'Student Family Abroad',
+                'db_table': 'student_family_abroad',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='studentfamilyabroad',
+            constraint=models.UniqueConstraint(fields=('country', 'student'), name='family_abroad_country_student_uniq'),
+        ),
+        migrations.RunPython(populate_family_abroad, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0009_student_family_abroad'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentArchiveBlock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('students', models.PositiveIntegerField()),
+                ('payload', models.BinaryField()),
+            ],
+            options={
+                'verbose_name': 'Student Archive Block',
+                'verbose_name_plural': 'Student Archive Blocks',
+                'db_table': 'student_archive_block',
+            },
+        ),
+        migrations.AlterField(
+            model_name='onboardingsubmission',
+            name='student',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='onboarding.studentonboarding'),
+        ),
+        migrations.CreateModel(
+            name='StudentArchiveEntry',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('gender', models.CharField(max_length=1)),
+                ('citizenship', models.CharField(max_length=10)),
+                ('country', models.CharField(max_length=100)),
+                ('has_family_abroad', models.BooleanField()),
+                ('countries_abroad', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('block', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='entries', to='onboarding.studentarchiveblock')),
+            ],
+            options={
+                'verbose_name': 'Student Archive Entry',
+                'verbose_name_plural': 'Student Archive Entries',
+                'db_table': 'student_archive_entry',
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='archive_created_id_idx')],
+            },
+        ),
+    ]
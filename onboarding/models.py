@@ -2,22 +2,13 @@ from django.db import models
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 import re
+import uuid
+from . import choices
 
 class StudentOnboarding(models.Model):
-    GENDER_CHOICES = [
-        ('M', 'Male'),
-        ('F', 'Female'),
-        ('O', 'Other'),
-    ]
+    GENDER_CHOICES = choices.GENDER_CHOICES
     
-    CITIZENSHIP_CHOICES = [
-        ('US', 'United States'),
-        ('CA', 'Canada'),
-        ('UK', 'United Kingdom'),
-        ('IN', 'India'),
-        ('AU', 'Australia'),
-        ('OTHER', 'Other'),
-    ]
+    CITIZENSHIP_CHOICES = choices.CITIZENSHIP_CHOICES
     
     # Personal Information
     first_name = models.CharField(max_length=100)
@@ -86,9 +77,31 @@ class StudentOnboarding(models.Model):
         db_table = 'student_onboarding'
         verbose_name = 'Student Onboarding'
         verbose_name_plural = 'Student Onboardings'
+        indexes = [
+            # Keyset pagination walks the list in (created_at, id) order
+            models.Index(fields=['-created_at', '-id'], name='student_created_id_idx'),
+            # List filters: equality columns first, then the created_at range
+            models.Index(fields=['citizenship', 'created_at'], name='student_citizen_created_idx'),
+            models.Index(fields=['citizenship', 'has_family_abroad', 'created_at'], name='student_cit_abroad_created_idx'),
+            models.Index(fields=['gender', 'created_at'], name='student_gender_created_idx'),
+            models.Index(fields=['country', 'created_at'], name='student_country_created_idx'),
+            models.Index(fields=['updated_at', 'id'], name='student_updated_id_idx'),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.email}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Kept so post_save can move the analytics counts of fields an update changed
+        instance._loaded_values = dict(zip(field_names, values))
+        # Kept apart: analytics replaces _loaded_values after each save (onboarding.abroad)
+        if 'countries_abroad' in instance._loaded_values:
+            instance._stored_countries_abroad = instance._loaded_values['countries_abroad']
+        if 'email' in instance._loaded_values:
+            instance._stored_email = instance._loaded_values['email']
+        return instance
     
     def clean(self):
         # Custom validation
@@ -100,7 +113,177 @@ class StudentOnboarding(models.Model):
             domain = self.email.split('@')[1]
             if len(domain) < 3:
                 raise ValidationError('Invalid email domain')
+
+        # Stored as dropdown country codes, mirrored into StudentFamilyAbroad on save. An
+        # unchanged value passes as stored: legacy text and since deactivated countries
+        # must not lock the record against other edits
+        from .abroad import countries_abroad_changed, normalize_countries_abroad
+        if self.countries_abroad and countries_abroad_changed(self, self.countries_abroad):
+            try:
+                self.countries_abroad = normalize_countries_abroad(self.countries_abroad)
+            except ValidationError as exc:
+                raise ValidationError({'countries_abroad': exc.messages})
     
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs) 
\ No newline at end of file
+    def validate_unique(self, exclude=None):
+        super().validate_unique(exclude)
+        # Archived students left the live unique index but keep their emails (onboarding.archive)
+        if (exclude is None or 'email' not in exclude) and self.email_archived():
+            raise ValidationError({'email': [self.unique_error_message(StudentOnboarding, ('email',))]})
+
+    def email_archived(self):
+        """Whether an archived student holds this email; queries only for a new email the email filter may hold"""
+        from .bloom import might_exist
+        # A write does not pay for the first build of the filter: until then, every new email is looked up
+        if not self.email or self.email == getattr(self, '_stored_email', None):
+            return False
+        if not might_exist(self.email, build=False):
+            return False
+        return StudentArchiveEntry.objects.filter(email=self.email).exists()
+
+    def save(self, *args, full_clean=True, **kwargs):
+        # The API serializer has already run these checks and passes full_clean=False
+        if full_clean:
+            self.full_clean()
+        super().save(*args, **kwargs) 
+        self._stored_email = self.email
+
+class DropdownOption(models.Model):
+    """A CMS-managed option served by the dropdown-options endpoint"""
+    category = models.CharField(max_length=50, choices=[(name, name) for name in choices.DROPDOWN_CATEGORIES])
+    value = models.CharField(max_length=50)
+    label = models.CharField(max_length=100)
+    sort_order = models.PositiveIntegerField(default=0)
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'dropdown_option'
+        verbose_name = 'Dropdown Option'
+        verbose_name_plural = 'Dropdown Options'
+        ordering = ['category', 'sort_order', 'id']
+        constraints = [
+            models.UniqueConstraint(fields=['category', 'value'], name='dropdown_option_category_value_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.category}: {self.label}"
+
+
+class OnboardingSubmission(models.Model):
+    """A create request accepted into the outbox, validated and inserted later by process_submissions"""
+    QUEUED = 'queued'
+    PROCESSING = 'processing'
+    CREATED = 'created'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (PROCESSING, 'Processing'),
+        (CREATED, 'Created'),
+        (FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    payload = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    # No database constraint: archive_students moves students out of student_onboarding, and their
+    # submissions keep pointing at them (the detail endpoint falls through to the archive)
+    student = models.ForeignKey(
+        StudentOnboarding, null=True, blank=True, on_delete=models.SET_NULL, related_name='+', db_constraint=False
+    )
+    errors = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'onboarding_submission'
+        verbose_name = 'Onboarding Submission'
+        verbose_name_plural = 'Onboarding Submissions'
+        indexes = [
+            # The worker claims the oldest queued submissions first
+            models.Index(fields=['status', 'created_at'], name='submission_status_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.id} ({self.status})"
+
+
+class OnboardingDailySummary(models.Model):
+    """Students created per day for one value of one analytics dimension, kept current on every write"""
+    day = models.DateField()
+    dimension = models.CharField(max_length=30)
+    value = models.CharField(max_length=100)
+    students = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'onboarding_daily_summary'
+        verbose_name = 'Onboarding Daily Summary'
+        verbose_name_plural = 'Onboarding Daily Summaries'
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'day', 'value'], name='summary_dimension_day_value_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.dimension}={self.value}: {self.students}"
+
+
+class StudentFamilyAbroad(models.Model):
+    """One country a student has family in, mirrored from countries_abroad for indexed filtering"""
+    student = models.ForeignKey(StudentOnboarding, on_delete=models.CASCADE, related_name='family_abroad')
+    country = models.CharField(max_length=10)
+
+    class Meta:
+        db_table = 'student_family_abroad'
+        verbose_name = 'Student Family Abroad'
+        verbose_name_plural = 'Student Family Abroad'
+        constraints = [
+            # Leads with country: ?family_abroad_in= reads student ids straight from this index
+            models.UniqueConstraint(fields=['country', 'student'], name='family_abroad_country_student_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id}: {self.country}"
+
+
+class StudentArchiveBlock(models.Model):
+    """The packed columns of up to ONBOARDING_ARCHIVE_BLOCK_SIZE archived students, compressed together"""
+    archived_at = models.DateTimeField(auto_now_add=True)
+    students = models.PositiveIntegerField()
+    # zlib-compressed JSON, see onboarding.archive
+    payload = models.BinaryField()
+
+    class Meta:
+        db_table = 'student_archive_block'
+        verbose_name = 'Student Archive Block'
+        verbose_name_plural = 'Student Archive Blocks'
+
+    def __str__(self):
+        return f"Block {self.pk}: {self.students} students"
+
+
+class StudentArchiveEntry(models.Model):
+    """An archived student: its id and block, and uncompressed the columns the list orders and filters on"""
+    id = models.BigIntegerField(primary_key=True)
+    # Only ever joined from the entry side, so it needs no index
+    block = models.ForeignKey(StudentArchiveBlock, on_delete=models.PROTECT, related_name='entries', db_index=False)
+    # Unique here and checked by the live writes, so an archived email stays taken
+    email = models.EmailField(unique=True)
+    gender = models.CharField(max_length=1)
+    citizenship = models.CharField(max_length=10)
+    country = models.CharField(max_length=100)
+    has_family_abroad = models.BooleanField()
+    countries_abroad = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'student_archive_entry'
+        verbose_name = 'Student Archive Entry'
+        verbose_name_plural = 'Student Archive Entries'
+        indexes = [
+            # Merged with student_created_id_idx when ?include_archived=1 pages through both tiers
+            models.Index(fields=['-created_at', '-id'], name='archive_created_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.id} (block {self.block_id})"
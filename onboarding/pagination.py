@@ -0,0 +1,217 @@
+import base64
+import json
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def encode_cursor(position, reverse=False):
+    """Encode a (timestamp, id) position, such as (created_at, id), as an opaque URL-safe cursor"""
+    created_at, pk = position
+    payload = {'c': created_at.isoformat(), 'i': pk}
+    if reverse:
+        payload['r'] = 1
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by ``encode_cursor``; raises ValueError when malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        created_at = parse_datetime(payload['c'])
+        pk = int(payload['i'])
+    except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+    if created_at is None:
+        raise ValueError('Invalid cursor')
+    return (created_at, pk), bool(payload.get('r'))
+
+
+def _position(item):
+    if isinstance(item, dict):
+        return item['created_at'], item['id']
+    return item.created_at, item.id
+
+
+class StudentKeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on (created_at, id), newest first.
+
+    Each page is a single indexed range read of ``page_size + 1`` rows, so the
+    cost does not depend on how deep the client pages and no COUNT(*) is run.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    # Columns a page's rows must carry for the next/previous cursors
+    position_fields = ('created_at', 'id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        """``paginate_queryset`` for async views, fetching rows with ``async for``"""
+        return self.set_page([item async for item in self.page_queryset(queryset, request)])
+
+    def page_queryset(self, queryset, request):
+        """The lazily evaluated ``page_size + 1`` row slice for the requested cursor"""
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), 'page')
+        page_size = self.current_page_size = self.get_page_size(request)
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        position, reverse = None, False
+        if encoded:
+            try:
+                position, reverse = decode_cursor(encoded)
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+
+        # The redundant range on created_at lets SQLite seek into the index
+        # instead of scanning it from the top and testing the OR per row.
+        if reverse:
+            queryset = queryset.order_by('created_at', 'id')
+            if position:
+                created_at, pk = position
+                queryset = queryset.filter(
+                    Q(created_at__gte=created_at), Q(created_at__gt=created_at) | Q(id__gt=pk)
+                )
+        else:
+            queryset = queryset.order_by('-created_at', '-id')
+            if position:
+                created_at, pk = position
+                queryset = queryset.filter(
+                    Q(created_at__lte=created_at), Q(created_at__lt=created_at) | Q(id__lt=pk)
+                )
+        self.position, self.reverse = position, reverse
+        return queryset[:page_size + 1]
+
+    def set_page(self, results):
+        """Trim the look-ahead row from a fetched slice and record the links"""
+        page_size = self.current_page_size
+        has_more = len(results) > page_size
+        results = results[:page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        cursor = encode_cursor(_position(self.page[-1]))
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        cursor = encode_cursor(_position(self.page[0]), reverse=True)
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+
+class StudentOnboardingPagination(PageNumberPagination):
+    """
+    Page-number pagination by default (kept for existing clients and the admin
+    UI), switching to keyset pagination when ``?cursor=`` or
+    ``?pagination=cursor`` is supplied.
+    """
+    keyset_class = StudentKeysetPagination
+
+    def use_keyset(self, request):
+        params = request.query_params
+        return self.keyset_class.cursor_query_param in params or params.get('pagination') == 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Views may define ``get_count_queryset()``: the same rows, filtered in
+        a form that is cheaper to count than to page through.
+        """
+        self.keyset = self.keyset_class() if self.use_keyset(request) else None
+        if self.keyset is not None:
+            return self.keyset.paginate_queryset(queryset, request, view)
+        get_count_queryset = getattr(view, 'get_count_queryset', None)
+        if get_count_queryset is None:
+            return super().paginate_queryset(queryset, request, view)
+
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        paginator.count = get_count_queryset().count()
+        self.set_page(paginator, request)
+        return list(self.page)
+
+    async def apaginate_queryset(self, queryset, request, count_queryset=None):
+        """
+        ``paginate_queryset`` for async views. The count (of ``count_queryset``
+        when given) and the page slice are fetched with the async ORM;
+        validation and links reuse DRF's code.
+        """
+        self.keyset = self.keyset_class() if self.use_keyset(request) else None
+        if self.keyset is not None:
+            return await self.keyset.apaginate_queryset(queryset, request)
+
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        # Paginator.count is a cached_property; seed it so page() never counts synchronously
+        paginator.count = await (count_queryset if count_queryset is not None else queryset).acount()
+        self.set_page(paginator, request)
+        self.page.object_list = [item async for item in self.page.object_list]
+        return list(self.page)
+
+    def set_page(self, paginator, request):
+        """Select the requested page of a paginator whose count is already known"""
+        self.request = request
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        if paginator.num_pages > 1 and self.template is not None:
+            # The browsable API should display pagination controls
+            self.display_page_controls = True
+
+    def get_paginated_data(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_data(data)
+        return {
+            'count': self.page.paginator.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,326 @@
+"""
+On-demand request profiling.
+
+``RequestProfilingMiddleware`` profiles a request when a staff user sends an
+``X-Profile`` header, or when it falls in the sampled fraction of traffic
+(ONBOARDING_PROFILING_SAMPLE_RATE). A profiled request runs under cProfile
+while every SQL statement is captured with its timing and the code that
+issued it. After the response, each distinct statement gets its SQLite
+``EXPLAIN QUERY PLAN``, repeated statements are flagged (identical
+duplicates, and N+1 style repeats of one statement with different
+parameters), and the report is written to ONBOARDING_PROFILING_DIR as JSON
+next to a ``.prof`` file loadable with pstats or snakeviz.
+
+Under ASGI, cProfile sees the event loop thread only, so sync views run in
+a worker thread are missing from the call profile; SQL capture still covers
+them. A thread runs at most one profiler, so a request triggered while
+another request on the loop is being profiled is served unprofiled (its
+calls show up in the other request's profile).
+"""
+import cProfile
+import contextvars
+import io
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import traceback
+import uuid
+from collections import Counter, defaultdict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+REPORT_ID_RE = re.compile(r'^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$')
+
+# A statement run this many times with different parameters is an N+1 suspect
+REPEAT_THRESHOLD = 3
+PROFILE_LINES = 40
+# Report fields repeated in the listing
+SUMMARY_KEYS = ('id', 'created_at', 'trigger', 'method', 'path', 'view', 'status', 'duration_ms')
+
+_captured = contextvars.ContextVar('onboarding_profiled_queries', default=None)
+# The profiler enabled on each thread, if any
+_active = threading.local()
+
+
+def profiling_dir():
+    return str(getattr(settings, 'ONBOARDING_PROFILING_DIR', os.path.join(settings.BASE_DIR, 'profiles')))
+
+
+def sample_rate():
+    return getattr(settings, 'ONBOARDING_PROFILING_SAMPLE_RATE', 0.0)
+
+
+def _capture_query(execute, sql, params, many, context):
+    captured = _captured.get()
+    if captured is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        captured.append({
+            'sql': sql,
+            'params': None if many else params,
+            'many': many,
+            'alias': context['connection'].alias,
+            'duration_ms': (time.perf_counter() - started) * 1000,
+            'origin': _origin(),
+        })
+
+
+def _origin():
+    """The innermost project frames (outside this module) that issued a query"""
+    root = str(settings.BASE_DIR)
+    frames = [
+        f'{os.path.relpath(frame.filename, root)}:{frame.lineno} in {frame.name}'
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(root) and 'site-packages' not in frame.filename
+        and frame.filename != __file__
+    ]
+    return frames[-3:]
+
+
+def _attach_query_capture(sender, connection, **kwargs):
+    if _capture_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_capture_query)
+
+
+def start_profiler():
+    """Enable and return a new profiler, or None if this thread already runs one"""
+    if getattr(_active, 'profiler', None) is not None:
+        return None
+    _active.profiler = cProfile.Profile()
+    _active.profiler.enable()
+    return _active.profiler
+
+
+def stop_profiler(profiler):
+    profiler.disable()
+    _active.profiler = None
+
+
+def install_query_capture():
+    """Attach the SQL capture wrapper to current and future connections (idempotent)"""
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(_attach_query_capture, dispatch_uid='onboarding-profiling-queries')
+    for connection in connections.all(initialized_only=True):
+        _attach_query_capture(None, connection)
+
+
+def explain(query):
+    """SQLite ``EXPLAIN QUERY PLAN`` rows for a captured statement, or None"""
+    connection = connections[query['alias']]
+    if connection.vendor != 'sqlite' or query['many']:
+        return None
+    if not query['sql'].lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE', 'WITH')):
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'], query['params'])
+            return [row[-1] for row in cursor.fetchall()]
+    except Exception as exc:  # a plan is best effort; never fail the report
+        return [f'unavailable: {exc}']
+
+
+def analyze_queries(queries):
+    """
+    Flag repeated statements: ``duplicates`` ran with identical parameters,
+    ``n_plus_one`` ran REPEAT_THRESHOLD+ times with varying parameters.
+    """
+    identical = Counter((query['sql'], repr(query['params'])) for query in queries)
+    duplicates = [
+        {'sql': sql, 'params': params, 'count': count}
+        for (sql, params), count in identical.items() if count > 1
+    ]
+    by_statement = defaultdict(list)
+    for query in queries:
+        by_statement[query['sql']].append(query)
+    n_plus_one = []
+    for sql, runs in by_statement.items():
+        distinct = {repr(run['params']) for run in runs}
+        if len(runs) >= REPEAT_THRESHOLD and len(distinct) > 1:
+            n_plus_one.append({
+                'sql': sql,
+                'count': len(runs),
+                'distinct_params': len(distinct),
+                'origins': sorted({' <- '.join(reversed(run['origin'])) for run in runs}),
+            })
+    return duplicates, n_plus_one
+
+
+def build_report(request, response, duration, profiler, queries, trigger):
+    """Assemble the JSON report; runs after the response, outside the profiler"""
+    plans = {}
+    for query in queries:
+        key = (query['alias'], query['sql'], repr(query['params']))
+        if key not in plans:
+            plans[key] = explain(query)
+        query['plan'] = plans[key]
+        query['params'] = repr(query['params'])
+    duplicates, n_plus_one = analyze_queries(queries)
+
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(PROFILE_LINES)
+    match = request.resolver_match
+    user = getattr(request, 'user', None)
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'trigger': trigger,
+        'method': request.method,
+        'path': request.path,
+        'query_string': request.META.get('QUERY_STRING', ''),
+        'view': (match.url_name or match.view_name) if match else None,
+        'user': user.get_username() if user is not None and user.is_authenticated else None,
+        'status': response.status_code,
+        'duration_ms': duration * 1000,
+        'sql': {
+            'count': len(queries),
+            'total_ms': sum(query['duration_ms'] for query in queries),
+            'queries': queries,
+        },
+        'duplicates': duplicates,
+        'n_plus_one': n_plus_one,
+        'profile': stream.getvalue(),
+    }
+
+
+def save_report(report, profiler):
+    """Write ``<id>.json`` and ``<id>.prof``, prune old reports, and return the id"""
+    directory = profiling_dir()
+    os.makedirs(directory, exist_ok=True)
+    report_id = f'{time.strftime("%Y%m%dT%H%M%S")}-{uuid.uuid4().hex[:8]}'
+    report['id'] = report_id
+    profiler.dump_stats(os.path.join(directory, f'{report_id}.prof'))
+    with open(os.path.join(directory, f'{report_id}.json'), 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2, default=str)
+    _prune(directory)
+    return report_id
+
+
+def _prune(directory):
+    keep = getattr(settings, 'ONBOARDING_PROFILING_MAX_REPORTS', 200)
+    report_ids = sorted(name[:-5] for name in os.listdir(directory) if name.endswith('.json'))
+    for report_id in report_ids[:-keep] if keep else []:
+        for extension in ('json', 'prof'):
+            try:
+                os.remove(os.path.join(directory, f'{report_id}.{extension}'))
+            except FileNotFoundError:
+                pass
+
+
+def report_path(report_id, extension):
+    """Path of a stored report file, or None for ids that are malformed or missing"""
+    if not REPORT_ID_RE.match(report_id):
+        return None
+    path = os.path.join(profiling_dir(), f'{report_id}.{extension}')
+    return path if os.path.exists(path) else None
+
+
+def list_reports():
+    """Summaries of the stored reports, newest first"""
+    directory = profiling_dir()
+    if not os.path.isdir(directory):
+        return []
+    summaries = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith('.json'):
+            continue
+        with open(os.path.join(directory, name), encoding='utf-8') as handle:
+            report = json.load(handle)
+        summaries.append({
+            **{key: report.get(key) for key in SUMMARY_KEYS},
+            'queries': report['sql']['count'],
+            'duplicates': len(report['duplicates']),
+            'n_plus_one': len(report['n_plus_one']),
+        })
+    return summaries
+
+
+def load_report(report_id):
+    path = report_path(report_id, 'json')
+    if path is None:
+        return None
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+class RequestProfilingMiddleware:
+    """
+    Profile staff requests carrying ``X-Profile`` and a sampled fraction of
+    all traffic. Place it after AuthenticationMiddleware. Profiled responses
+    carry an ``X-Profile-Id`` header naming the stored report.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        install_query_capture()
+
+    def trigger(self, request, is_staff):
+        if PROFILE_HEADER in request.META and is_staff():
+            return 'header'
+        rate = sample_rate()
+        if rate and random.random() < rate:
+            return 'sample'
+        return None
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        trigger = self.trigger(request, lambda: _is_staff(request))
+        profiler = start_profiler() if trigger else None
+        if profiler is None:
+            return self.get_response(request)
+
+        queries = []
+        token = _captured.set(queries)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_profiler(profiler)
+            _captured.reset(token)
+        report = build_report(request, response, time.perf_counter() - started, profiler, queries, trigger)
+        response['X-Profile-Id'] = save_report(report, profiler)
+        return response
+
+    async def __acall__(self, request):
+        if PROFILE_HEADER in request.META:
+            staff = await sync_to_async(_is_staff)(request)
+            trigger = self.trigger(request, lambda: staff)
+        else:
+            trigger = self.trigger(request, lambda: False)
+        # Concurrent requests share the event loop thread, and with it the profiler
+        profiler = start_profiler() if trigger else None
+        if profiler is None:
+            return await self.get_response(request)
+
+        queries = []
+        token = _captured.set(queries)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_profiler(profiler)
+            _captured.reset(token)
+        duration = time.perf_counter() - started
+        report = await sync_to_async(build_report)(request, response, duration, profiler, queries, trigger)
+        response['X-Profile-Id'] = await sync_to_async(save_report)(report, profiler)
+        return response
+
+
+def _is_staff(request):
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_active and user.is_staff)
@@ -0,0 +1,208 @@
+"""
+Read replicas for the SQLite backend.
+
+ONBOARDING_READ_REPLICAS names DATABASES aliases holding copies of the
+primary (``default``), refreshed by ``manage.py sync_replicas`` through
+SQLite's online backup API; no other service is involved. ``ReplicaRouter``
+sends the reads of GET, HEAD and OPTIONS requests (list, detail, export,
+admin changelist...) to a replica. Everything else stays on the primary:
+writes, the reads of unsafe-method requests, management commands and
+workers.
+
+Staleness is bounded: each sync records when it started next to the replica
+file (``<NAME>.synced``), and a replica whose last sync started more than
+ONBOARDING_REPLICA_MAX_LAG seconds ago serves nothing. Clients read their
+own writes: a request that wrote answers with a cookie holding the time it
+finished, and the client's reads stay on the primary until a replica has
+been synced since, at most ONBOARDING_REPLICA_MAX_LAG seconds later. Reads
+made after a write within one request go to the primary as well.
+
+One replica is picked per request, so a page and its count read the same
+snapshot.
+"""
+import contextvars
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+READ_AFTER_COOKIE = 'onboarding_read_after'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_routing = contextvars.ContextVar('onboarding_replica_routing', default=None)
+
+
+def replica_aliases():
+    return getattr(settings, 'ONBOARDING_READ_REPLICAS', ())
+
+
+def max_lag():
+    return getattr(settings, 'ONBOARDING_REPLICA_MAX_LAG', 5.0)
+
+
+def stamp_path(alias):
+    return f"{connections.settings[alias]['NAME']}.synced"
+
+
+class SyncStamps:
+    """Last sync start time per replica, re-read only when its stamp file changes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stamps = {}
+
+    def get(self, alias):
+        path = stamp_path(alias)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            cached = self._stamps.get(path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+        try:
+            with open(path, encoding='ascii') as handle:
+                synced_at = float(handle.read())
+        except (FileNotFoundError, ValueError):
+            return None
+        with self._lock:
+            self._stamps[path] = (mtime, synced_at)
+        return synced_at
+
+
+sync_stamps = SyncStamps()
+
+
+def choose_replica(read_after=0.0):
+    """A replica synced within the lag bound and since ``read_after``, or None for the primary"""
+    now = time.time()
+    fresh = []
+    for alias in replica_aliases():
+        synced_at = sync_stamps.get(alias)
+        if synced_at is not None and now - synced_at <= max_lag() and synced_at >= read_after:
+            fresh.append(alias)
+    return random.choice(fresh) if fresh else None
+
+
+class RoutingState:
+    """Routing of one request: whether it may read a replica, which one, and whether it wrote"""
+    __slots__ = ('replica_reads', 'read_after', 'alias', 'wrote')
+
+    def __init__(self, replica_reads, read_after=0.0):
+        self.replica_reads = replica_reads
+        self.read_after = read_after
+        self.alias = None
+        self.wrote = False
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or not state.replica_reads or state.wrote:
+            return None
+        if state.alias is None:
+            state.alias = choose_replica(state.read_after) or DEFAULT_DB_ALIAS
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        pool = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema with the data, from sync_replica
+        if db in replica_aliases():
+            return False
+        return None
+
+
+def read_after(request):
+    try:
+        return float(request.COOKIES.get(READ_AFTER_COOKIE, 0))
+    except ValueError:
+        return 0.0
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route the reads of safe-method requests to replicas, and keep a client
+    that just wrote on the primary. Does nothing without ONBOARDING_READ_REPLICAS.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not replica_aliases():
+            return self.get_response(request)
+        state = RoutingState(request.method in SAFE_METHODS, read_after(request))
+        token = _routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self.finish(state, response)
+
+    async def __acall__(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+        state = RoutingState(request.method in SAFE_METHODS, read_after(request))
+        token = _routing.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self.finish(state, response)
+
+    def finish(self, state, response):
+        if state.wrote:
+            # Set once the view has returned, so after its writes committed
+            response.set_cookie(
+                READ_AFTER_COOKIE, f'{time.time():.6f}', max_age=math.ceil(max_lag()), httponly=True, samesite='Lax'
+            )
+        return response
+
+
+def sync_replica(alias, using=DEFAULT_DB_ALIAS):
+    """
+    Copy the primary into replica ``alias`` with the SQLite backup API and
+    record the sync. The copy is one consistent snapshot taken after the
+    recorded start time; readers of the replica see the old or the new copy.
+    Returns the start time.
+    """
+    source = connections[using]
+    source.ensure_connection()
+    started = time.time()
+    target = sqlite3.connect(connections.settings[alias]['NAME'])
+    try:
+        source.connection.backup(target)
+    finally:
+        target.close()
+    path = stamp_path(alias)
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='ascii') as handle:
+        handle.write(f'{started:.6f}')
+    os.replace(temporary, path)
+    return started
@@ -0,0 +1,192 @@
+"""
+Compiled, read-only representations of StudentOnboarding rows.
+
+DRF's ModelSerializer builds a field object per column and walks them for
+every instance. For the read paths we only need the output, so the per-column
+work is resolved once from the model field types: most columns are copied as
+is, and only dates, datetimes and decimals go through a converter that
+reproduces what the DRF field would render.
+"""
+import datetime
+import decimal
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from rest_framework import ISO_8601
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import ALL_FIELDS
+from rest_framework.settings import api_settings
+
+from .models import StudentOnboarding
+from .serializers import StudentOnboardingListSerializer, StudentOnboardingSerializer
+
+
+def enforce_timezone(value, tz=None):
+    """Bring a datetime into the current (or ``tz``) timezone like DRF's DateTimeField"""
+    if not settings.USE_TZ:
+        return timezone.make_naive(value, datetime.timezone.utc) if timezone.is_aware(value) else value
+    tz = tz or timezone.get_current_timezone()
+    return value.astimezone(tz) if timezone.is_aware(value) else timezone.make_aware(value, tz)
+
+
+def format_datetime(value, tz=None):
+    """ISO 8601 text as DRF's DateTimeField renders it ('Z' for UTC)"""
+    text = enforce_timezone(value, tz).isoformat()
+    return text[:-6] + 'Z' if text.endswith('+00:00') else text
+
+
+def _datetime_converter():
+    output_format = api_settings.DATETIME_FORMAT
+    if output_format is None:
+        return None
+    iso = output_format.lower() == ISO_8601
+
+    def convert(value, tz):
+        if isinstance(value, str):
+            return value
+        if iso:
+            return format_datetime(value, tz)
+        return enforce_timezone(value, tz).strftime(output_format)
+    return convert
+
+
+def _date_converter():
+    output_format = api_settings.DATE_FORMAT
+    if output_format is None:
+        return None
+    if output_format.lower() == ISO_8601:
+        return lambda value, tz: value if isinstance(value, str) else value.isoformat()
+    return lambda value, tz: value if isinstance(value, str) else value.strftime(output_format)
+
+
+def _decimal_converter(field):
+    # Mirrors rest_framework.fields.DecimalField.quantize and to_representation
+    exponent = decimal.Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    context.prec = field.max_digits
+    coerce_to_string = api_settings.COERCE_DECIMAL_TO_STRING
+
+    def convert(value, tz):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        quantized = value.quantize(exponent, context=context)
+        return '{:f}'.format(quantized) if coerce_to_string else quantized
+    return convert
+
+
+def field_converter(field):
+    """
+    Converter ``(value, tz)`` matching DRF's rendering of a model field, or
+    None when the database value is already what DRF would output. Datetimes
+    are rendered in ``tz``, which callers resolve once per batch of rows.
+    """
+    if isinstance(field, models.DateTimeField):
+        return _datetime_converter()
+    if isinstance(field, models.DateField):
+        return _date_converter()
+    if isinstance(field, models.DecimalField):
+        return _decimal_converter(field)
+    return None
+
+
+class CompiledSerializer:
+    """
+    Read-only stand-in for a StudentOnboarding ModelSerializer.
+
+    Produces the same dicts (same keys, order and values, hence byte-identical
+    JSON) from ``.values()`` rows or saved instances.
+    """
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self.converters = []
+        for name in self.fields:
+            converter = field_converter(StudentOnboarding._meta.get_field(name))
+            if converter is not None:
+                self.converters.append((name, converter))
+
+    @classmethod
+    def from_serializer(cls, serializer_class):
+        """Compile the output fields of a ModelSerializer declared with ``Meta.fields``"""
+        fields = serializer_class.Meta.fields
+        if fields == ALL_FIELDS:
+            fields = [field.name for field in StudentOnboarding._meta.concrete_fields]
+        return cls(fields)
+
+    def values(self, queryset, extra=()):
+        """
+        ``queryset`` as dict rows holding the compiled fields, plus any
+        ``extra`` columns the caller needs but does not render (cursor
+        position, ETag inputs). Nothing else is selected.
+        """
+        return queryset.values(*self.fields, *(name for name in extra if name not in self.fields))
+
+    def to_representation(self, row, tz=None):
+        tz = tz or timezone.get_current_timezone()
+        data = {name: row[name] for name in self.fields}
+        for name, converter in self.converters:
+            value = data[name]
+            if value is not None:
+                data[name] = converter(value, tz)
+        return data
+
+    def many(self, rows):
+        # Looking up the current timezone is not free; do it once per page
+        tz = timezone.get_current_timezone()
+        to_representation = self.to_representation
+        return [to_representation(row, tz) for row in rows]
+
+    def from_instance(self, instance):
+        """Representation of a model instance, e.g. right after a save"""
+        return self.to_representation({name: getattr(instance, name) for name in self.fields})
+
+
+# Compiled once per process; equivalent to the serializers they are built from
+STUDENT_DETAIL = CompiledSerializer.from_serializer(StudentOnboardingSerializer)
+STUDENT_LIST_ITEM = CompiledSerializer.from_serializer(StudentOnboardingListSerializer)
+
+
+@lru_cache(maxsize=256)
+def compile_fields(fields):
+    """CompiledSerializer for a tuple of field names, built once per distinct fieldset"""
+    return CompiledSerializer(fields)
+
+
+def parse_field_list(param, requested, allowed):
+    """Names from a comma separated query parameter, in request order, checked against ``allowed``"""
+    names = list(dict.fromkeys(name.strip() for name in requested.split(',') if name.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValidationError({param: [f'Unknown fields: {", ".join(unknown)}.']})
+    return names
+
+
+def resolve_fieldset(params, default, allowed):
+    """
+    Output fields for ``?fields=`` and ``?exclude=``: ``fields`` picks from
+    ``allowed`` (in request order) instead of ``default``, then ``exclude``
+    drops names from the result.
+    """
+    requested = params.get('fields')
+    fields = parse_field_list('fields', requested, allowed) if requested else list(default)
+    excluded = params.get('exclude')
+    if excluded:
+        dropped = set(parse_field_list('exclude', excluded, allowed))
+        fields = [name for name in fields if name not in dropped]
+    if not fields:
+        raise ValidationError({'fields': ['At least one field must be selected.']})
+    return tuple(fields)
+
+
+def sparse_serializer(compiled, params):
+    """
+    ``compiled`` narrowed by ``?fields=``/``?exclude=``; any detail field can
+    be requested. Its ``values()`` selects only those columns, so the
+    projection reaches SQLite.
+    """
+    if not params.get('fields') and not params.get('exclude'):
+        return compiled
+    fields = resolve_fieldset(params, compiled.fields, STUDENT_DETAIL.fields)
+    return compiled if fields == compiled.fields else compile_fields(fields)
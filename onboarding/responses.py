@@ -0,0 +1,36 @@
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+
+class EncodedJSONResponse(Response):
+    """
+    A DRF response whose JSON body was encoded ahead of time.
+
+    ``data`` is kept for tests and middleware; rendering just returns the
+    pre-encoded bytes instead of running the renderer again.
+    """
+
+    def __init__(self, data, content, **kwargs):
+        super().__init__(data, **kwargs)
+        self.encoded_content = content
+
+    @property
+    def rendered_content(self):
+        self['Content-Type'] = 'application/json'
+        return self.encoded_content
+
+
+def json_response(data, status=200):
+    """
+    Render ``data`` exactly as DRF's JSONRenderer does for ``application/json``
+    into a plain Django response. Used by the async views, which bypass
+    APIView and its content negotiation.
+    """
+    return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status)
+
+
+def api_exception_response(exc):
+    """JSON error response for a DRF APIException, shaped like DRF's exception handler"""
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    return json_response(data, status=exc.status_code)
@@ -0,0 +1,92 @@
+import re
+import time
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import Q
+
+FTS_TABLE = 'student_onboarding_fts'
+SEARCH_FIELDS = ('first_name', 'last_name', 'email', 'mobile_number')
+
+# Seconds a process trusts its answer to "does the FTS table exist?": a
+# migration run by another process is picked up within this interval
+FTS_CHECK_INTERVAL = 60
+
+# (alias, database file) -> (FTS table exists, time.monotonic() of the check)
+_fts_tables = {}
+
+
+def _fts_key(using):
+    return (using, str(connections[using].settings_dict['NAME']))
+
+
+def _cached_fts(using):
+    """The cached answer for this database, or None when missing or older than FTS_CHECK_INTERVAL"""
+    cached = _fts_tables.get(_fts_key(using))
+    if cached is None or time.monotonic() - cached[1] > FTS_CHECK_INTERVAL:
+        return None
+    return cached[0]
+
+
+def fts_enabled(using='default'):
+    """Whether the FTS index exists on this database; cached per database file for FTS_CHECK_INTERVAL"""
+    enabled = _cached_fts(using)
+    if enabled is None:
+        connection = connections[using]
+        enabled = connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names()
+        _fts_tables[_fts_key(using)] = (enabled, time.monotonic())
+    return enabled
+
+
+def forget_fts_tables():
+    """Drop the cached answers, e.g. after this process ran migrations"""
+    _fts_tables.clear()
+
+
+def build_match_query(term):
+    """
+    Turn free text into an FTS5 query: every word must match as a prefix.
+
+    Words are split the way the unicode61 tokenizer splits indexed values, so
+    ``jane.doe@exa`` becomes ``"jane"* "doe"* "exa"*``. Returns None when the
+    term has no searchable characters.
+    """
+    tokens = re.findall(r'\w+', term)
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def icontains_filter(term):
+    """The admin-style ``LIKE '%term%'`` filter across the search fields"""
+    query = Q()
+    for field in SEARCH_FIELDS:
+        query |= Q(**{f'{field}__icontains': term})
+    return query
+
+
+def search_students(queryset, term):
+    """
+    Restrict a StudentOnboarding queryset to rows matching ``term``, best match first.
+
+    Uses the FTS5 index when present and falls back to ``icontains`` scans
+    otherwise (non-SQLite databases or FTS5 missing from the SQLite build).
+    """
+    if not fts_enabled(queryset.db):
+        return queryset.filter(icontains_filter(term))
+    match = build_match_query(term)
+    if match is None:
+        return queryset.none()
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = student_onboarding.id', f'{FTS_TABLE} MATCH %s'],
+        params=[match],
+        select={'search_rank': f'{FTS_TABLE}.rank'},
+    ).order_by('search_rank', '-created_at', '-id')
+
+
+async def asearch_students(queryset, term):
+    """``search_students`` for async views; only the first FTS table lookup runs in a thread"""
+    if _cached_fts(queryset.db) is None:
+        await sync_to_async(fts_enabled)(queryset.db)
+    return search_students(queryset, term)
@@ -1,12 +1,39 @@
+import copy
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from .abroad import countries_abroad_changed, normalize_countries_abroad
+from .bulk import (
+    DUPLICATE_EMAIL_ERROR, bulk_create_students, bulk_update_students, find_email_conflicts, update_matching,
+)
+from .choices import MODEL_CHOICE_CATEGORIES
+from .cms import get_choices
 from .models import StudentOnboarding
 from .validators import validate_phone_number, validate_email_format
 
 class StudentOnboardingSerializer(serializers.ModelSerializer):
+    """
+    Validates a write once: field validators here, then the model's clean()
+    in validate(). Saves skip full_clean(), and email uniqueness is enforced
+    by the INSERT/UPDATE itself instead of a SELECT beforehand.
+    """
     class Meta:
         model = StudentOnboarding
         fields = '__all__'
         read_only_fields = ('id', 'created_at', 'updated_at')
+        extra_kwargs = {'email': {'validators': []}}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # Accept only the choices currently active in the CMS dropdown store
+        for name, category in MODEL_CHOICE_CATEGORIES.items():
+            field = fields.get(name)
+            if field is not None and not field.read_only:
+                field.choices = [
+                    (value, label) for value, label in get_choices(category) if value in field.choices
+                ]
+        return fields
     
     def validate_email(self, value):
         return validate_email_format(value)
@@ -16,6 +43,12 @@ class StudentOnboardingSerializer(serializers.ModelSerializer):
     
     def validate_guardian_phone(self, value):
         return validate_phone_number(value)
+
+    def validate_countries_abroad(self, value):
+        # Resending the stored value is not a change, as in StudentOnboarding.clean()
+        if self.instance is not None and not countries_abroad_changed(self.instance, value):
+            return value
+        return normalize_countries_abroad(value)
     
     def validate(self, data):
         # Custom validation logic
@@ -31,10 +64,217 @@ class StudentOnboardingSerializer(serializers.ModelSerializer):
         # Validate family income
         if data.get('family_income') and data['family_income'] < 0:
             raise serializers.ValidationError("Family income cannot be negative")
-        
+
+        # The model-level rules full_clean() would run on save
+        candidate = copy.copy(self.instance) if self.instance is not None else StudentOnboarding()
+        for attr, value in data.items():
+            setattr(candidate, attr, value)
+        candidate.clean()
         return data
 
+    def create(self, validated_data):
+        return self.save_validated(StudentOnboarding(**validated_data))
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        return self.save_validated(instance)
+
+    def save_validated(self, instance):
+        """Save without a second full_clean(); a duplicate email surfaces as IntegrityError"""
+        # Archived students are outside the live unique index (onboarding.archive); the batch
+        # serializers check them once per batch instead
+        if instance.email_archived():
+            raise serializers.ValidationError({'email': [DUPLICATE_EMAIL_ERROR]})
+        # The row and its analytics summary counts commit together; inside an
+        # outer transaction this is a savepoint, so a failed INSERT does not abort it
+        try:
+            with transaction.atomic():
+                instance.save(full_clean=False)
+        except IntegrityError as exc:
+            # Ask the database rather than parse the driver's message: only a taken email is a 400
+            if not StudentOnboarding.objects.filter(email=instance.email).exclude(pk=instance.pk).exists():
+                raise
+            raise serializers.ValidationError({'email': [DUPLICATE_EMAIL_ERROR]}) from exc
+        return instance
+
 class StudentOnboardingListSerializer(serializers.ModelSerializer):
     class Meta:
         model = StudentOnboarding
-        fields = ['id', 'first_name', 'last_name', 'email', 'created_at'] 
\ No newline at end of file
+        fields = ['id', 'first_name', 'last_name', 'email', 'created_at'] 
+
+def check_batch_list(serializer, data):
+    """The list-level checks of a batch: a list, at most ``max_length`` items"""
+    if not isinstance(data, list):
+        message = serializer.error_messages['not_a_list'].format(input_type=type(data).__name__)
+        raise serializers.ValidationError({'non_field_errors': [message]}, code='not_a_list')
+
+    if serializer.max_length is not None and len(data) > serializer.max_length:
+        message = serializer.error_messages['max_length'].format(max_length=serializer.max_length)
+        raise serializers.ValidationError({'non_field_errors': [message]}, code='max_length')
+
+class StudentOnboardingBatchListSerializer(serializers.ListSerializer):
+    """Validate a batch row by row, keeping per-row errors instead of failing the whole batch"""
+
+    def to_internal_value(self, data):
+        check_batch_list(self, data)
+
+        self.row_errors = {}
+        self.valid_indexes = []
+        valid_rows = []
+        for index, item in enumerate(data):
+            try:
+                valid_rows.append(self.child.run_validation(item))
+                self.valid_indexes.append(index)
+            except serializers.ValidationError as exc:
+                self.row_errors[index] = exc.detail
+
+        # One IN query for the whole batch instead of a unique check per row
+        conflicts = find_email_conflicts([row['email'] for row in valid_rows])
+        ret = []
+        indexes = []
+        for index, row, conflict in zip(self.valid_indexes, valid_rows, conflicts):
+            if conflict:
+                self.row_errors[index] = conflict
+            else:
+                ret.append(row)
+                indexes.append(index)
+        self.valid_indexes = indexes
+        return ret
+
+    def create(self, validated_data):
+        return bulk_create_students(validated_data)
+
+
+class StudentOnboardingBatchSerializer(StudentOnboardingSerializer):
+    """Row serializer for batch creation; email uniqueness is checked once per batch"""
+
+    class Meta(StudentOnboardingSerializer.Meta):
+        list_serializer_class = StudentOnboardingBatchListSerializer
+
+
+class StudentOnboardingBulkUpdateListSerializer(serializers.ListSerializer):
+    """
+    Validate a bulk PATCH of ``{"id": ..., "changes": {...}}`` items. The
+    targets are loaded with one in_bulk and each change set goes through the
+    partial child serializer against its row; errors are kept per row.
+    """
+
+    def to_internal_value(self, data):
+        check_batch_list(self, data)
+
+        self.row_errors = {}
+        targets = {}
+        seen = set()
+        for index, item in enumerate(data):
+            if not isinstance(item, dict) or not isinstance(item.get('changes'), dict) or not item['changes']:
+                self.row_errors[index] = {'non_field_errors': ['Expected an object with an id and non-empty changes.']}
+                continue
+            pk = item.get('id')
+            # JSON integers only: int() would turn true and 1.9 into 1 and update that student
+            if isinstance(pk, bool) or not isinstance(pk, int):
+                self.row_errors[index] = {'id': ['A valid integer is required.']}
+                continue
+            if pk in seen:
+                self.row_errors[index] = {'id': ['Duplicate id within this batch.']}
+                continue
+            seen.add(pk)
+            targets[index] = pk
+
+        instances = StudentOnboarding.objects.in_bulk(seen)
+        updates = []
+        for index, pk in targets.items():
+            instance = instances.get(pk)
+            if instance is None:
+                self.row_errors[index] = {'id': ['Not found.']}
+                continue
+            # validate() runs the model rules against this row with the changes applied
+            self.child.instance = instance
+            try:
+                updates.append((index, instance, self.child.run_validation(data[index]['changes'])))
+            except serializers.ValidationError as exc:
+                self.row_errors[index] = exc.detail
+        self.child.instance = None
+
+        # One IN query for every changed email
+        moved = [(index, changes['email']) for index, instance, changes in updates
+                 if 'email' in changes and changes['email'] != instance.email]
+        for (index, email), conflict in zip(moved, find_email_conflicts([email for index, email in moved])):
+            if conflict:
+                self.row_errors[index] = conflict
+        updates = [update for update in updates if update[0] not in self.row_errors]
+        self.valid_indexes = [index for index, instance, changes in updates]
+        return [(instance, changes) for index, instance, changes in updates]
+
+    def save(self, **kwargs):
+        return bulk_update_students(self.validated_data)
+
+
+class StudentOnboardingBulkUpdateSerializer(StudentOnboardingSerializer):
+    """Partial change set for one row of a bulk PATCH"""
+
+    class Meta(StudentOnboardingSerializer.Meta):
+        list_serializer_class = StudentOnboardingBulkUpdateListSerializer
+
+
+class StudentOnboardingFilterUpdateSerializer(serializers.Serializer):
+    """
+    The "filter + set" bulk PATCH: every row matching ``filter`` (exact
+    values, or lists for IN) gets ``set`` in one UPDATE. Fields whose rules
+    depend on the individual row can only be changed per id.
+    """
+    PER_ROW_FIELDS = ('email', 'date_of_birth')
+
+    filter = serializers.DictField(allow_empty=False)
+    set = serializers.DictField(allow_empty=False)
+
+    def validate_filter(self, value):
+        lookups = {}
+        errors = {}
+        for name, wanted in value.items():
+            try:
+                field = StudentOnboarding._meta.get_field(name)
+            except FieldDoesNotExist:
+                errors[name] = ['Unknown field.']
+                continue
+            if not field.concrete:
+                errors[name] = ['Unknown field.']
+                continue
+            if isinstance(wanted, dict):
+                errors[name] = ['Must be a value or a list of values.']
+                continue
+            if isinstance(wanted, list):
+                if not wanted:
+                    errors[name] = ['Must not be an empty list.']
+                    continue
+                if any(item is None or isinstance(item, (dict, list)) for item in wanted):
+                    errors[name] = ['List items must be values, not null, objects or lists.']
+                    continue
+            try:
+                if isinstance(wanted, list):
+                    lookups[f'{field.attname}__in'] = [field.to_python(item) for item in wanted]
+                else:
+                    lookups[field.attname] = field.to_python(wanted)
+            except DjangoValidationError as exc:
+                errors[name] = exc.messages
+            except (TypeError, ValueError):
+                errors[name] = ['Invalid value.']
+        if errors:
+            raise serializers.ValidationError(errors)
+        return lookups
+
+    def validate_set(self, value):
+        row = StudentOnboardingSerializer(partial=True)
+        fields = row.fields
+        errors = {
+            name: ['Can only be changed per id.'] if name in self.PER_ROW_FIELDS else ['Unknown or read-only field.']
+            for name in value
+            if name in self.PER_ROW_FIELDS or name not in fields or fields[name].read_only
+        }
+        if errors:
+            raise serializers.ValidationError(errors)
+        # Field validation and the validate_<field> hooks of the row serializer
+        return row.to_internal_value(value)
+
+    def save(self, **kwargs):
+        return update_matching(self.validated_data['filter'], self.validated_data['set'])
@@ -0,0 +1,67 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from . import abroad, analytics, cms, search
+from .archive import register_archive_function
+from .bloom import email_index
+from .database import apply_sqlite_pragmas
+from .models import DropdownOption, StudentOnboarding
+
+
+@receiver(post_save, sender=StudentOnboarding)
+def record_student_email(sender, instance, **kwargs):
+    """Add created and updated emails to this process's availability filter"""
+    email_index.add([instance.email])
+
+
+@receiver(pre_save, sender=StudentOnboarding)
+def remember_summary_values(sender, instance, using, raw=False, **kwargs):
+    """Fetch the stored values an update will move summary counts away from, when not loaded"""
+    if not raw:
+        analytics.remember_previous(instance, using)
+
+
+@receiver(post_save, sender=StudentOnboarding)
+def update_daily_summary(sender, instance, created, using, raw=False, **kwargs):
+    """Count a new student in the analytics summary, or move the counts an update changed"""
+    if not raw:
+        analytics.record_save(instance, created, using)
+
+
+@receiver(pre_save, sender=StudentOnboarding)
+def note_countries_abroad_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        abroad.remember_change(instance)
+
+
+@receiver(post_save, sender=StudentOnboarding)
+def sync_family_abroad(sender, instance, created, raw=False, **kwargs):
+    """Mirror countries_abroad into the indexed StudentFamilyAbroad rows"""
+    if not raw:
+        abroad.record_save(instance, created)
+
+
+@receiver(post_delete, sender=StudentOnboarding)
+def remove_from_daily_summary(sender, instance, using, **kwargs):
+    analytics.record_delete(instance, using)
+
+
+@receiver(post_save, sender=DropdownOption)
+@receiver(post_delete, sender=DropdownOption)
+def invalidate_dropdown_options(sender, **kwargs):
+    """Rebuild the cached, pre-encoded dropdown payloads after a CMS edit"""
+    cms.invalidate()
+
+
+@receiver(post_migrate)
+def forget_search_index(sender, **kwargs):
+    """Migrations may have created or dropped the FTS table"""
+    search.forget_fts_tables()
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):
+    """Apply the configured SQLite pragmas (WAL, synchronous, mmap...) to each new connection"""
+    apply_sqlite_pragmas(connection)
+    register_archive_function(connection)
@@ -0,0 +1,113 @@
+"""
+Outbox for queued creates (ONBOARDING_QUEUED_CREATES).
+
+The create endpoint only runs check_submission_schema(), stores the payload
+as an OnboardingSubmission and answers 202 Accepted. The process_submissions
+command drains the queue in batches: each batch gets the full batch
+serializer validation (one email IN query, chunked bulk_create), and each
+submission records its outcome, the created student or the errors.
+"""
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Subquery
+from django.utils import timezone
+
+from .database import run_write
+from .models import OnboardingSubmission, StudentOnboarding
+
+
+def get_submission_batch_size():
+    return getattr(settings, 'ONBOARDING_SUBMISSION_BATCH_SIZE', 500)
+
+
+@lru_cache(maxsize=None)
+def required_fields():
+    """Names the create serializer requires, computed once per process"""
+    from .serializers import StudentOnboardingSerializer
+
+    return tuple(
+        name for name, field in StudentOnboardingSerializer().fields.items()
+        if field.required and not field.read_only
+    )
+
+
+def check_submission_schema(data):
+    """
+    The checks made before a submission is queued: a JSON object carrying
+    every required field. Returns DRF-style errors, or None.
+    """
+    if not isinstance(data, dict):
+        return {'non_field_errors': [f'Invalid data. Expected a dictionary, but got {type(data).__name__}.']}
+    missing = {name: ['This field is required.'] for name in required_fields() if data.get(name) in (None, '')}
+    return missing or None
+
+
+def enqueue_submission(data):
+    return run_write(lambda: OnboardingSubmission.objects.create(payload=data))
+
+
+def claim_batch(size):
+    """Mark up to ``size`` of the oldest queued submissions as processing and return them"""
+    claimed_at = timezone.now()
+    queued = OnboardingSubmission.objects.filter(status=OnboardingSubmission.QUEUED)
+    # One UPDATE claims the batch, so two workers never take the same submission
+    claimed = run_write(lambda: OnboardingSubmission.objects.filter(
+        id__in=Subquery(queued.order_by('created_at').values('id')[:size]),
+        status=OnboardingSubmission.QUEUED,
+    ).update(status=OnboardingSubmission.PROCESSING, claimed_at=claimed_at))
+    if not claimed:
+        return []
+    return list(OnboardingSubmission.objects.filter(
+        status=OnboardingSubmission.PROCESSING, claimed_at=claimed_at
+    ).order_by('created_at'))
+
+
+def process_batch(submissions):
+    """Validate and insert a claimed batch, recording each outcome. Returns ``(created, failed)``."""
+    from .serializers import StudentOnboardingBatchSerializer
+
+    serializer = StudentOnboardingBatchSerializer(data=[submission.payload for submission in submissions], many=True)
+    serializer.is_valid()
+    outcomes = dict(serializer.row_errors)
+
+    def write():
+        # Students and outcomes commit together; a crash leaves the batch to be requeued
+        with transaction.atomic():
+            outcomes.update(zip(serializer.valid_indexes, serializer.save()))
+            processed_at = timezone.now()
+            for index, submission in enumerate(submissions):
+                outcome = outcomes[index]
+                if isinstance(outcome, StudentOnboarding):
+                    submission.status, submission.student, submission.errors = OnboardingSubmission.CREATED, outcome, None
+                else:
+                    submission.status, submission.student, submission.errors = OnboardingSubmission.FAILED, None, outcome
+                submission.processed_at = processed_at
+            OnboardingSubmission.objects.bulk_update(submissions, ['status', 'student', 'errors', 'processed_at'])
+
+    run_write(write)
+    created = sum(1 for submission in submissions if submission.status == OnboardingSubmission.CREATED)
+    return created, len(submissions) - created
+
+
+def requeue_stale(older_than):
+    """Put submissions claimed longer than ``older_than`` seconds ago back in the queue"""
+    cutoff = timezone.now() - timedelta(seconds=older_than)
+    return run_write(lambda: OnboardingSubmission.objects.filter(
+        status=OnboardingSubmission.PROCESSING, claimed_at__lt=cutoff
+    ).update(status=OnboardingSubmission.QUEUED, claimed_at=None))
+
+
+def process_pending(batch_size=None):
+    """Drain the queue. Returns ``(created, failed)`` totals."""
+    batch_size = batch_size or get_submission_batch_size()
+    created = failed = 0
+    while True:
+        submissions = claim_batch(batch_size)
+        if not submissions:
+            return created, failed
+        batch_created, batch_failed = process_batch(submissions)
+        created += batch_created
+        failed += batch_failed
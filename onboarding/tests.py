@@ -1,9 +1,44 @@
-from django.test import TestCase
-from django.urls import reverse
+from django.apps import apps as django_apps
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import IntegrityError, OperationalError, connection, connections
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path, reverse
+from django.utils import timezone
 from rest_framework.test import APITestCase
 from rest_framework import status
-from .models import StudentOnboarding
-from datetime import date
+from rest_framework.renderers import JSONRenderer
+from . import cms, profiling, search
+from .analytics import rebuild_summary
+from .bloom import BloomFilter, email_index
+from .bulk import DUPLICATE_EMAIL_ERROR, update_matching
+from .database import apply_sqlite_pragmas, run_write
+from .metrics import Histogram, registry as metrics_registry
+from .models import (
+    DropdownOption, OnboardingDailySummary, OnboardingSubmission, StudentArchiveBlock, StudentArchiveEntry,
+    StudentFamilyAbroad, StudentOnboarding,
+)
+from .replicas import (
+    READ_AFTER_COOKIE, ReplicaRouter, RoutingState, _routing as replica_routing, stamp_path, sync_replica,
+)
+from .representations import STUDENT_DETAIL, STUDENT_LIST_ITEM
+from .serializers import StudentOnboardingListSerializer, StudentOnboardingSerializer
+from .submissions import claim_batch, process_pending
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+import importlib
+import os
+import re
+import tempfile
+import time
+import uuid
+from types import SimpleNamespace
+import csv
+import io
+import json
+
 
 class StudentOnboardingModelTest(TestCase):
     def setUp(self):
@@ -46,6 +81,15 @@ class StudentOnboardingModelTest(TestCase):
         expected = "John Doe - john.doe@example.com"
         self.assertEqual(str(student), expected)
 
+    def test_orm_save_still_runs_full_clean(self):
+        """Test that saves outside the API keep validation and the unique email check"""
+        StudentOnboarding.objects.create(**self.student_data)
+        with self.assertRaises(ValidationError) as duplicate:
+            StudentOnboarding.objects.create(**self.student_data)
+        self.assertIn('email', duplicate.exception.message_dict)
+        with self.assertRaises(ValidationError):
+            StudentOnboarding(**dict(self.student_data, email='x@example.com', mobile_number='12')).save()
+
 class StudentOnboardingAPITest(APITestCase):
     def setUp(self):
         self.create_url = reverse('student-onboarding-create')
@@ -101,6 +145,45 @@ class StudentOnboardingAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('mobile_number', response.data)
 
+    def test_create_validates_once(self):
+        """Test that a create runs no uniqueness SELECT: the INSERT is the only statement on the table"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.create_url, self.valid_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        statements = [q['sql'] for q in queries if 'student_onboarding' in q['sql']]
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith('INSERT'))
+
+    def test_duplicate_email_rejected_by_insert(self):
+        """Test that the unique constraint maps to the usual 400 and keeps the transaction usable"""
+        self.client.post(self.create_url, self.valid_data, format='json')
+        response = self.client.post(self.create_url, self.valid_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['email'], ['student onboarding with this email already exists.'])
+
+        other = StudentOnboarding.objects.get().id
+        update_url = reverse('student-onboarding-update', kwargs={'student_id': other})
+        response = self.client.patch(update_url, {'mobile_number': '+1234567899'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(StudentOnboarding.objects.count(), 1)
+
+        # Taking another student's email on update is the same 400
+        second = build_student(2)
+        second.save()
+        update_url = reverse('student-onboarding-update', kwargs={'student_id': second.id})
+        response = self.client.patch(update_url, {'email': self.valid_data['email']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['email'], [DUPLICATE_EMAIL_ERROR])
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        """Test that a constraint failure unrelated to the email is not turned into the duplicate 400"""
+        serializer = StudentOnboardingSerializer(data=self.valid_data)
+        self.assertTrue(serializer.is_valid())
+        student = StudentOnboarding(**serializer.validated_data)
+        student.first_name = None
+        with self.assertRaises(IntegrityError):
+            serializer.save_validated(student)
+
     def test_get_dropdown_options(self):
         """Test getting dropdown options"""
         response = self.client.get(self.dropdown_url)
@@ -140,4 +223,1954 @@ class StudentOnboardingAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('message', response.data)
         self.assertEqual(response.data['data']['mobile_number'], '+1234567899')
-        self.assertEqual(response.data['data']['family_income'], '80000.00') 
\ No newline at end of file
+        self.assertEqual(response.data['data']['family_income'], '80000.00') 
+
+class StudentOnboardingBatchAPITest(APITestCase):
+    def setUp(self):
+        self.batch_url = reverse('student-onboarding-batch-create')
+        self.row = {
+            'first_name': 'John',
+            'last_name': 'Doe',
+            'date_of_birth': '2005-06-15',
+            'gender': 'M',
+            'email': 'john.doe@example.com',
+            'mobile_number': '+1234567890',
+            'address_line_1': '123 Main St',
+            'city': 'New York',
+            'state': 'NY',
+            'country': 'United States',
+            'zipcode': '10001',
+            'citizenship': 'US',
+            'guardian_name': 'Jane Doe',
+            'guardian_relationship': 'Mother',
+            'guardian_phone': '+1234567891',
+            'guardian_email': 'jane.doe@example.com',
+            'family_income': '75000.00',
+            'number_of_siblings': 2,
+            'has_family_abroad': False,
+        }
+
+    def make_rows(self, count):
+        return [dict(self.row, email=f'student{i}@example.com') for i in range(count)]
+
+    def test_batch_create_success(self):
+        """Test creating a batch of valid records"""
+        response = self.client.post(self.batch_url, self.make_rows(5), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 5)
+        self.assertEqual(StudentOnboarding.objects.count(), 5)
+        self.assertTrue(all(result['status'] == 'created' for result in response.data['results']))
+
+    def test_batch_create_reports_errors_per_row(self):
+        """Test that invalid and duplicate rows are reported without blocking valid rows"""
+        StudentOnboarding.objects.create(**dict(self.row, email='taken@example.com', date_of_birth=date(2005, 6, 15)))
+        rows = self.make_rows(3)
+        rows[0]['mobile_number'] = 'invalid-phone'
+        rows[1]['email'] = 'taken@example.com'
+        rows.append(dict(rows[2]))
+        response = self.client.post(self.batch_url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        results = response.data['results']
+        self.assertIn('mobile_number', results[0]['errors'])
+        self.assertIn('email', results[1]['errors'])
+        self.assertEqual(results[2]['status'], 'created')
+        self.assertIn('email', results[3]['errors'])
+        self.assertEqual(StudentOnboarding.objects.count(), 2)
+
+    def test_batch_create_uses_constant_queries(self):
+        """Test that the query count does not grow with the batch size"""
+        counts = []
+        for offset, size in ((0, 2), (100, 30)):
+            rows = [dict(self.row, email=f'student{offset + i}@example.com') for i in range(size)]
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(self.batch_url, rows, format='json')
+            self.assertEqual(response.data['created'], size)
+            counts.append(len(context))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_batch_create_rejects_non_list(self):
+        """Test that the batch endpoint expects a list"""
+        response = self.client.post(self.batch_url, self.row, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class StudentOnboardingBulkUpdateTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        email_index.reset()
+        self.addCleanup(email_index.reset)
+        self.url = reverse('student-onboarding-bulk-update')
+        for index in range(4):
+            build_student(index, state='Calif.' if index < 3 else 'NY').save()
+        self.ids = list(StudentOnboarding.objects.order_by('id').values_list('id', flat=True))
+
+    def test_per_id_changes_report_each_row(self):
+        """Test a mixed batch: valid rows are applied, the rest reported per id"""
+        response = self.client.patch(self.url, [
+            {'id': self.ids[0], 'changes': {'state': 'CA'}},
+            {'id': self.ids[1], 'changes': {'guardian_phone': '+12345678999', 'citizenship': 'CA'}},
+            {'id': self.ids[2], 'changes': {'gender': 'Z'}},
+            {'id': 999999, 'changes': {'state': 'CA'}},
+            {'id': self.ids[3], 'changes': {}},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['updated', 'updated', 'error', 'error', 'error'],
+        )
+        self.assertIn('gender', response.data['results'][2]['errors'])
+        self.assertEqual(response.data['results'][3]['id'], 999999)
+        first, second = StudentOnboarding.objects.in_bulk(self.ids[:2]).values()
+        self.assertEqual(first.state, 'CA')
+        self.assertEqual((second.guardian_phone, second.citizenship), ('+12345678999', 'CA'))
+        self.assertGreater(second.updated_at, second.created_at)
+
+    def test_ids_must_be_integers(self):
+        """Test that booleans, floats and strings are rejected as ids instead of coerced to one"""
+        response = self.client.patch(self.url, [
+            {'id': value, 'changes': {'state': 'CA'}} for value in (True, 1.9, '1', '0x1', None)
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [result['errors'] for result in response.data['results']], [{'id': ['A valid integer is required.']}] * 5
+        )
+        self.assertFalse(StudentOnboarding.objects.filter(state='CA').exists())
+
+    def test_one_load_and_one_update_per_chunk(self):
+        """Test that targets load with one query and each chunk is one UPDATE"""
+        items = [{'id': pk, 'changes': {'city': 'Los Angeles'}} for pk in self.ids]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        statements = [query['sql'] for query in queries if 'student_onboarding"' in query['sql'].split(' WHERE ')[0]]
+        self.assertEqual(sum(sql.startswith('SELECT') for sql in statements), 1)
+        self.assertEqual(sum(sql.startswith('UPDATE') for sql in statements), 1)
+        self.assertEqual(set(StudentOnboarding.objects.values_list('city', flat=True)), {'Los Angeles'})
+
+    def test_side_effects_follow_the_update(self):
+        """Test email conflicts, and the detail cache, email filter and summary after a bulk update"""
+        detail_url = reverse('student-onboarding-detail', kwargs={'student_id': self.ids[0]})
+        self.client.get(detail_url)
+        self.client.get(reverse('email-available'), {'email': 'warm.up@example.com'})
+        response = self.client.patch(self.url, [
+            {'id': self.ids[0], 'changes': {'email': 'renamed@example.com', 'gender': 'F'}},
+            {'id': self.ids[1], 'changes': {'email': 'student2@example.com'}},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['results'][1]['errors'], {'email': [DUPLICATE_EMAIL_ERROR]})
+        self.assertEqual(self.client.get(detail_url).data['email'], 'renamed@example.com')
+        self.assertFalse(
+            self.client.get(reverse('email-available'), {'email': 'renamed@example.com'}).data['available']
+        )
+        genders = dict(OnboardingDailySummary.objects.filter(dimension='gender').values_list('value', 'students'))
+        self.assertEqual(genders, {'M': 3, 'F': 1})
+
+    def test_filter_and_set_is_one_update(self):
+        """Test the filter + set form: one UPDATE statement, caches and summary kept in line"""
+        detail_url = reverse('student-onboarding-detail', kwargs={'student_id': self.ids[0]})
+        self.client.get(detail_url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                self.url, {'filter': {'state': 'Calif.'}, 'set': {'state': 'CA', 'gender': 'F'}}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(sum(query['sql'].startswith('UPDATE "student_onboarding"') for query in queries), 1)
+        self.assertEqual(StudentOnboarding.objects.filter(state='CA', gender='F').count(), 3)
+        self.assertEqual(self.client.get(detail_url).data['state'], 'CA')
+        genders = dict(OnboardingDailySummary.objects.filter(dimension='gender').values_list('value', 'students'))
+        self.assertEqual(genders, {'M': 1, 'F': 3})
+
+        response = self.client.patch(
+            self.url, {'filter': {'id': [self.ids[3]], 'has_family_abroad': False}, 'set': {'city': 'Albany'}},
+            format='json',
+        )
+        self.assertEqual(response.data['updated'], 1)
+
+    def test_filter_and_set_validation(self):
+        """Test the 400 responses for unknown, per-row and invalid fields and an empty filter"""
+        for body, error in (
+            ({'filter': {'state': 'NY'}, 'set': {'email': 'same@example.com'}}, 'set'),
+            ({'filter': {'nickname': 'x'}, 'set': {'state': 'CA'}}, 'filter'),
+            ({'filter': {}, 'set': {'state': 'CA'}}, 'filter'),
+            ({'filter': {'state': 'NY'}, 'set': {'gender': 'Z'}}, 'set'),
+            ({'filter': {'number_of_siblings': 'many'}, 'set': {'state': 'CA'}}, 'filter'),
+            ({'filter': {'state': []}, 'set': {'state': 'CA'}}, 'filter'),
+            ({'filter': {'state': [None]}, 'set': {'state': 'CA'}}, 'filter'),
+            ({'filter': {'state': [['NY']]}, 'set': {'state': 'CA'}}, 'filter'),
+            ({'filter': {'created_at': {}}, 'set': {'state': 'CA'}}, 'filter'),
+            ({'filter': {'number_of_siblings': {'gt': 1}}, 'set': {'state': 'CA'}}, 'filter'),
+        ):
+            response = self.client.patch(self.url, body, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(list(response.data), [error])
+        self.assertEqual(StudentOnboarding.objects.filter(state='CA').count(), 0)
+
+    def test_filter_matching_nothing_updates_nothing(self):
+        """Test that a filter SQL cannot express (an empty IN list) updates no rows instead of failing"""
+        self.assertEqual(update_matching({'id__in': []}, {'state': 'CA'}), [])
+        self.assertEqual(StudentOnboarding.objects.filter(state='CA').count(), 0)
+
+
+class StudentOnboardingPaginationTest(APITestCase):
+    def setUp(self):
+        self.list_url = reverse('student-onboarding-list')
+        base = {
+            'first_name': 'John',
+            'last_name': 'Doe',
+            'date_of_birth': date(2005, 6, 15),
+            'gender': 'M',
+            'mobile_number': '+1234567890',
+            'address_line_1': '123 Main St',
+            'city': 'New York',
+            'state': 'NY',
+            'country': 'United States',
+            'zipcode': '10001',
+            'citizenship': 'US',
+            'guardian_name': 'Jane Doe',
+            'guardian_relationship': 'Mother',
+            'guardian_phone': '+1234567891',
+            'guardian_email': 'jane.doe@example.com',
+            'family_income': '75000.00',
+            'number_of_siblings': 2,
+        }
+        StudentOnboarding.objects.bulk_create(
+            StudentOnboarding(email=f'student{i}@example.com', **base) for i in range(25)
+        )
+        # Force ties on created_at so the id tie-breaker is exercised
+        StudentOnboarding.objects.filter(id__lte=10).update(created_at=StudentOnboarding.objects.get(id=1).created_at)
+
+    def test_page_number_mode_is_default(self):
+        """Test that page-number pagination is still the default"""
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_cursor_pagination_walks_all_rows(self):
+        """Test that following next cursors visits every row once, newest first"""
+        seen = []
+        url = self.list_url + '?pagination=cursor'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        expected = list(
+            StudentOnboarding.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_cursor_previous_link_returns_previous_page(self):
+        """Test that the previous cursor returns the page before"""
+        first = self.client.get(self.list_url + '?pagination=cursor')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [row['id'] for row in back.data['results']],
+            [row['id'] for row in first.data['results']],
+        )
+        self.assertIsNone(back.data['previous'])
+
+    def test_cursor_page_does_not_count(self):
+        """Test that a cursor page runs one indexed query and no COUNT(*)"""
+        first = self.client.get(self.list_url + '?pagination=cursor')
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(first.data['next'])
+        self.assertEqual(len(context), 1)
+        self.assertNotIn('COUNT', context[0]['sql'])
+
+    def test_cursor_query_seeks_composite_index(self):
+        """Test that a deep cursor page is an index range search, not a scan"""
+        first = self.client.get(self.list_url + '?pagination=cursor')
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(first.data['next'])
+        self.assertIn('SEARCH student_onboarding USING INDEX student_created_id_idx', query_plan(context[0]['sql']))
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor returns 404"""
+        response = self.client.get(self.list_url + '?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+def build_student(index, **overrides):
+    """Unsaved StudentOnboarding with a unique email, for bulk test fixtures"""
+    fields = {
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'date_of_birth': date(2005, 6, 15),
+        'gender': 'M',
+        'email': f'student{index}@example.com',
+        'mobile_number': '+1234567890',
+        'address_line_1': '123 Main St',
+        'city': 'New York',
+        'state': 'NY',
+        'country': 'United States',
+        'zipcode': '10001',
+        'citizenship': 'US',
+        'guardian_name': 'Jane Doe',
+        'guardian_relationship': 'Mother',
+        'guardian_phone': '+1234567891',
+        'guardian_email': 'jane.doe@example.com',
+        'family_income': '75000.00',
+        'number_of_siblings': 2,
+    }
+    fields.update(overrides)
+    return StudentOnboarding(**fields)
+
+
+def query_plan(sql):
+    """SQLite EXPLAIN QUERY PLAN details for an executed statement"""
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+        return ' | '.join(row[-1] for row in cursor.fetchall())
+
+
+class StudentOnboardingFilterTest(APITestCase):
+    def setUp(self):
+        self.list_url = reverse('student-onboarding-list')
+        StudentOnboarding.objects.bulk_create([
+            build_student(1, citizenship='IN', has_family_abroad=True, gender='F', country='India'),
+            build_student(2, citizenship='IN', has_family_abroad=False, country='India'),
+            build_student(3, citizenship='US', has_family_abroad=True),
+            build_student(4, citizenship='CA', gender='F', country='Canada'),
+        ])
+
+    def list_emails(self, query):
+        response = self.client.get(self.list_url + query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(row['email'] for row in response.data['results'])
+
+    def test_filter_by_choice_fields(self):
+        """Test filtering on citizenship and gender, including comma separated values"""
+        self.assertEqual(self.list_emails('?citizenship=IN'), ['student1@example.com', 'student2@example.com'])
+        self.assertEqual(self.list_emails('?gender=F&citizenship=IN,CA'), ['student1@example.com', 'student4@example.com'])
+
+    def test_filter_by_country_and_family_abroad(self):
+        """Test filtering on country and the has_family_abroad flag"""
+        self.assertEqual(self.list_emails('?country=India&has_family_abroad=true'), ['student1@example.com'])
+        self.assertEqual(self.list_emails('?has_family_abroad=false&citizenship=IN'), ['student2@example.com'])
+
+    def test_filter_by_created_range(self):
+        """Test created_at range filters"""
+        self.assertEqual(len(self.list_emails('?created_after=2000-01-01')), 4)
+        self.assertEqual(self.list_emails('?created_before=2000-01-01'), [])
+
+    def test_invalid_filter_values(self):
+        """Test that invalid filter values return 400"""
+        for query in ('?gender=X', '?has_family_abroad=maybe', '?created_after=yesterday',
+                      '?created_after=2024-02-30', '?updated_before=2024-01-01T25:00'):
+            response = self.client.get(self.list_url + query)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def assert_list_query_uses_index(self, query, index_name):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.list_url + query)
+        self.assertIn(f'SEARCH student_onboarding USING INDEX {index_name}', query_plan(context[-1]['sql']))
+
+    def test_filters_use_composite_indexes(self):
+        """Test that the SQLite plan searches the composite indexes instead of scanning the table"""
+        self.assert_list_query_uses_index(
+            '?citizenship=IN&has_family_abroad=true&created_after=2024-01-01', 'student_cit_abroad_created_idx'
+        )
+        self.assert_list_query_uses_index('?citizenship=IN&created_after=2024-01-01', 'student_citizen_created_idx')
+        self.assert_list_query_uses_index('?gender=F&created_after=2024-01-01', 'student_gender_created_idx')
+        self.assert_list_query_uses_index('?country=India', 'student_country_created_idx')
+
+
+class FamilyAbroadTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        cms.invalidate()
+        self.list_url = reverse('student-onboarding-list')
+
+    def payload(self, index, **overrides):
+        row = dict(StudentOnboardingSerializer(build_student(index, **overrides)).data)
+        for field in ('id', 'created_at', 'updated_at'):
+            row.pop(field)
+        return row
+
+    def countries(self, student_id):
+        return set(StudentFamilyAbroad.objects.filter(student_id=student_id).values_list('country', flat=True))
+
+    def list_emails(self, query):
+        response = self.client.get(self.list_url + query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(row['email'] for row in response.data['results'])
+
+    def test_create_normalizes_and_indexes(self):
+        """Test that codes and labels are normalized, mirrored into rows, and unknown countries rejected"""
+        response = self.client.post(
+            reverse('student-onboarding-create'),
+            self.payload(1, has_family_abroad=True, countries_abroad='france; DE, Germany'), format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['data']['countries_abroad'], 'FR, DE')
+        self.assertEqual(self.countries(response.data['student_id']), {'FR', 'DE'})
+
+        response = self.client.post(
+            reverse('student-onboarding-create'), self.payload(2, countries_abroad='FR, Narnia'), format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['countries_abroad'], ['Unknown countries: Narnia.'])
+
+    def test_updates_rewrite_rows_only_on_change(self):
+        """Test that updates replace the rows when countries_abroad changes and leave them alone otherwise"""
+        student = build_student(1, countries_abroad='JP')
+        student.save()
+        update_url = reverse('student-onboarding-update', kwargs={'student_id': student.id})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(update_url, {'city': 'Boston'}, format='json')
+        self.assertFalse([query for query in queries if 'student_family_abroad' in query['sql']])
+        self.client.patch(update_url, {'countries_abroad': 'Canada, AU'}, format='json')
+        self.assertEqual(self.countries(student.id), {'CA', 'AU'})
+        self.client.patch(update_url, {'countries_abroad': ''}, format='json')
+        self.assertEqual(self.countries(student.id), set())
+
+    def test_repeated_saves_compare_against_last_save(self):
+        """Test that saving one instance again judges countries_abroad against its previous save"""
+        build_student(1, countries_abroad='JP').save()
+        student = StudentOnboarding.objects.get()
+        student.city = 'Boston'
+        student.save()
+        student.city = 'Denver'
+        with CaptureQueriesContext(connection) as queries:
+            student.save()
+        self.assertFalse([query for query in queries if 'student_family_abroad' in query['sql']])
+        student.countries_abroad = 'FR'
+        student.save()
+        self.assertEqual(self.countries(student.id), {'FR'})
+
+    def assert_still_editable(self, student_id, stored):
+        """A PATCH and an ORM save of other fields both succeed and keep countries_abroad as stored"""
+        update_url = reverse('student-onboarding-update', kwargs={'student_id': student_id})
+        response = self.client.patch(update_url, {'mobile_number': '+1234567899'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        response = self.client.patch(update_url, {'city': 'Boston', 'countries_abroad': stored}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        student = StudentOnboarding.objects.get(id=student_id)
+        student.city = 'Denver'
+        student.save()
+        self.assertEqual(StudentOnboarding.objects.get(id=student_id).countries_abroad, stored)
+
+    def test_legacy_text_stays_editable(self):
+        """Test that unnormalized text kept by the 0009 migration does not block edits of other fields"""
+        student = build_student(1)
+        student.save()
+        StudentOnboarding.objects.filter(id=student.id).update(countries_abroad='Spain')
+        self.assert_still_editable(student.id, 'Spain')
+
+        update_url = reverse('student-onboarding-update', kwargs={'student_id': student.id})
+        response = self.client.patch(update_url, {'countries_abroad': 'Spain, Narnia'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_deactivated_country_stays_editable(self):
+        """Test that deactivating a country in the CMS does not lock the students who list it"""
+        student = build_student(1, countries_abroad='JP')
+        student.save()
+        DropdownOption.objects.filter(category='countries', value='JP').update(is_active=False)
+        cms.invalidate()
+        self.assert_still_editable(student.id, 'JP')
+
+        response = self.client.post(
+            reverse('student-onboarding-create'), self.payload(2, countries_abroad='JP'), format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_paths_keep_rows(self):
+        """Test batch create, per-id bulk update and filter + set"""
+        response = self.client.post(
+            reverse('student-onboarding-batch-create'),
+            [self.payload(1, countries_abroad='DE'), self.payload(2, countries_abroad='india')], format='json',
+        )
+        first, second = [result['student_id'] for result in response.data['results']]
+        self.assertEqual((self.countries(first), self.countries(second)), ({'DE'}, {'IN'}))
+
+        bulk_url = reverse('student-onboarding-bulk-update')
+        self.client.patch(bulk_url, [{'id': first, 'changes': {'countries_abroad': 'FR'}}], format='json')
+        self.assertEqual(self.countries(first), {'FR'})
+        response = self.client.patch(
+            bulk_url, {'filter': {'id': [first, second]}, 'set': {'countries_abroad': 'uk, JP'}}, format='json'
+        )
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(StudentOnboarding.objects.get(id=second).countries_abroad, 'UK, JP')
+        self.assertEqual((self.countries(first), self.countries(second)), ({'UK', 'JP'}, {'UK', 'JP'}))
+
+    def test_family_abroad_in_filter(self):
+        """Test ?family_abroad_in= matching any listed country; the count and the page both use the index"""
+        for index, countries in enumerate(['DE, FR', 'FR', 'JP', None]):
+            build_student(index, countries_abroad=countries, has_family_abroad=bool(countries)).save()
+        self.assertEqual(self.list_emails('?family_abroad_in=DE'), ['student0@example.com'])
+        self.assertEqual(
+            self.list_emails('?family_abroad_in=DE,FR'), ['student0@example.com', 'student1@example.com']
+        )
+        self.assertEqual(self.list_emails('?family_abroad_in=JP&gender=F'), [])
+        response = self.client.get(self.list_url, {'family_abroad_in': 'DE,XX'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.list_url, {'family_abroad_in': 'DE,FR'})
+        count_sql, page_sql = [query['sql'] for query in context if 'student_family_abroad' in query['sql']]
+        # SQLite creates the (country, student) unique constraint as an autoindex
+        self.assertRegex(query_plan(count_sql), r'SEARCH \S+ USING COVERING INDEX \S+ \(country=\?\)')
+        page_plan = query_plan(page_sql)
+        self.assertIn('USING INDEX student_created_id_idx', page_plan)
+        self.assertRegex(page_plan, r'USING COVERING INDEX \S+ \(country=\? AND student_id=\?\)')
+        self.assertNotIn('TEMP B-TREE', page_plan)
+
+    def test_migration_populates_existing_rows(self):
+        """Test the data migration: known names become codes and rows, unknown text is kept"""
+        migration = importlib.import_module('onboarding.migrations.0009_student_family_abroad')
+        StudentOnboarding.objects.bulk_create([
+            build_student(1, countries_abroad='Germany, japan'),
+            build_student(2, countries_abroad='Narnia; FR'),
+        ])
+        migration.populate_family_abroad(django_apps, SimpleNamespace(connection=connection))
+        first, second = StudentOnboarding.objects.order_by('id')
+        self.assertEqual((first.countries_abroad, self.countries(first.id)), ('DE, JP', {'DE', 'JP'}))
+        self.assertEqual((second.countries_abroad, self.countries(second.id)), ('Narnia; FR', {'FR'}))
+
+
+class StudentOnboardingSearchTest(APITestCase):
+    def setUp(self):
+        self.list_url = reverse('student-onboarding-list')
+        StudentOnboarding.objects.bulk_create([
+            build_student(1, first_name='Priya', last_name='Sharma', mobile_number='+919876543210'),
+            build_student(2, first_name='Priyanka', last_name='Patel'),
+            build_student(3, first_name='Oliver', last_name='Smith', email='oliver@school.org'),
+        ])
+
+    def search(self, term):
+        response = self.client.get(self.list_url, {'q': term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['first_name'] for row in response.data['results']]
+
+    def test_search_prefix_matching(self):
+        """Test prefix search over names, email and mobile number"""
+        self.assertEqual(sorted(self.search('pri')), ['Priya', 'Priyanka'])
+        self.assertEqual(self.search('priya sha'), ['Priya'])
+        self.assertEqual(self.search('oliver@sch'), ['Oliver'])
+        self.assertEqual(self.search('91987'), ['Priya'])
+        self.assertEqual(self.search('nobody'), [])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        """Test that the FTS index is kept in sync by the table triggers"""
+        student = StudentOnboarding.objects.get(first_name='Oliver')
+        student.last_name = 'Williams'
+        student.save()
+        self.assertEqual(self.search('williams'), ['Oliver'])
+        self.assertEqual(self.search('smith'), [])
+        student.delete()
+        self.assertEqual(self.search('williams'), [])
+
+    def test_admin_search_uses_fts(self):
+        """Test that the admin changelist search is served by the FTS index"""
+        from django.contrib.admin.sites import site
+        model_admin = site._registry[StudentOnboarding]
+        queryset, may_have_duplicates = model_admin.get_search_results(
+            None, StudentOnboarding.objects.all(), 'patel'
+        )
+        self.assertIn('student_onboarding_fts', str(queryset.query))
+        self.assertEqual([student.first_name for student in queryset], ['Priyanka'])
+        self.assertFalse(may_have_duplicates)
+
+    def test_fts_check_is_refreshed(self):
+        """Test that a cached "no FTS table" answer expires, and that migrate drops it"""
+        self.addCleanup(search.forget_fts_tables)
+        key = search._fts_key('default')
+        search._fts_tables[key] = (False, time.monotonic() - search.FTS_CHECK_INTERVAL - 1)
+        self.assertTrue(search.fts_enabled())
+
+        search._fts_tables[key] = (False, time.monotonic())
+        self.assertFalse(search.fts_enabled())
+        call_command('migrate', 'onboarding', verbosity=0)
+        self.assertTrue(search.fts_enabled())
+
+
+class StudentOnboardingDetailCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = build_student(1)
+        self.student.save()
+        self.detail_url = reverse('student-onboarding-detail', kwargs={'student_id': self.student.id})
+        self.update_url = reverse('student-onboarding-update', kwargs={'student_id': self.student.id})
+
+    def test_detail_sets_validators(self):
+        """Test that detail responses carry ETag and Last-Modified"""
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'])
+        self.assertTrue(response['Last-Modified'])
+
+    def test_if_none_match_returns_304(self):
+        """Test that a matching If-None-Match returns 304 without a body"""
+        etag = self.client.get(self.detail_url)['ETag']
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_if_modified_since_returns_304(self):
+        """Test that If-Modified-Since at Last-Modified returns 304"""
+        last_modified = self.client.get(self.detail_url)['Last-Modified']
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_repeat_read_hits_cache(self):
+        """Test that a repeat read only looks up updated_at"""
+        self.client.get(self.detail_url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url)
+        self.assertEqual(response.data['email'], self.student.email)
+
+    def test_update_supersedes_cache(self):
+        """Test that updates through the API and the ORM replace the cached payload"""
+        etag = self.client.get(self.detail_url)['ETag']
+        self.client.patch(self.update_url, {'city': 'Boston'}, format='json')
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['city'], 'Boston')
+
+        self.student.refresh_from_db()
+        self.student.city = 'Chicago'
+        self.student.save()
+        self.assertEqual(self.client.get(self.detail_url).data['city'], 'Chicago')
+
+    def test_write_without_signals_supersedes_cache(self):
+        """Test that a write this process never saw (another worker, a bulk update) is not hidden by the cache"""
+        self.client.get(self.detail_url)
+        StudentOnboarding.objects.filter(id=self.student.id).update(city='Denver', updated_at=timezone.now())
+        self.assertEqual(self.client.get(self.detail_url).data['city'], 'Denver')
+
+        StudentOnboarding.objects.filter(id=self.student.id).delete()
+        self.assertEqual(self.client.get(self.detail_url).status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(ONBOARDING_DETAIL_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self):
+        """Test that conditional GET still works with the cache disabled"""
+        etag = self.client.get(self.detail_url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class DropdownOptionsCMSTest(APITestCase):
+    def setUp(self):
+        cms.invalidate()
+        self.dropdown_url = reverse('dropdown-options')
+
+    def tearDown(self):
+        # The snapshot is process-wide; don't leak rolled-back CMS edits into other tests
+        cms.invalidate()
+
+    def test_options_served_from_cms_store(self):
+        """Test that the seeded CMS rows reproduce the original options payload"""
+        response = self.client.get(self.dropdown_url)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn('max-age=', response['Cache-Control'])
+        payload = json.loads(response.content)
+        self.assertEqual(payload['gender'][0], {'value': 'M', 'label': 'Male'})
+        self.assertEqual(
+            [option['value'] for option in payload['countries']],
+            ['US', 'CA', 'UK', 'IN', 'AU', 'DE', 'FR', 'JP'],
+        )
+
+    def test_repeat_requests_are_cached(self):
+        """Test that repeat requests run no queries and honour If-None-Match"""
+        etag = self.client.get(self.dropdown_url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.dropdown_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_fields_subset(self):
+        """Test that ?fields= returns only the requested lists"""
+        response = self.client.get(self.dropdown_url, {'fields': 'states,gender'})
+        self.assertEqual(list(json.loads(response.content)), ['gender', 'states'])
+        self.assertNotEqual(response['ETag'], self.client.get(self.dropdown_url)['ETag'])
+        response = self.client.get(self.dropdown_url, {'fields': 'gender,planets'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cms_edit_invalidates_cache(self):
+        """Test that editing an option changes the payload and the ETag"""
+        etag = self.client.get(self.dropdown_url)['ETag']
+        DropdownOption.objects.filter(category='states', value='TX').update(label='Texas (TX)')
+        DropdownOption.objects.get(category='states', value='TX').save()
+        response = self.client.get(self.dropdown_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn({'value': 'TX', 'label': 'Texas (TX)'}, json.loads(response.content)['states'])
+
+    def test_inactive_choice_is_rejected(self):
+        """Test that StudentOnboarding choices follow the CMS store"""
+        option = DropdownOption.objects.get(category='gender', value='O')
+        option.is_active = False
+        option.save()
+        serializer = StudentOnboardingSerializer(data={'gender': 'O'}, partial=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('gender', serializer.errors)
+
+
+class StudentOnboardingExportTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.export_url = reverse('student-onboarding-export')
+        StudentOnboarding.objects.bulk_create([build_student(i, first_name=f'Student {i}') for i in range(3)])
+
+    def test_csv_export_all_fields(self):
+        """Test streaming CSV export with every model field"""
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0][:3], ['id', 'first_name', 'last_name'])
+        self.assertIn('updated_at', rows[0])
+        self.assertEqual(len(rows), 4)
+
+    def test_ndjson_export_matches_api_representation(self):
+        """Test that NDJSON rows carry the same values as the detail API"""
+        response = self.client.get(self.export_url, {'output': 'ndjson'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        exported = json.loads(lines[0])
+        detail = self.client.get(
+            reverse('student-onboarding-detail', kwargs={'student_id': exported['id']})
+        ).data
+        self.assertEqual(exported, json.loads(json.dumps(detail)))
+
+    def test_export_field_subset_and_window(self):
+        """Test field selection and created_at windows"""
+        response = self.client.get(self.export_url, {'output': 'ndjson', 'fields': 'id,email'})
+        row = json.loads(b''.join(response.streaming_content).decode().splitlines()[0])
+        self.assertEqual(list(row), ['id', 'email'])
+        response = self.client.get(self.export_url, {'output': 'ndjson', 'created_before': '2000-01-01'})
+        self.assertEqual(b''.join(response.streaming_content), b'')
+
+    def test_export_rejects_unknown_options(self):
+        """Test validation of output format and field names"""
+        self.assertEqual(self.client.get(self.export_url, {'output': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get(self.export_url, {'fields': 'id,password'}).status_code, 400)
+        self.assertEqual(self.client.get(self.export_url, {'created_after': '2024-02-30'}).status_code, 400)
+
+    def test_export_command(self):
+        """Test the export_students management command"""
+        out, err = io.StringIO(), io.StringIO()
+        call_command('export_students', '--output-format', 'ndjson', '--fields', 'email', stdout=out, stderr=err)
+        self.assertEqual(
+            [json.loads(line)['email'] for line in out.getvalue().splitlines()],
+            [f'student{i}@example.com' for i in range(3)],
+        )
+        self.assertTrue(err.getvalue().startswith('Exported 3 rows'))
+
+    def test_export_command_counts_multiline_values(self):
+        """Test that the command counts rows, not lines, when a CSV value spans several lines"""
+        StudentOnboarding.objects.filter(email='student0@example.com').update(address_line_1='Flat 2\nMain Street 1')
+        out, err = io.StringIO(), io.StringIO()
+        call_command('export_students', '--fields', 'id,address_line_1', stdout=out, stderr=err)
+        self.assertEqual(len(list(csv.reader(io.StringIO(out.getvalue())))), 4)
+        self.assertTrue(err.getvalue().startswith('Exported 3 rows'))
+
+
+def selected_columns(queries):
+    """Student columns in the SELECT list of each captured student_onboarding read"""
+    selects = []
+    for query in queries:
+        sql = query['sql']
+        if sql.startswith('SELECT') and 'FROM "student_onboarding"' in sql and 'COUNT(' not in sql:
+            select_list = sql[:sql.index(' FROM ')]
+            selects.append(re.findall(r'"student_onboarding"\."(\w+)"', select_list))
+    return selects
+
+
+class SparseFieldsetTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        StudentOnboarding.objects.bulk_create([build_student(i, first_name=f'Student {i}') for i in range(3)])
+        self.student = StudentOnboarding.objects.order_by('id').first()
+        self.list_url = reverse('student-onboarding-list')
+        self.detail_url = reverse('student-onboarding-detail', kwargs={'student_id': self.student.id})
+
+    def test_list_selects_only_requested_columns(self):
+        """Test that ?fields= and ?exclude= narrow both the list payload and the SELECT"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, {'fields': 'email,city'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data['results'][0]), ['email', 'city'])
+        self.assertEqual(selected_columns(queries), [['email', 'city']])
+
+        response = self.client.get(self.list_url, {'exclude': 'email,created_at'})
+        self.assertEqual(list(response.data['results'][0]), ['id', 'first_name', 'last_name'])
+
+    def test_cursor_list_keeps_position_columns(self):
+        """Test that cursor pages also read (created_at, id) and their links still work"""
+        params = {'fields': 'email', 'pagination': 'cursor', 'page_size': 2}
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.get(self.list_url, params).json()
+        self.assertEqual(selected_columns(queries), [['email', 'created_at', 'id']])
+        self.assertEqual(first['results'], [{'email': 'student2@example.com'}, {'email': 'student1@example.com'}])
+        second = self.client.get(first['next']).json()
+        self.assertEqual(second['results'], [{'email': 'student0@example.com'}])
+
+    def test_detail_miss_selects_only_requested_columns(self):
+        """Test a sparse detail read from the database, and its ETag"""
+        full_etag = self.client.get(self.detail_url)['ETag']
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.detail_url, {'fields': 'first_name,country'})
+        self.assertEqual(response.data, {'first_name': 'Student 0', 'country': 'United States'})
+        # The version lookup for the cache, then the sparse row
+        self.assertEqual(selected_columns(queries), [['updated_at'], ['first_name', 'country', 'id', 'updated_at']])
+        self.assertNotEqual(response['ETag'], full_etag)
+
+        response = self.client.get(
+            self.detail_url, {'fields': 'first_name,country'}, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(self.detail_url, {'fields': 'first_name'}, HTTP_IF_NONE_MATCH=full_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_hit_is_narrowed_from_cache(self):
+        """Test that a cached full payload answers sparse reads after the version lookup"""
+        self.client.get(self.detail_url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, {'exclude': 'father_name,mother_name'})
+        self.assertNotIn('father_name', response.data)
+        self.assertEqual(len(response.data), len(STUDENT_DETAIL.fields) - 2)
+
+    def test_export_exclude(self):
+        """Test that the streaming export honours ?exclude= in the SELECT"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('student-onboarding-export'), {'output': 'ndjson', 'fields': 'id,email,city', 'exclude': 'city'}
+            )
+            lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(json.loads(lines[0]), {'id': self.student.id, 'email': 'student0@example.com'})
+        self.assertEqual(selected_columns(queries), [['id', 'email']])
+
+    def test_unknown_fields_rejected(self):
+        """Test the 400 responses for unknown names and an empty selection"""
+        for url, params, param in (
+            (self.list_url, {'fields': 'email,password'}, 'fields'),
+            (self.detail_url, {'exclude': 'salary'}, 'exclude'),
+            (self.detail_url, {'fields': 'email', 'exclude': 'email'}, 'fields'),
+        ):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(list(response.data), [param])
+
+
+class ImportStudentsCommandTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'students.csv')
+        fieldnames = [
+            'first_name', 'last_name', 'date_of_birth', 'gender', 'email', 'mobile_number',
+            'address_line_1', 'address_line_2', 'city', 'state', 'country', 'zipcode', 'citizenship',
+            'guardian_name', 'guardian_relationship', 'guardian_phone', 'guardian_email',
+            'family_income', 'number_of_siblings', 'has_family_abroad',
+        ]
+        base = {name: getattr(build_student(0), name) for name in fieldnames}
+        rows = [dict(base, email=f'import{i}@example.com') for i in range(5)]
+        rows[1]['zipcode'] = '!!'
+        rows[2]['email'] = 'import0@example.com'
+        rows[3]['gender'] = 'X'
+        with open(self.path, 'w', newline='') as handle:
+            writer = csv.DictWriter(handle, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def run_import(self, *args):
+        call_command(
+            'import_students', self.path, '--workers', '0', '--chunk-size', '2', *args,
+            stdout=io.StringIO(), stderr=io.StringIO()
+        )
+
+    def test_import_creates_valid_rows_and_logs_rejects(self):
+        """Test that valid rows are inserted and rejected rows are written with reasons"""
+        self.run_import()
+        self.assertEqual(
+            sorted(StudentOnboarding.objects.values_list('email', flat=True)),
+            ['import0@example.com', 'import4@example.com'],
+        )
+        with open(self.path + '.rejects.ndjson') as handle:
+            rejects = [json.loads(line) for line in handle]
+        self.assertEqual([reject['line'] for reject in rejects], [2, 3, 4])
+        self.assertIn('zipcode', rejects[0]['errors'])
+        self.assertIn('email', rejects[1]['errors'])
+        self.assertIn('gender', rejects[2]['errors'])
+        with open(self.path + '.checkpoint.json') as handle:
+            self.assertEqual(json.load(handle), {'line': 5, 'created': 2, 'rejected': 3})
+
+    def test_import_resumes_from_checkpoint(self):
+        """Test that --resume skips lines committed by an earlier run"""
+        with open(self.path + '.checkpoint.json', 'w') as handle:
+            json.dump({'line': 4, 'created': 1, 'rejected': 3}, handle)
+        self.run_import('--resume')
+        self.assertEqual(list(StudentOnboarding.objects.values_list('email', flat=True)), ['import4@example.com'])
+
+
+class CompiledSerializerTest(TestCase):
+    def setUp(self):
+        StudentOnboarding.objects.bulk_create([
+            build_student(1),
+            build_student(
+                2, first_name='Zoë', last_name='Ørsted', address_line_2='Flat 2', father_name='Émile',
+                family_income='0.5', has_family_abroad=True, countries_abroad='FR, DE',
+            ),
+            build_student(3, family_income='1234567890.12', father_profession=None, mother_name=''),
+        ])
+        StudentOnboarding.objects.filter(email='student3@example.com').update(
+            created_at=datetime(2024, 2, 29, 23, 59, 59, 999999, tzinfo=dt_timezone.utc)
+        )
+        self.renderer = JSONRenderer()
+
+    def assertSameJSON(self, compiled, serializer_class):
+        for student in StudentOnboarding.objects.order_by('id'):
+            expected = self.renderer.render(serializer_class(student).data)
+            row = compiled.values(StudentOnboarding.objects.filter(id=student.id)).get()
+            self.assertEqual(self.renderer.render(compiled.to_representation(row)), expected)
+            self.assertEqual(self.renderer.render(compiled.from_instance(student)), expected)
+
+    def test_detail_output_is_byte_identical(self):
+        """Test that the compiled detail serializer renders exactly like StudentOnboardingSerializer"""
+        self.assertSameJSON(STUDENT_DETAIL, StudentOnboardingSerializer)
+
+    def test_list_output_is_byte_identical(self):
+        """Test that the compiled list serializer renders exactly like StudentOnboardingListSerializer"""
+        self.assertSameJSON(STUDENT_LIST_ITEM, StudentOnboardingListSerializer)
+
+    def test_output_follows_current_timezone(self):
+        """Test that datetimes are rendered in the active timezone, as DRF does"""
+        with timezone.override('Asia/Kolkata'):
+            self.assertSameJSON(STUDENT_DETAIL, StudentOnboardingSerializer)
+
+    def test_unsaved_python_values(self):
+        """Test instances holding raw Python values (e.g. a string income before a refresh)"""
+        student = build_student(9, family_income='10.5', id=9)
+        self.assertEqual(STUDENT_DETAIL.from_instance(student)['family_income'], '10.50')
+        self.assertEqual(
+            self.renderer.render(STUDENT_DETAIL.from_instance(student)),
+            self.renderer.render(StudentOnboardingSerializer(student).data),
+        )
+
+    def test_list_endpoint_runs_a_single_values_query(self):
+        """Test that the list endpoint selects only the listed columns"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('student-onboarding-list'), {'pagination': 'cursor'})
+        self.assertEqual(len(response.json()['results']), 3)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"family_income"', queries[0]['sql'])
+
+
+class RequestMetricsTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        metrics_registry.reset()
+        self.student = build_student(1)
+        self.student.save()
+
+    def scrape(self):
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode().splitlines()
+
+    def test_requests_recorded_per_url_name(self):
+        """Test status counts and SQL query counts per URL name"""
+        self.client.get(reverse('student-onboarding-list'))
+        self.client.get(reverse('student-onboarding-detail', kwargs={'student_id': 999999}))
+        lines = self.scrape()
+        self.assertIn(
+            'onboarding_http_requests_total{view="student-onboarding-list",method="GET",status="200"} 1', lines
+        )
+        self.assertIn(
+            'onboarding_http_requests_total{view="student-onboarding-detail",method="GET",status="404"} 1', lines
+        )
+        # Page-number pagination: COUNT(*) plus the page itself
+        self.assertIn('onboarding_db_queries_per_request_sum{view="student-onboarding-list",method="GET"} 2', lines)
+        self.assertIn(
+            'onboarding_http_request_duration_seconds_bucket{view="student-onboarding-list",method="GET",le="+Inf"} 1',
+            lines,
+        )
+
+    def test_request_and_response_sizes(self):
+        """Test that body sizes are recorded for both directions"""
+        body = json.dumps({'first_name': 'Ann'})
+        response = self.client.patch(
+            reverse('student-onboarding-update', kwargs={'student_id': self.student.id}),
+            body, content_type='application/json'
+        )
+        lines = self.scrape()
+        labels = 'view="student-onboarding-update",method="PATCH"'
+        self.assertIn(f'onboarding_http_request_size_bytes_sum{{{labels}}} {len(body)}', lines)
+        self.assertIn(f'onboarding_http_response_size_bytes_sum{{{labels}}} {len(response.content)}', lines)
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test Prometheus bucket semantics (le is inclusive, +Inf equals the count)"""
+        histogram = Histogram((1, 5))
+        for value in (0, 1, 3, 7):
+            histogram.observe(value)
+        self.assertEqual(list(histogram.samples()), [(1, 2), (5, 3), ('+Inf', 4)])
+        self.assertEqual(histogram.total, 11)
+
+    async def test_async_requests_are_recorded(self):
+        """Test that queries run in sync_to_async threads count toward the request"""
+        await self.async_client.get(reverse('student-onboarding-list'))
+        lines = metrics_registry.render().splitlines()
+        self.assertIn(
+            'onboarding_http_requests_total{view="student-onboarding-list",method="GET",status="200"} 1', lines
+        )
+        self.assertIn('onboarding_db_queries_per_request_sum{view="student-onboarding-list",method="GET"} 2', lines)
+
+
+class RequestProfilingTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        settings_override = override_settings(ONBOARDING_PROFILING_DIR=self.directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # The test connection predates the middleware when an async test builds the handler first
+        profiling.install_query_capture()
+        self.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        self.student = build_student(1)
+        self.student.save()
+
+    def create_payload(self, index):
+        data = dict(StudentOnboardingSerializer(build_student(index)).data)
+        for field in ('id', 'created_at', 'updated_at'):
+            data.pop(field, None)
+        return data
+
+    def test_staff_header_profiles_request(self):
+        """Test that a staff request with X-Profile stores a report with SQL, plans and a call profile"""
+        self.client.force_login(self.staff)
+        response = self.client.get(
+            reverse('student-onboarding-detail', kwargs={'student_id': self.student.id}), HTTP_X_PROFILE='1'
+        )
+        report = profiling.load_report(response['X-Profile-Id'])
+        self.assertEqual(report['trigger'], 'header')
+        self.assertEqual(report['view'], 'student-onboarding-detail')
+        self.assertEqual(report['user'], 'staff')
+        select = next(q for q in report['sql']['queries'] if 'FROM "student_onboarding"' in q['sql'])
+        self.assertTrue(any('student_onboarding' in step for step in select['plan']))
+        self.assertIn('cumulative', report['profile'])
+        self.assertIsNotNone(profiling.report_path(report['id'], 'prof'))
+
+    def test_header_ignored_for_anonymous_users(self):
+        """Test that the header alone does not enable profiling"""
+        response = self.client.get(reverse('student-onboarding-list'), HTTP_X_PROFILE='1')
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(profiling.list_reports(), [])
+
+    @override_settings(ONBOARDING_PROFILING_SAMPLE_RATE=1.0)
+    def test_sampled_requests_are_profiled(self):
+        """Test that sampling profiles requests without the header"""
+        response = self.client.get(reverse('student-onboarding-list'))
+        self.assertEqual(profiling.load_report(response['X-Profile-Id'])['trigger'], 'sample')
+
+    @override_settings(ONBOARDING_PROFILING_SAMPLE_RATE=1.0)
+    async def test_async_requests_capture_thread_queries(self):
+        """Test that queries run in sync_to_async threads land in the report under ASGI"""
+        response = await self.async_client.get(reverse('student-onboarding-list'))
+        report = profiling.load_report(response['X-Profile-Id'])
+        self.assertEqual(report['sql']['count'], 2)
+
+    @override_settings(ONBOARDING_PROFILING_SAMPLE_RATE=1.0)
+    async def test_one_profiler_per_thread(self):
+        """Test that a request triggered while another is profiled on the loop thread runs unprofiled"""
+        profiler = profiling.start_profiler()
+        try:
+            self.assertIsNone(profiling.start_profiler())
+            response = await self.async_client.get(reverse('student-onboarding-list'))
+        finally:
+            profiling.stop_profiler(profiler)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Profile-Id', response)
+        response = await self.async_client.get(reverse('student-onboarding-list'))
+        self.assertIn('X-Profile-Id', response)
+
+    def test_create_report_has_no_duplicate_queries(self):
+        """Test a profiled create: one INSERT and no repeated email uniqueness check"""
+        self.client.force_login(self.staff)
+        response = self.client.post(
+            reverse('student-onboarding-create'), self.create_payload(2), format='json', HTTP_X_PROFILE='1'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        report = profiling.load_report(response['X-Profile-Id'])
+        self.assertEqual(report['duplicates'], [])
+        self.assertEqual(sum(q['sql'].startswith('INSERT INTO "student_onboarding"') for q in report['sql']['queries']), 1)
+
+    def test_repeated_statements_flagged(self):
+        """Test duplicate detection, and N+1 detection with the origins of each repeat"""
+        sql = 'SELECT "name" FROM "parent" WHERE "id" = %s'
+        queries = [{'sql': sql, 'params': (i,), 'origin': ['views.py:1 in get']} for i in range(3)]
+        queries += [{'sql': 'SELECT 1 WHERE %s', 'params': ('a',), 'origin': []}] * 2
+        duplicates, n_plus_one = profiling.analyze_queries(queries)
+        self.assertEqual(duplicates, [{'sql': 'SELECT 1 WHERE %s', 'params': "('a',)", 'count': 2}])
+        self.assertEqual(len(n_plus_one), 1)
+        self.assertEqual(n_plus_one[0]['sql'], sql)
+        self.assertEqual(n_plus_one[0]['count'], 3)
+        self.assertEqual(n_plus_one[0]['origins'], ['views.py:1 in get'])
+
+    def test_report_views_are_staff_only(self):
+        """Test browsing and downloading reports"""
+        self.client.force_login(self.staff)
+        report_id = self.client.get(reverse('student-onboarding-list'), HTTP_X_PROFILE='1')['X-Profile-Id']
+        listing = self.client.get(reverse('profile-report-list')).json()
+        self.assertEqual([summary['id'] for summary in listing], [report_id])
+        detail = self.client.get(reverse('profile-report-detail', kwargs={'report_id': report_id}))
+        self.assertEqual(detail.json()['id'], report_id)
+        download = self.client.get(reverse('profile-report-download', kwargs={'report_id': report_id}))
+        self.assertEqual(download['Content-Disposition'], f'attachment; filename="{report_id}.prof"')
+        missing = self.client.get(reverse('profile-report-detail', kwargs={'report_id': '..'}))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.logout()
+        response = self.client.get(reverse('profile-report-list'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class SQLiteProductionModeTest(TestCase):
+    def test_pragmas_applied_to_connection(self):
+        """Test that configured pragmas run on the raw connection"""
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA cache_size')
+            default = cursor.fetchone()[0]
+            with override_settings(ONBOARDING_SQLITE_PRAGMAS={'cache_size': -1234}):
+                apply_sqlite_pragmas(connection)
+            cursor.execute('PRAGMA cache_size')
+            self.assertEqual(cursor.fetchone()[0], -1234)
+            cursor.execute(f'PRAGMA cache_size = {default}')
+
+    @override_settings(ONBOARDING_SERIALIZE_WRITES=True)
+    def test_api_writes_through_serialized_writer(self):
+        """Test create and update with the write serializer enabled"""
+        payload = dict(StudentOnboardingSerializer(build_student(1)).data)
+        for field in ('id', 'created_at', 'updated_at'):
+            payload.pop(field)
+        response = self.client.post(reverse('student-onboarding-create'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        update_url = reverse('student-onboarding-update', kwargs={'student_id': response.json()['student_id']})
+        response = self.client.patch(update_url, {'city': 'Boston'}, content_type='application/json')
+        self.assertEqual(response.json()['data']['city'], 'Boston')
+
+    @override_settings(ONBOARDING_SERIALIZE_WRITES=True, ONBOARDING_WRITE_BACKOFF=0)
+    def test_no_retry_inside_transaction(self):
+        """Test that a lock error inside an atomic block is not replayed"""
+        calls = []
+
+        def write():
+            calls.append(1)
+            raise OperationalError('database is locked')
+
+        with self.assertRaises(OperationalError):
+            run_write(write)
+        self.assertEqual(len(calls), 1)
+
+
+@override_settings(ONBOARDING_SERIALIZE_WRITES=True, ONBOARDING_WRITE_BACKOFF=0, ONBOARDING_WRITE_RETRIES=2)
+class RunWriteRetryTest(SimpleTestCase):
+    def test_lock_errors_retried(self):
+        """Test that lock errors are retried until the write succeeds"""
+        attempts = iter([OperationalError('database is locked'), OperationalError('database is locked'), None])
+
+        def write():
+            error = next(attempts)
+            if error is not None:
+                raise error
+            return 'written'
+
+        self.assertEqual(run_write(write), 'written')
+
+    def test_retries_exhausted_and_other_errors_raised(self):
+        """Test that the last lock error, and any other error, propagates"""
+        def locked():
+            raise OperationalError('database is locked')
+
+        with self.assertRaises(OperationalError):
+            run_write(locked)
+
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise OperationalError('no such table: student_onboarding')
+
+        with self.assertRaises(OperationalError):
+            run_write(broken)
+        self.assertEqual(len(calls), 1)
+
+
+@override_settings(ONBOARDING_READ_REPLICAS=['replica'], ONBOARDING_REPLICA_MAX_LAG=5.0)
+class ReadReplicaTest(APITestCase):
+    """
+    Runs against a real replica file. The alias is added for this class only,
+    so it stays out of the test runner's databases; the replica is read outside
+    the test transaction.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        replica = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(cls.directory.name, 'replica.sqlite3')}
+        connections.settings['replica'] = connections.configure_settings(
+            {'default': connections.settings['default'], 'replica': replica}
+        )['replica']
+        # The backup waits on any open transaction, so sync before the class one starts
+        sync_replica('replica')
+        super().setUpClass()
+        # Drop the connection SimpleTestCase wrapped to refuse queries to undeclared aliases
+        del connections['replica']
+
+    @classmethod
+    def tearDownClass(cls):
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        super().tearDownClass()
+        cls.directory.cleanup()
+
+    def setUp(self):
+        cache.clear()
+        cms.invalidate()
+        self.list_url = reverse('student-onboarding-list')
+
+    def mark_synced(self, at):
+        with open(stamp_path('replica'), 'w', encoding='ascii') as handle:
+            handle.write(f'{at:.6f}')
+
+    def listed(self):
+        return self.client.get(self.list_url).data['count']
+
+    def test_sync_copies_the_primary(self):
+        """Test that the replica holds the migrated schema and data, and is never migrated itself"""
+        self.assertEqual(
+            DropdownOption.objects.using('replica').count(), DropdownOption.objects.using('default').count()
+        )
+        self.assertFalse(ReplicaRouter().allow_migrate('replica', 'onboarding'))
+        self.assertIsNone(ReplicaRouter().allow_migrate('default', 'onboarding'))
+
+    def test_reads_use_replica_within_lag_bound(self):
+        """Test that safe-method reads go to a fresh replica and to the primary once it lags"""
+        student = build_student(1)
+        student.save()
+        self.mark_synced(time.time() - 1)
+        self.assertEqual(self.listed(), 0)
+        # Details read the replica too: cached entries are looked up by the version it holds
+        detail_url = reverse('student-onboarding-detail', kwargs={'student_id': student.id})
+        self.assertEqual(self.client.get(detail_url, {'fields': 'email'}).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(detail_url).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.mark_synced(time.time() - 6)
+        self.assertEqual(self.listed(), 1)
+        os.remove(stamp_path('replica'))
+        self.assertEqual(self.listed(), 1)
+
+    def test_client_reads_its_own_writes(self):
+        """Test that a writer stays on the primary until a replica is synced after its write"""
+        self.mark_synced(time.time() - 1)
+        payload = dict(StudentOnboardingSerializer(build_student(1)).data)
+        for field in ('id', 'created_at', 'updated_at'):
+            payload.pop(field)
+        response = self.client.post(reverse('student-onboarding-create'), payload, format='json')
+        self.assertEqual(response.cookies[READ_AFTER_COOKIE]['max-age'], 5)
+        self.assertEqual(self.listed(), 1)
+        self.assertEqual(self.client_class().get(self.list_url).data['count'], 0)
+
+        self.mark_synced(time.time())
+        self.assertEqual(self.listed(), 0)
+
+    def test_filter_update_counts_as_write(self):
+        """Test that the filter + set bulk PATCH, which writes through a raw cursor, keeps the client on the primary"""
+        build_student(1, state='NY').save()
+        self.mark_synced(time.time() - 1)
+        response = self.client.patch(
+            reverse('student-onboarding-bulk-update'), {'filter': {'state': 'NY'}, 'set': {'state': 'CA'}}, format='json'
+        )
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(response.cookies[READ_AFTER_COOKIE]['max-age'], 5)
+        self.assertEqual(self.client.get(self.list_url, {'state': 'CA'}).data['count'], 1)
+
+    def test_router_decisions(self):
+        """Test routing without a request, for unsafe methods, after a write and per request"""
+        router = ReplicaRouter()
+        self.mark_synced(time.time())
+        self.assertIsNone(router.db_for_read(StudentOnboarding))
+
+        state = RoutingState(replica_reads=False)
+        token = replica_routing.set(state)
+        self.assertIsNone(router.db_for_read(StudentOnboarding))
+        replica_routing.reset(token)
+
+        state = RoutingState(replica_reads=True)
+        token = replica_routing.set(state)
+        self.assertEqual(router.db_for_read(StudentOnboarding), 'replica')
+        # The request keeps its replica even once it goes stale
+        self.mark_synced(time.time() - 6)
+        self.assertEqual(router.db_for_read(DropdownOption), 'replica')
+        self.assertEqual(router.db_for_write(StudentOnboarding), 'default')
+        self.assertIsNone(router.db_for_read(StudentOnboarding))
+        replica_routing.reset(token)
+
+        token = replica_routing.set(RoutingState(replica_reads=True))
+        self.assertEqual(router.db_for_read(StudentOnboarding), 'default')
+        replica_routing.reset(token)
+
+
+@override_settings(ONBOARDING_QUEUED_CREATES=True)
+class QueuedCreateTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.create_url = reverse('student-onboarding-create')
+
+    def payload(self, index, **overrides):
+        data = dict(StudentOnboardingSerializer(build_student(index)).data, **overrides)
+        for field in ('id', 'created_at', 'updated_at'):
+            data.pop(field)
+        return data
+
+    def test_create_accepted_then_processed(self):
+        """Test the 202 response, the queued status and the student_id after processing"""
+        response = self.client.post(self.create_url, self.payload(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response['Location'], response.data['status_url'])
+        self.assertFalse(StudentOnboarding.objects.exists())
+        self.assertEqual(self.client.get(response.data['status_url']).data['status'], 'queued')
+
+        self.assertEqual(process_pending(), (1, 0))
+        result = self.client.get(response.data['status_url']).data
+        student = StudentOnboarding.objects.get()
+        self.assertEqual(result['status'], 'created')
+        self.assertEqual(result['student_id'], student.id)
+        self.assertTrue(result['student_url'].endswith(f'/student-onboarding/{student.id}/'))
+
+    def test_schema_checked_before_queueing(self):
+        """Test that a payload missing required fields is rejected without queueing"""
+        data = self.payload(1)
+        del data['email']
+        response = self.client.post(self.create_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'email': ['This field is required.']})
+        self.assertFalse(OnboardingSubmission.objects.exists())
+
+    def test_failures_recorded_per_submission(self):
+        """Test full validation in the worker: invalid rows and duplicate emails fail individually"""
+        urls = [
+            self.client.post(self.create_url, data, format='json').data['status_url']
+            for data in (self.payload(1), self.payload(2, mobile_number='bad'), self.payload(3, email=self.payload(1)['email']))
+        ]
+        self.assertEqual(process_pending(batch_size=2), (1, 2))
+        results = [self.client.get(url).data for url in urls]
+        self.assertEqual([result['status'] for result in results], ['created', 'failed', 'failed'])
+        self.assertIn('mobile_number', results[1]['errors'])
+        self.assertIn('email', results[2]['errors'])
+
+    def test_command_drains_queue_and_requeues_stale(self):
+        """Test process_submissions --once, including a batch left behind by a crashed worker"""
+        for index in range(3):
+            self.client.post(self.create_url, self.payload(index), format='json')
+        claimed = claim_batch(2)
+        OnboardingSubmission.objects.filter(id__in=[s.id for s in claimed]).update(
+            claimed_at=timezone.now() - timedelta(hours=1)
+        )
+        out = io.StringIO()
+        call_command('process_submissions', '--once', '--stale-after', '60', stdout=out, stderr=io.StringIO())
+        self.assertIn('3 created, 0 failed', out.getvalue())
+        self.assertEqual(StudentOnboarding.objects.count(), 3)
+
+    def test_unknown_submission_is_404(self):
+        """Test the status URL for an id that was never queued"""
+        response = self.client.get(reverse('student-onboarding-submission', kwargs={'submission_id': uuid.uuid4()}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(ONBOARDING_EMAIL_FILTER_SYNC_INTERVAL=3600)
+class EmailAvailabilityTest(APITestCase):
+    def setUp(self):
+        email_index.reset()
+        self.addCleanup(email_index.reset)
+        self.url = reverse('email-available')
+        self.student = build_student(1)
+        self.student.save()
+
+    def check(self, email):
+        response = self.client.get(self.url, {'email': email})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['available']
+
+    def test_free_email_answered_from_filter(self):
+        """Test that a filter miss needs no query and a stored email falls back to the database"""
+        self.assertTrue(self.check('warm.up@example.com'))
+        with self.assertNumQueries(0):
+            self.assertTrue(self.check('nobody@example.com'))
+        with self.assertNumQueries(1):
+            self.assertFalse(self.check(self.student.email))
+
+    def test_filter_follows_creates_and_bulk_inserts(self):
+        """Test that saves and bulk inserts in this process reach the filter without a resync"""
+        self.check('warm.up@example.com')
+        created = build_student(2)
+        created.save()
+        row = dict(StudentOnboardingSerializer(build_student(3)).data)
+        for field in ('id', 'created_at', 'updated_at'):
+            row.pop(field)
+        response = self.client.post(reverse('student-onboarding-batch-create'), [row], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(self.check(created.email))
+        self.assertFalse(self.check(build_student(3).email))
+
+    @override_settings(ONBOARDING_EMAIL_FILTER_SYNC_INTERVAL=0)
+    def test_sync_picks_up_other_writers(self):
+        """Test that rows written without this process's hooks are found on the next sync"""
+        self.check('warm.up@example.com')
+        StudentOnboarding.objects.bulk_create([build_student(4)])
+        self.assertFalse(self.check(build_student(4).email))
+
+    def test_snapshot_rebuild_and_load(self):
+        """Test rebuild_email_filter and a process starting from its snapshot"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'emails.bloom')
+            out = io.StringIO()
+            call_command('rebuild_email_filter', '--output', path, stdout=out)
+            self.assertIn('1 emails', out.getvalue())
+            StudentOnboarding.objects.bulk_create([build_student(5)])
+            with override_settings(ONBOARDING_EMAIL_FILTER_PATH=path):
+                self.assertFalse(self.check(self.student.email))
+                # Written after the snapshot: found by the catch-up sync on load
+                self.assertFalse(self.check(build_student(5).email))
+
+                # App loading reads the file only; the first check then catches up
+                email_index.reset()
+                with self.assertNumQueries(0):
+                    email_index.load_snapshot()
+                self.assertIn(self.student.email, email_index.filter)
+                self.assertFalse(self.check(build_student(5).email))
+
+    def test_checks_do_not_wait_for_a_build(self):
+        """Test that while another thread builds the first filter, checks fall back to the indexed lookup"""
+        email_index._refreshing = True
+        self.assertIsNone(email_index.get())
+        with self.assertNumQueries(1):
+            self.assertTrue(self.check('nobody@example.com'))
+        self.assertFalse(self.check(self.student.email))
+        email_index._refreshing = False
+        self.assertTrue(self.check('warm.up@example.com'))
+        self.assertIsNotNone(email_index.filter)
+
+    def test_invalid_email_rejected(self):
+        """Test the 400 responses for a missing or malformed email"""
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'email': 'not-an-email'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data)
+
+    def test_bloom_filter_error_rate_and_budget(self):
+        """Test no false negatives, a false-positive rate near the target, and the memory cap"""
+        bloom = BloomFilter.for_capacity(5000, 0.01)
+        for index in range(5000):
+            bloom.add(f'member{index}@example.com')
+        self.assertTrue(all(f'member{index}@example.com' in bloom for index in range(5000)))
+        false_positives = sum(f'other{index}@example.com' in bloom for index in range(20000))
+        self.assertLess(false_positives / 20000, 0.02)
+        self.assertEqual(len(BloomFilter.for_capacity(10 ** 7, 0.001, max_bytes=1024).bits), 1024)
+
+
+class OnboardingAnalyticsTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('onboarding-analytics')
+
+    def counts(self, dimension):
+        return {
+            row.value: row.students
+            for row in OnboardingDailySummary.objects.filter(dimension=dimension)
+            if row.students
+        }
+
+    def snapshot(self):
+        return sorted(
+            OnboardingDailySummary.objects.filter(students__gt=0).values_list('day', 'dimension', 'value', 'students')
+        )
+
+    def test_save_update_and_delete_keep_counts(self):
+        """Test that creates count, updates move only the changed dimensions, and deletes subtract"""
+        student = build_student(1)
+        student.save()
+        build_student(2, gender='F').save()
+        self.assertEqual(self.counts('gender'), {'M': 1, 'F': 1})
+        self.assertEqual(self.counts('family_income'), {'50000-100000': 2})
+
+        response = self.client.patch(
+            reverse('student-onboarding-update', args=[student.pk]),
+            {'gender': 'F', 'family_income': '30000.00'}, format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.counts('gender'), {'F': 2})
+        self.assertEqual(self.counts('family_income'), {'25000-50000': 1, '50000-100000': 1})
+        self.assertEqual(self.counts('citizenship'), {'US': 2})
+
+        # An instance that never loaded its values is compared with the stored row
+        detached = build_student(1, id=student.pk, created_at=student.created_at, country='Canada', gender='F',
+                                 family_income='30000.00')
+        detached.save(full_clean=False)
+        self.assertEqual(self.counts('country'), {'Canada': 1, 'United States': 1})
+
+        StudentOnboarding.objects.get(pk=student.pk).delete()
+        self.assertEqual(self.counts('country'), {'United States': 1})
+        self.assertEqual(self.counts('gender'), {'F': 1})
+
+    def test_bulk_create_counted(self):
+        """Test that batch inserts, which send no post_save, update the summary"""
+        rows = []
+        for index in range(3):
+            row = dict(StudentOnboardingSerializer(build_student(index, has_family_abroad=index == 0)).data)
+            for field in ('id', 'created_at', 'updated_at'):
+                row.pop(field)
+            rows.append(row)
+        response = self.client.post(reverse('student-onboarding-batch-create'), rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.counts('has_family_abroad'), {'true': 1, 'false': 2})
+        self.assertEqual(self.counts('number_of_siblings'), {'2': 3})
+
+    def test_rebuild_matches_incremental(self):
+        """Test that rebuild_onboarding_summary reproduces the incrementally maintained table"""
+        for index in range(6):
+            build_student(index, gender='MF'[index % 2], family_income=str(index * 60000)).save()
+        student = StudentOnboarding.objects.get(email='student3@example.com')
+        student.citizenship = 'CA'
+        student.save()
+        incremental = self.snapshot()
+        out = io.StringIO()
+        call_command('rebuild_onboarding_summary', stdout=out)
+        self.assertIn('Rebuilt the analytics summary', out.getvalue())
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_migration_matches_incremental(self):
+        """Test that the data migration's frozen rebuild counts what the signals count"""
+        for index in range(6):
+            build_student(index, gender='MF'[index % 2], family_income=str(index * 60000)).save()
+        incremental = self.snapshot()
+        OnboardingDailySummary.objects.all().delete()
+        migration = importlib.import_module('onboarding.migrations.0008_onboarding_daily_summary')
+        migration.populate_summary(django_apps, SimpleNamespace(connection=connection))
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_grouping_and_date_range(self):
+        """Test day, month and total grouping over a date range, answered with one query"""
+        for index, created in enumerate([datetime(2024, 1, 5), datetime(2024, 1, 20), datetime(2024, 3, 2)]):
+            build_student(index).save()
+            StudentOnboarding.objects.filter(email=f'student{index}@example.com').update(
+                created_at=timezone.make_aware(created)
+            )
+        call_command('rebuild_onboarding_summary', stdout=io.StringIO())
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'dimensions': 'gender', 'group_by': 'month'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['dimensions']['gender'], [
+            {'period': '2024-01-01', 'counts': {'M': 2}},
+            {'period': '2024-03-01', 'counts': {'M': 1}},
+        ])
+
+        response = self.client.get(self.url, {'dimensions': 'gender', 'start': '2024-01-10', 'end': '2024-03-02'})
+        self.assertEqual([entry['period'] for entry in response.data['dimensions']['gender']], ['2024-01-20', '2024-03-02'])
+
+        response = self.client.get(self.url, {'dimensions': 'country,citizenship', 'group_by': 'total'})
+        self.assertEqual(response.data['dimensions']['country'], [{'period': None, 'counts': {'United States': 3}}])
+        self.assertEqual(response.data['dimensions']['citizenship'], [{'period': None, 'counts': {'US': 3}}])
+
+    def test_invalid_parameters_rejected(self):
+        """Test the 400 responses for unknown dimensions, groupings and malformed dates"""
+        for params in ({'dimensions': 'email'}, {'group_by': 'hour'}, {'start': '2024-13-01'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(next(iter(params)), response.data)
+
+
+# Project URLs with the async read views, for StudentOnboardingAsyncViewsTest
+@override_settings(ONBOARDING_CHANGES_SETTLE=0, ONBOARDING_CHANGES_POLL_INTERVAL=0.01)
+class ChangeFeedTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('student-onboarding-changes')
+        StudentOnboarding.objects.bulk_create(build_student(i) for i in range(5))
+        self.ids = list(StudentOnboarding.objects.order_by('updated_at', 'id').values_list('id', flat=True))
+
+    def test_batches_resume_from_cursor(self):
+        """Test that batches walk every change once, oldest first, and an update reappears after the cursor"""
+        seen = []
+        response = self.client.get(self.url, {'page_size': 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(row['id'] for row in response.data['results'])
+            if not response.data['has_more']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(seen, self.ids)
+
+        cursor = response.data['cursor']
+        response = self.client.get(self.url, {'cursor': cursor})
+        self.assertEqual(response.data['results'], [])
+        self.assertEqual(response.data['cursor'], cursor)
+
+        student = StudentOnboarding.objects.get(pk=self.ids[1])
+        student.city = 'Boston'
+        student.save()
+        response = self.client.get(self.url, {'cursor': cursor})
+        self.assertEqual([(row['id'], row['city']) for row in response.data['results']], [(self.ids[1], 'Boston')])
+        self.assertNotEqual(response.data['cursor'], cursor)
+
+    def test_sparse_fields(self):
+        """Test that ?fields= prunes the detail representation"""
+        response = self.client.get(self.url, {'fields': 'email'})
+        self.assertEqual(response.data['results'][0], {'email': 'student0@example.com'})
+
+    @override_settings(ONBOARDING_CHANGES_SETTLE=60)
+    def test_recent_changes_wait_to_settle(self):
+        """Test that rows younger than the settle delay are held back"""
+        StudentOnboarding.objects.filter(pk=self.ids[0]).update(updated_at=timezone.now() - timedelta(minutes=5))
+        response = self.client.get(self.url)
+        self.assertEqual([row['id'] for row in response.data['results']], [self.ids[0]])
+
+    def test_wait_times_out_with_empty_batch(self):
+        """Test that a long poll with nothing new returns an empty batch after the wait"""
+        cursor = self.client.get(self.url).data['cursor']
+        started = time.monotonic()
+        response = self.client.get(self.url, {'cursor': cursor, 'wait': '0.05'})
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+
+    def test_invalid_parameters(self):
+        """Test that bad wait and page_size answer 400 and a bad cursor 404"""
+        for params in ({'wait': 'soon'}, {'wait': '3600'}, {'page_size': 'ten'}):
+            self.assertEqual(self.client.get(self.url, params).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'cursor': 'garbage'}).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_query_uses_updated_index(self):
+        """Test that a batch after a cursor searches the (updated_at, id) index"""
+        cursor = self.client.get(self.url, {'page_size': 2}).data['cursor']
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url, {'cursor': cursor})
+        self.assertIn('SEARCH student_onboarding USING INDEX student_updated_id_idx', query_plan(context[-1]['sql']))
+
+
+def archive_old_students(block_size=3):
+    """Run archive_students with the default cutoff, silencing its report"""
+    call_command('archive_students', block_size=block_size, stdout=io.StringIO(), stderr=io.StringIO())
+
+
+def age_students(ids, days=400):
+    """Move the created_at and updated_at of ``ids`` ``days`` back, one second apart"""
+    for offset, pk in enumerate(ids):
+        moment = timezone.now() - timedelta(days=days, seconds=offset)
+        StudentOnboarding.objects.filter(pk=pk).update(created_at=moment, updated_at=moment)
+
+
+class ArchiveTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        cms.invalidate()
+        for i in range(8):
+            build_student(
+                i, gender='F' if i % 2 else 'M', has_family_abroad=i % 3 == 0,
+                countries_abroad='DE' if i % 3 == 0 else None, number_of_siblings=i,
+            ).save()
+        ids = list(StudentOnboarding.objects.order_by('id').values_list('id', flat=True))
+        self.old, self.recent = ids[:5], ids[5:]
+        age_students(self.old)
+        rebuild_summary()
+        self.list_url = reverse('student-onboarding-list')
+
+    def detail(self, pk, **params):
+        cache.clear()
+        return self.client.get(reverse('student-onboarding-detail', kwargs={'student_id': pk}), params)
+
+    def walk(self, params):
+        """Ids of every cursor page of the list"""
+        seen = []
+        response = self.client.get(self.list_url, dict(params, pagination='cursor', page_size=2))
+        while True:
+            seen.extend(row['id'] for row in response.data['results'])
+            if not response.data['next']:
+                return seen
+            response = self.client.get(response.data['next'])
+
+    def test_command_moves_old_students(self):
+        """Test that old students leave the live tables for blocks and entries, and analytics still count them"""
+        summary = sorted(OnboardingDailySummary.objects.values_list('day', 'dimension', 'value', 'students'))
+        call_command('archive_students', dry_run=True, stdout=io.StringIO())
+        self.assertEqual(StudentOnboarding.objects.count(), 8)
+
+        archive_old_students()
+        self.assertEqual(list(StudentOnboarding.objects.order_by('id').values_list('id', flat=True)), self.recent)
+        self.assertEqual(sorted(StudentArchiveEntry.objects.values_list('id', flat=True)), self.old)
+        self.assertEqual(list(StudentArchiveBlock.objects.values_list('students', flat=True)), [3, 2])
+        self.assertFalse(StudentFamilyAbroad.objects.filter(student_id__in=self.old).exists())
+        self.assertEqual(
+            sorted(OnboardingDailySummary.objects.values_list('day', 'dimension', 'value', 'students')), summary
+        )
+        rebuild_summary()
+        self.assertEqual(
+            sorted(OnboardingDailySummary.objects.values_list('day', 'dimension', 'value', 'students')), summary
+        )
+
+    def test_detail_falls_through_to_archive(self):
+        """Test that an archived student keeps its detail payload and ETag, but cannot be updated"""
+        before = self.detail(self.old[0])
+        sparse = self.detail(self.old[0], fields='email,family_income,date_of_birth')
+        archive_old_students()
+        after = self.detail(self.old[0])
+        self.assertEqual(after.status_code, status.HTTP_200_OK)
+        self.assertEqual(after.data, before.data)
+        self.assertEqual(after['ETag'], before['ETag'])
+        self.assertEqual(self.detail(self.old[0], fields='email,family_income,date_of_birth').data, sparse.data)
+        self.assertEqual(self.detail(999999).status_code, status.HTTP_404_NOT_FOUND)
+
+        update_url = reverse('student-onboarding-update', kwargs={'student_id': self.old[0]})
+        response = self.client.patch(update_url, {'city': 'Boston'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_include_archived(self):
+        """Test that ?include_archived=1 lists both tiers as the list did before archiving, filters included"""
+        queries = ({'page_size': 3}, {'page_size': 3, 'page': 2}, {'gender': 'F'}, {'family_abroad_in': 'DE'})
+        before = [self.client.get(self.list_url, query).data for query in queries]
+        walked = self.walk({})
+        archive_old_students()
+        for query, expected in zip(queries, before):
+            self.assertEqual(self.client.get(self.list_url, dict(query, include_archived='1')).data, expected)
+        self.assertEqual(self.walk({'include_archived': 'true'}), walked)
+        self.assertEqual(self.walk({}), [pk for pk in walked if pk in self.recent])
+        self.assertEqual(self.client.get(self.list_url).data['count'], 3)
+
+        response = self.client.get(self.list_url, {'include_archived': '1', 'q': 'john'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.list_url, {'include_archived': 'maybe'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_include_archived(self):
+        """Test that the export covers archived students only with ?include_archived=1"""
+        export_url = reverse('student-onboarding-export')
+        before = b''.join(self.client.get(export_url, {'output': 'ndjson'}).streaming_content)
+        archive_old_students()
+        after = b''.join(self.client.get(export_url, {'output': 'ndjson', 'include_archived': '1'}).streaming_content)
+        self.assertEqual(after, before)
+        live = b''.join(self.client.get(export_url, {'output': 'ndjson'}).streaming_content)
+        self.assertEqual([json.loads(line)['id'] for line in live.splitlines()], self.recent)
+
+    def test_page_merges_index_scans(self):
+        """Test that a page of both tiers reads the two (created_at, id) indexes in order rather than sorting"""
+        archive_old_students()
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.list_url, {'include_archived': '1', 'pagination': 'cursor'})
+        plan = query_plan(context[-1]['sql'])
+        self.assertIn('MERGE', plan)
+        self.assertIn('student_created_id_idx', plan)
+        self.assertIn('archive_created_id_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_archived_emails_stay_taken(self):
+        """Test that no write path and no availability check frees the email of an archived student"""
+        archive_old_students()
+        email_index.reset()
+        self.addCleanup(email_index.reset)
+        email = StudentArchiveEntry.objects.get(id=self.old[0]).email
+        payload = dict(StudentOnboardingSerializer(build_student(20, email=email)).data)
+        for field in ('id', 'created_at', 'updated_at'):
+            payload.pop(field)
+
+        response = self.client.post(reverse('student-onboarding-create'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['email'], [DUPLICATE_EMAIL_ERROR])
+        response = self.client.post(reverse('student-onboarding-batch-create'), [payload], format='json')
+        self.assertEqual(response.data['results'][0]['errors'], {'email': [DUPLICATE_EMAIL_ERROR]})
+        update_url = reverse('student-onboarding-update', kwargs={'student_id': self.recent[0]})
+        response = self.client.patch(update_url, {'email': email}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.patch(
+            reverse('student-onboarding-bulk-update'), [{'id': self.recent[0], 'changes': {'email': email}}],
+            format='json',
+        )
+        self.assertEqual(response.data['results'][0]['errors'], {'email': [DUPLICATE_EMAIL_ERROR]})
+        response = self.client.get(reverse('email-available'), {'email': email})
+        self.assertFalse(response.data['available'])
+        self.assertEqual(StudentOnboarding.objects.filter(email=email).count(), 0)
+
+    def test_orm_save_checks_archived_emails(self):
+        """Test that model validation rejects an archived email, so direct ORM saves keep it taken too"""
+        archive_old_students()
+        email = StudentArchiveEntry.objects.get(id=self.old[0]).email
+        with self.assertRaises(ValidationError) as raised:
+            build_student(20, email=email).save()
+        self.assertIn('email', raised.exception.message_dict)
+        student = StudentOnboarding.objects.get(id=self.recent[0])
+        student.email = email
+        with self.assertRaises(ValidationError):
+            student.save()
+
+    def test_free_email_skips_archive_lookup(self):
+        """Test that once the email filter is built, a write of an email it rules out does not query the archive"""
+        archive_old_students()
+        email_index.reset()
+        self.addCleanup(email_index.reset)
+        email_index.get()
+        payload = dict(StudentOnboardingSerializer(build_student(20)).data)
+        for field in ('id', 'created_at', 'updated_at'):
+            payload.pop(field)
+        update_url = reverse('student-onboarding-update', kwargs={'student_id': self.recent[0]})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(reverse('student-onboarding-create'), payload, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            build_student(21).save()
+            response = self.client.patch(update_url, {'first_name': 'Renamed'}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([query for query in context.captured_queries if 'student_archive_entry' in query['sql']])
+
+
+class APIProfileTest(TestCase):
+    def setUp(self):
+        self.profile = importlib.import_module('student_onboarding.settings_api')
+
+    def test_profile_drops_ui_components(self):
+        """Test that the API-only profile leaves out the UI apps, middleware and browsable renderer"""
+        for app in ('django.contrib.admin', 'django.contrib.sessions', 'django.contrib.messages',
+                    'django.contrib.staticfiles'):
+            self.assertNotIn(app, self.profile.INSTALLED_APPS)
+        self.assertIn('onboarding', self.profile.INSTALLED_APPS)
+        self.assertFalse(any('session' in name or 'csrf' in name for name in map(str.lower, self.profile.MIDDLEWARE)))
+        self.assertEqual(self.profile.REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'], ['rest_framework.renderers.JSONRenderer'])
+        self.assertTrue(self.profile.ONBOARDING_SERIALIZE_WRITES)
+
+    def test_lean_middleware_serves_api(self):
+        """Test reads and writes through the profile's middleware stack, with no cookies or frame headers"""
+        build_student(1).save()
+        payload = dict(StudentOnboardingSerializer(build_student(2)).data)
+        for field in ('id', 'created_at', 'updated_at'):
+            payload.pop(field)
+        with self.settings(MIDDLEWARE=self.profile.MIDDLEWARE):
+            response = self.client.get(reverse('student-onboarding-list'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json()['count'], 1)
+            self.assertNotIn('X-Frame-Options', response)
+            response = self.client.post(reverse('student-onboarding-create'), payload, content_type='application/json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertFalse(response.cookies)
+
+    def test_urls_without_admin(self):
+        """Test that the project URLconf leaves out /admin/ when the admin app is not installed"""
+        import student_onboarding.urls as project_urls
+
+        try:
+            with self.settings(INSTALLED_APPS=self.profile.INSTALLED_APPS):
+                importlib.reload(project_urls)
+                self.assertEqual([str(pattern.pattern) for pattern in project_urls.urlpatterns], ['metrics', 'api/'])
+        finally:
+            importlib.reload(project_urls)
+        self.assertEqual(str(project_urls.urlpatterns[0].pattern), 'admin/')
+
+
+urlpatterns = [path('api/', include('onboarding.async_urls'))]
+
+
+class StudentOnboardingAsyncViewsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        cms.invalidate()
+        StudentOnboarding.objects.bulk_create(
+            build_student(i, gender='F' if i % 3 else 'M', first_name=f'Name{i}') for i in range(15)
+        )
+        self.student = StudentOnboarding.objects.order_by('id').first()
+
+    def assertSameResponse(self, url, **headers):
+        sync_response = self.client.get(url, **headers)
+        cache.clear()
+        with self.settings(ROOT_URLCONF=__name__):
+            async_response = self.client.get(url, **headers)
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.content, sync_response.content)
+        return sync_response, async_response
+
+    def test_list_matches_sync_view(self):
+        """Test that the async list renders the same bytes for every pagination and filter mode"""
+        list_url = reverse('student-onboarding-list')
+        StudentFamilyAbroad.objects.create(student=self.student, country='DE')
+        for query in ('', '?page=2', '?gender=F', '?pagination=cursor&page_size=4', '?q=name1', '?page=9',
+                      '?family_abroad_in=DE,FR'):
+            self.assertSameResponse(list_url + query)
+
+        first = self.client.get(list_url, {'pagination': 'cursor', 'page_size': 4}).json()
+        self.assertSameResponse(first['next'])
+
+    def test_list_rejects_bad_filters_like_sync_view(self):
+        """Test that validation errors keep the DRF status and body"""
+        sync_response, _ = self.assertSameResponse(reverse('student-onboarding-list') + '?gender=Z')
+        self.assertEqual(sync_response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_detail_matches_sync_view(self):
+        """Test that the async detail returns the same payload, validators and 404"""
+        detail_url = reverse('student-onboarding-detail', kwargs={'student_id': self.student.id})
+        sync_response, async_response = self.assertSameResponse(detail_url)
+        self.assertEqual(async_response['ETag'], sync_response['ETag'])
+        self.assertEqual(async_response['Last-Modified'], sync_response['Last-Modified'])
+
+        with self.settings(ROOT_URLCONF=__name__):
+            response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=sync_response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertSameResponse(reverse('student-onboarding-detail', kwargs={'student_id': 999999}))
+
+    def test_sparse_fieldsets_match_sync_view(self):
+        """Test that the async list and detail apply ?fields= and ?exclude= like the DRF views"""
+        list_url = reverse('student-onboarding-list')
+        for query in ('?fields=email,gender', '?exclude=email&pagination=cursor&page_size=4', '?fields=nope'):
+            self.assertSameResponse(list_url + query)
+        detail_url = reverse('student-onboarding-detail', kwargs={'student_id': self.student.id})
+        sync_response, async_response = self.assertSameResponse(detail_url + '?fields=first_name,city')
+        self.assertEqual(async_response['ETag'], sync_response['ETag'])
+        self.assertSameResponse(detail_url + '?exclude=email,nope')
+
+    def test_dropdown_matches_sync_view(self):
+        """Test that the async dropdown endpoint serves the same bytes, ETag and errors"""
+        sync_response, async_response = self.assertSameResponse(reverse('dropdown-options') + '?fields=gender')
+        self.assertEqual(async_response['ETag'], sync_response['ETag'])
+        self.assertEqual(async_response['Cache-Control'], sync_response['Cache-Control'])
+        self.assertSameResponse(reverse('dropdown-options') + '?fields=nope')
+
+    @override_settings(ONBOARDING_CHANGES_SETTLE=0)
+    def test_changes_match_sync_view(self):
+        """Test that the async change feed serves the same batches and errors"""
+        changes_url = reverse('student-onboarding-changes')
+        first, _ = self.assertSameResponse(changes_url + '?page_size=4&fields=id,email')
+        self.assertSameResponse(first.json()['next'])
+        self.assertSameResponse(changes_url + '?cursor=garbage')
+        self.assertSameResponse(changes_url + '?wait=nope')
+
+    def test_archive_matches_sync_view(self):
+        """Test that the async list and detail read archived students like the DRF views"""
+        ids = list(StudentOnboarding.objects.order_by('id').values_list('id', flat=True))
+        age_students(ids[:8])
+        archive_old_students()
+        list_url = reverse('student-onboarding-list')
+        for query in ('?include_archived=1', '?include_archived=1&page=2&gender=F',
+                      '?include_archived=1&pagination=cursor&page_size=4', '?include_archived=1&q=name1'):
+            self.assertSameResponse(list_url + query)
+        detail_url = reverse('student-onboarding-detail', kwargs={'student_id': ids[0]})
+        sync_response, _ = self.assertSameResponse(detail_url)
+        self.assertEqual(sync_response.json()['email'], self.student.email)
+        self.assertSameResponse(detail_url + '?fields=first_name,city')
+
+    @override_settings(ROOT_URLCONF=__name__)
+    async def test_async_client_reads(self):
+        """Test the async views end to end on the event loop"""
+        response = await self.async_client.get(reverse('student-onboarding-list'), {'pagination': 'cursor'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['results']), 10)
+
+        detail_url = reverse('student-onboarding-detail', kwargs={'student_id': self.student.id})
+        for _ in range(2):
+            response = await self.async_client.get(detail_url)
+            self.assertEqual(response.json()['email'], self.student.email)
+
+        response = await self.async_client.post(reverse('dropdown-options'))
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
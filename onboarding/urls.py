@@ -2,9 +2,19 @@ from django.urls import path
 from .views import (
     StudentOnboardingListView,
     StudentOnboardingCreateView,
+    StudentOnboardingBatchCreateView,
+    StudentOnboardingBulkUpdateView,
+    StudentOnboardingChangesView,
+    StudentOnboardingExportView,
     StudentOnboardingDetailView,
+    StudentOnboardingSubmissionView,
     StudentOnboardingUpdateView,
+    email_available,
     get_dropdown_options,
+    onboarding_analytics,
+    profile_report_detail,
+    profile_report_download,
+    profile_report_list,
     api_documentation
 )
 
@@ -12,7 +22,17 @@ urlpatterns = [
     path('', api_documentation, name='api-docs'),
     path('student-onboarding/', StudentOnboardingListView.as_view(), name='student-onboarding-list'),
     path('student-onboarding/create/', StudentOnboardingCreateView.as_view(), name='student-onboarding-create'),
+    path('student-onboarding/changes/', StudentOnboardingChangesView.as_view(), name='student-onboarding-changes'),
+    path('student-onboarding/export/', StudentOnboardingExportView.as_view(), name='student-onboarding-export'),
+    path('student-onboarding/submissions/<uuid:submission_id>/', StudentOnboardingSubmissionView.as_view(), name='student-onboarding-submission'),
+    path('student-onboarding/batch/', StudentOnboardingBatchCreateView.as_view(), name='student-onboarding-batch-create'),
+    path('student-onboarding/bulk-update/', StudentOnboardingBulkUpdateView.as_view(), name='student-onboarding-bulk-update'),
     path('student-onboarding/<int:student_id>/', StudentOnboardingDetailView.as_view(), name='student-onboarding-detail'),
     path('student-onboarding/<int:student_id>/update/', StudentOnboardingUpdateView.as_view(), name='student-onboarding-update'),
+    path('profiles/', profile_report_list, name='profile-report-list'),
+    path('profiles/<str:report_id>/', profile_report_detail, name='profile-report-detail'),
+    path('profiles/<str:report_id>/download/', profile_report_download, name='profile-report-download'),
+    path('email-available/', email_available, name='email-available'),
+    path('analytics/', onboarding_analytics, name='onboarding-analytics'),
     path('dropdown-options/', get_dropdown_options, name='dropdown-options'),
 ] 
\ No newline at end of file
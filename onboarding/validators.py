@@ -1,16 +1,22 @@
 import re
 from django.core.exceptions import ValidationError
 
+# Compiled once at import; these run for every field of every write
+PHONE_STRIP_RE = re.compile(r'[^\d+]')
+PHONE_RE = re.compile(r'^\+?1?\d{9,15}$')
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+ZIPCODE_RE = re.compile(r'^[A-Za-z0-9\s-]{3,10}$')
+
 def validate_phone_number(value):
     """Validate phone number format with country code"""
     if not value:
         return value
     
     # Remove all non-digit characters except +
-    cleaned = re.sub(r'[^\d+]', '', value)
+    cleaned = PHONE_STRIP_RE.sub('', value)
     
     # Check if it starts with + and has 10-15 digits
-    if not re.match(r'^\+?1?\d{9,15}$', cleaned):
+    if not PHONE_RE.match(cleaned):
         raise ValidationError(
             'Phone number must be entered in the format: +1234567890 or 1234567890'
         )
@@ -23,8 +29,7 @@ def validate_email_format(value):
         return value
     
     # Basic email format validation
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_pattern, value):
+    if not EMAIL_RE.match(value):
         raise ValidationError('Invalid email format')
     
     return value
@@ -35,7 +40,7 @@ def validate_zipcode(value):
         return value
     
     # Allow alphanumeric zipcodes (international)
-    if not re.match(r'^[A-Za-z0-9\s-]{3,10}$', value):
+    if not ZIPCODE_RE.match(value):
         raise ValidationError('Invalid zipcode format')
     
     return value 
\ No newline at end of file
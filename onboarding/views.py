@@ -1,16 +1,69 @@
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.generics import CreateAPIView, RetrieveAPIView, UpdateAPIView, ListAPIView
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
-from .models import StudentOnboarding
-from .serializers import StudentOnboardingSerializer, StudentOnboardingListSerializer
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from .analytics import query_summary
+from .archive import archived_students, check_searchable, filtered_students, student_version
+from .bloom import might_exist
+from .bulk import taken_emails
+from .cache import build_detail_entry, detail_cache_timeout, detail_version, get_cached_detail, sparse_detail_entry
+from .changes import ChangeFeed
+from .cms import get_encoded_options, resolve_option_fields
+from .database import run_write
+from .models import OnboardingSubmission, StudentOnboarding
+from .metrics import registry as metrics_registry
+from .pagination import StudentKeysetPagination, StudentOnboardingPagination
+from .representations import STUDENT_DETAIL, STUDENT_LIST_ITEM, sparse_serializer
+from .responses import EncodedJSONResponse
+from .search import search_students
+from .submissions import check_submission_schema, enqueue_submission
+from .validators import validate_email_format
+from .serializers import (
+    StudentOnboardingSerializer,
+    StudentOnboardingListSerializer,
+    StudentOnboardingBatchSerializer,
+    StudentOnboardingBulkUpdateSerializer,
+    StudentOnboardingFilterUpdateSerializer,
+)
 
 class StudentOnboardingListView(ListAPIView):
     """List all student onboarding records"""
-    queryset = StudentOnboarding.objects.all().order_by('-created_at')
+    queryset = StudentOnboarding.objects.all().order_by('-created_at', '-id')
     serializer_class = StudentOnboardingListSerializer
+    pagination_class = StudentOnboardingPagination
+
+    def get_queryset(self, counting=False):
+        queryset = filtered_students(super().get_queryset(), self.request.query_params, counting)
+        term = self.request.query_params.get('q', '').strip()
+        if term:
+            check_searchable(queryset)
+            queryset = search_students(queryset, term)
+        return queryset
+
+    def get_count_queryset(self):
+        """The same rows as get_queryset, in the form that is cheapest to count"""
+        return self.get_queryset(counting=True)
+
+    def list(self, request, *args, **kwargs):
+        # Page over dict rows holding only the requested columns and render
+        # them with the compiled serializer; cursor links need the position too
+        fieldset = sparse_serializer(STUDENT_LIST_ITEM, request.query_params)
+        extra = StudentKeysetPagination.position_fields if self.paginator.use_keyset(request) else ()
+        queryset = fieldset.values(self.filter_queryset(self.get_queryset()), extra)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fieldset.many(page))
+        return Response(fieldset.many(queryset))
 
 class StudentOnboardingCreateView(CreateAPIView):
     """Create a new student onboarding record"""
@@ -18,24 +71,192 @@ class StudentOnboardingCreateView(CreateAPIView):
     serializer_class = StudentOnboardingSerializer
     
     def create(self, request, *args, **kwargs):
+        if getattr(settings, 'ONBOARDING_QUEUED_CREATES', False):
+            return self.enqueue(request)
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            student = serializer.save()
+            student = run_write(serializer.save)
             return Response({
                 'message': 'Student onboarding created successfully',
                 'student_id': student.id,
-                'data': StudentOnboardingSerializer(student).data
+                'data': STUDENT_DETAIL.from_instance(student)
             }, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def enqueue(self, request):
+        # Queued mode: schema checks only; process_submissions validates and inserts
+        data = request.data.dict() if hasattr(request.data, 'dict') else request.data
+        errors = check_submission_schema(data)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        submission = enqueue_submission(data)
+        status_url = request.build_absolute_uri(
+            reverse('student-onboarding-submission', kwargs={'submission_id': submission.id})
+        )
+        return Response({
+            'message': 'Student onboarding submission accepted',
+            'submission_id': str(submission.id),
+            'status': submission.status,
+            'status_url': status_url,
+        }, status=status.HTTP_202_ACCEPTED, headers={'Location': status_url})
+
+class StudentOnboardingSubmissionView(APIView):
+    """Status of a queued create; carries the student_id once it has been processed"""
+
+    def get(self, request, submission_id):
+        submission = get_object_or_404(OnboardingSubmission.objects.defer('payload'), id=submission_id)
+        data = {
+            'submission_id': str(submission.id),
+            'status': submission.status,
+            'created_at': submission.created_at,
+            'processed_at': submission.processed_at,
+        }
+        if submission.status == OnboardingSubmission.CREATED:
+            data['student_id'] = submission.student_id
+            data['student_url'] = request.build_absolute_uri(
+                reverse('student-onboarding-detail', kwargs={'student_id': submission.student_id})
+            )
+        elif submission.status == OnboardingSubmission.FAILED:
+            data['errors'] = submission.errors
+        return Response(data)
+
+class StudentOnboardingBatchCreateView(CreateAPIView):
+    """Create many student onboarding records in one request with a per-row report"""
+    queryset = StudentOnboarding.objects.all()
+    serializer_class = StudentOnboardingBatchSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            max_length=getattr(settings, 'ONBOARDING_BATCH_MAX_SIZE', 1000),
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        results = [None] * len(request.data)
+        for index, errors in serializer.row_errors.items():
+            results[index] = {'index': index, 'status': 'error', 'errors': errors}
+        for index, outcome in zip(serializer.valid_indexes, run_write(serializer.save)):
+            if isinstance(outcome, StudentOnboarding):
+                results[index] = {'index': index, 'status': 'created', 'student_id': outcome.id}
+            else:
+                results[index] = {'index': index, 'status': 'error', 'errors': outcome}
+
+        created = sum(1 for result in results if result['status'] == 'created')
+        failed = len(results) - created
+        if not failed:
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({
+            'message': f'{created} student onboarding records created, {failed} failed',
+            'created': created,
+            'failed': failed,
+            'results': results,
+        }, status=response_status)
+
+def item_id(item):
+    """The id a bulk update item names, as sent, for its report entry"""
+    return item.get('id') if isinstance(item, dict) else None
+
+class StudentOnboardingBulkUpdateView(APIView):
+    """
+    Partially update many student onboarding records in one request: a list of
+    ``{"id", "changes"}`` objects with a per-id report, or one
+    ``{"filter", "set"}`` object applied as a single UPDATE
+    """
+
+    def patch(self, request, *args, **kwargs):
+        if isinstance(request.data, dict):
+            return self.update_matching(request)
+        serializer = StudentOnboardingBulkUpdateSerializer(
+            data=request.data,
+            many=True,
+            partial=True,
+            max_length=getattr(settings, 'ONBOARDING_BATCH_MAX_SIZE', 1000),
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        results = [None] * len(request.data)
+        for index, errors in serializer.row_errors.items():
+            results[index] = {'index': index, 'id': item_id(request.data[index]), 'status': 'error', 'errors': errors}
+        for index, outcome in zip(serializer.valid_indexes, run_write(serializer.save)):
+            if isinstance(outcome, StudentOnboarding):
+                results[index] = {'index': index, 'id': outcome.id, 'status': 'updated'}
+            else:
+                results[index] = {'index': index, 'id': item_id(request.data[index]), 'status': 'error', 'errors': outcome}
+
+        updated = sum(1 for result in results if result['status'] == 'updated')
+        failed = len(results) - updated
+        if not failed:
+            response_status = status.HTTP_200_OK
+        elif updated:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({
+            'message': f'{updated} student onboarding records updated, {failed} failed',
+            'updated': updated,
+            'failed': failed,
+            'results': results,
+        }, status=response_status)
+
+    def update_matching(self, request):
+        serializer = StudentOnboardingFilterUpdateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        ids = run_write(serializer.save)
+        return Response({
+            'message': f'{len(ids)} student onboarding records updated',
+            'updated': len(ids),
+        }, status=status.HTTP_200_OK)
+
 class StudentOnboardingDetailView(RetrieveAPIView):
     """Retrieve a specific student onboarding record"""
     queryset = StudentOnboarding.objects.all()
     serializer_class = StudentOnboardingSerializer
     lookup_field = 'student_id'
     
-    def get_object(self):
-        return get_object_or_404(StudentOnboarding, id=self.kwargs['student_id'])
+    def retrieve(self, request, *args, **kwargs):
+        # Cache hits read only updated_at and skip the serializer
+        fieldset = sparse_serializer(STUDENT_DETAIL, request.query_params)
+        student_id = self.kwargs['student_id']
+        queryset = self.get_queryset()
+        entry = version = None
+        if detail_cache_timeout():
+            # Entries are keyed by updated_at, so any process's entry for it is current
+            version = student_version(queryset, student_id)
+            if version is None:
+                raise Http404
+            entry = get_cached_detail(student_id, version[0])
+        if entry is None:
+            row = None
+            if version is None or not version[1]:
+                row = fieldset.values(queryset, ('id', 'updated_at')).filter(id=student_id).first()
+            if row is None:
+                # Not live: the record may have been archived (onboarding.archive)
+                archived = archived_students().using(queryset.db)
+                row = get_object_or_404(fieldset.values(archived, ('id', 'updated_at')), id=student_id)
+            if fieldset is STUDENT_DETAIL:
+                entry = build_detail_entry(row['id'], row['updated_at'], STUDENT_DETAIL.to_representation(row))
+            else:
+                # Sparse misses read only the requested columns and are not cached
+                entry = dict(detail_version(row['id'], row['updated_at']), data=fieldset.to_representation(row))
+        if fieldset is not STUDENT_DETAIL:
+            entry = sparse_detail_entry(entry, fieldset.fields)
+
+        response = get_conditional_response(
+            request, etag=entry['etag'], last_modified=entry['last_modified']
+        )
+        if response is None:
+            response = Response(entry['data'])
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(entry['last_modified'])
+        return response
 
 class StudentOnboardingUpdateView(UpdateAPIView):
     """Update a specific student onboarding record"""
@@ -51,58 +272,111 @@ class StudentOnboardingUpdateView(UpdateAPIView):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         if serializer.is_valid():
-            student = serializer.save()
+            student = run_write(serializer.save)
+            data = STUDENT_DETAIL.from_instance(student)
+            # Prime the cache for the record's new version
+            build_detail_entry(student.id, student.updated_at, data)
             return Response({
                 'message': 'Student onboarding updated successfully',
-                'data': StudentOnboardingSerializer(student).data
+                'data': data
             }, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class StudentOnboardingExportView(APIView):
+    """Stream every matching student onboarding record as CSV or NDJSON"""
+
+    def get(self, request, *args, **kwargs):
+        # Imported on first use, like onboarding.profiling below: API workers rarely need them
+        from .exports import CONTENT_TYPES, EXPORT_FORMATS, resolve_export_fields, stream_export
+
+        output_format = request.query_params.get('output', 'csv')
+        if output_format not in EXPORT_FORMATS:
+            return Response(
+                {'output': [f'Must be one of: {", ".join(EXPORT_FORMATS)}.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        fields = resolve_export_fields(request.query_params.get('fields'), request.query_params.get('exclude'))
+        queryset = filtered_students(StudentOnboarding.objects.all(), request.query_params)
+
+        response = StreamingHttpResponse(
+            stream_export(queryset, output_format, fields),
+            content_type=CONTENT_TYPES[output_format]
+        )
+        response['Content-Disposition'] = f'attachment; filename="student-onboarding.{output_format}"'
+        return response
+
+class StudentOnboardingChangesView(APIView):
+    """Records created or updated after a cursor, for incremental sync (see onboarding.changes)"""
+
+    def get(self, request, *args, **kwargs):
+        # A long poll holds this worker thread; under ASGI the async view waits without one
+        feed = ChangeFeed(request.query_params)
+        return Response(feed.response_data(feed.read(), request))
+
 @api_view(['GET'])
 def get_dropdown_options(request):
-    """Get dropdown options for various fields (CMS simulation)"""
-    options = {
-        'gender': [
-            {'value': 'M', 'label': 'Male'},
-            {'value': 'F', 'label': 'Female'},
-            {'value': 'O', 'label': 'Other'},
-        ],
-        'citizenship': [
-            {'value': 'US', 'label': 'United States'},
-            {'value': 'CA', 'label': 'Canada'},
-            {'value': 'UK', 'label': 'United Kingdom'},
-            {'value': 'IN', 'label': 'India'},
-            {'value': 'AU', 'label': 'Australia'},
-            {'value': 'OTHER', 'label': 'Other'},
-        ],
-        'countries': [
-            {'value': 'US', 'label': 'United States'},
-            {'value': 'CA', 'label': 'Canada'},
-            {'value': 'UK', 'label': 'United Kingdom'},
-            {'value': 'IN', 'label': 'India'},
-            {'value': 'AU', 'label': 'Australia'},
-            {'value': 'DE', 'label': 'Germany'},
-            {'value': 'FR', 'label': 'France'},
-            {'value': 'JP', 'label': 'Japan'},
-        ],
-        'states': [
-            {'value': 'CA', 'label': 'California'},
-            {'value': 'NY', 'label': 'New York'},
-            {'value': 'TX', 'label': 'Texas'},
-            {'value': 'FL', 'label': 'Florida'},
-            {'value': 'IL', 'label': 'Illinois'},
-        ],
-        'professions': [
-            {'value': 'engineer', 'label': 'Engineer'},
-            {'value': 'doctor', 'label': 'Doctor'},
-            {'value': 'teacher', 'label': 'Teacher'},
-            {'value': 'lawyer', 'label': 'Lawyer'},
-            {'value': 'business', 'label': 'Business'},
-            {'value': 'other', 'label': 'Other'},
-        ]
-    }
-    
-    return Response(options)
+    """Get dropdown options for various fields from the CMS store"""
+    fields = resolve_option_fields(request.query_params.get('fields'))
+    data, content, etag = get_encoded_options(fields)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = EncodedJSONResponse(data, content)
+    response['ETag'] = etag
+    response['Cache-Control'] = f"public, max-age={getattr(settings, 'ONBOARDING_DROPDOWN_MAX_AGE', 3600)}"
+    return response
+
+@api_view(['GET'])
+def email_available(request):
+    """Whether an email is free to register; a filter miss answers without a query"""
+    email = request.query_params.get('email', '').strip()
+    if not email:
+        raise ValidationError({'email': ['This query parameter is required.']})
+    try:
+        validate_email_format(email)
+    except DjangoValidationError as exc:
+        raise ValidationError({'email': exc.messages})
+    available = not might_exist(email) or not taken_emails([email])
+    return Response({'email': email, 'available': available})
+
+@api_view(['GET'])
+def onboarding_analytics(request):
+    """Student counts per dimension value, grouped by day, week, month, year or in total"""
+    return Response(query_summary(request.query_params))
+
+def prometheus_metrics(request):
+    """Per-endpoint request metrics for this process in the Prometheus text format"""
+    return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_report_list(request):
+    """Stored request profiles, newest first (staff only)"""
+    # cProfile and pstats load only when a report is requested (or the profiling middleware is installed)
+    from .profiling import list_reports
+
+    return Response(list_reports())
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_report_detail(request, report_id):
+    """One stored request profile: SQL with plans, repeated queries and the call profile"""
+    from .profiling import load_report
+
+    report = load_report(report_id)
+    if report is None:
+        raise NotFound('Profile report not found.')
+    return Response(report)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_report_download(request, report_id):
+    """The raw cProfile dump of a stored profile, for pstats or snakeviz"""
+    from .profiling import report_path
+
+    path = report_path(report_id, 'prof')
+    if path is None:
+        raise NotFound('Profile report not found.')
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'{report_id}.prof')
 
 @api_view(['GET'])
 def api_documentation(request):
@@ -22,6 +22,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'onboarding.metrics.RequestMetricsMiddleware',
+    'onboarding.replicas.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -30,6 +32,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'onboarding.profiling.RequestProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'student_onboarding.urls'
@@ -58,6 +61,7 @@ DATABASES = {
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
+DATABASE_ROUTERS = ['onboarding.replicas.ReplicaRouter']
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -99,4 +103,65 @@ REST_FRAMEWORK = {
     ],
 }
 
-CORS_ALLOW_ALL_ORIGINS = True 
\ No newline at end of file
+CORS_ALLOW_ALL_ORIGINS = True
+
+# Batch onboarding
+ONBOARDING_BATCH_MAX_SIZE = 1000
+ONBOARDING_BULK_CHUNK_SIZE = 500
+
+# Queued creates: the create endpoint answers 202 and `manage.py process_submissions`
+# validates and inserts the queued submissions in batches of this size
+ONBOARDING_QUEUED_CREATES = False
+ONBOARDING_SUBMISSION_BATCH_SIZE = 500
+
+# Serialized detail payloads are cached per student and updated_at (seconds, 0 disables)
+ONBOARDING_DETAIL_CACHE_TIMEOUT = 300
+
+# CMS dropdown options: in-process snapshot lifetime and client Cache-Control max-age (seconds)
+ONBOARDING_DROPDOWN_CACHE_TTL = 60
+ONBOARDING_DROPDOWN_MAX_AGE = 3600
+
+# Email availability Bloom filter: target false-positive rate, memory cap (bytes), how often
+# each process picks up emails written by other processes (seconds), and an optional snapshot
+# file written by `manage.py rebuild_email_filter` and loaded at startup
+ONBOARDING_EMAIL_FILTER_ERROR_RATE = 0.001
+ONBOARDING_EMAIL_FILTER_MAX_BYTES = 16 * 1024 * 1024
+ONBOARDING_EMAIL_FILTER_SYNC_INTERVAL = 1.0
+ONBOARDING_EMAIL_FILTER_PATH = None
+
+# Rows fetched per round trip by the streaming export
+ONBOARDING_EXPORT_CHUNK_SIZE = 2000
+
+# Change feed: rows are served once updated_at is this many seconds old (covering writes that
+# wait for the SQLite lock after stamping updated_at), and ?wait= long polls up to the maximum,
+# checking for changes at the poll interval (seconds)
+ONBOARDING_CHANGES_SETTLE = 5.0
+ONBOARDING_CHANGES_MAX_WAIT = 30.0
+ONBOARDING_CHANGES_POLL_INTERVAL = 0.5
+
+# Archiving (manage.py archive_students): students not updated for this many days move to
+# compressed blocks of this many students; see onboarding.archive
+ONBOARDING_ARCHIVE_AFTER_DAYS = 365
+ONBOARDING_ARCHIVE_BLOCK_SIZE = 64
+
+# Serve the list, detail and dropdown reads with async views (run under ASGI)
+ONBOARDING_ASYNC_VIEWS = False
+
+# Request profiling: staff requests sending an "X-Profile" header are always profiled,
+# plus this fraction of all traffic (0 disables sampling). Reports are kept on local disk.
+ONBOARDING_PROFILING_SAMPLE_RATE = 0.0
+ONBOARDING_PROFILING_DIR = BASE_DIR / 'profiles'
+ONBOARDING_PROFILING_MAX_REPORTS = 200
+
+# SQLite tuning: pragmas run on every new connection, and API writes serialized per
+# process with retries on "database is locked". Enabled by settings_production.
+ONBOARDING_SQLITE_PRAGMAS = {}
+ONBOARDING_SERIALIZE_WRITES = False
+ONBOARDING_WRITE_RETRIES = 5
+ONBOARDING_WRITE_BACKOFF = 0.01
+
+# Read replicas: DATABASES aliases refreshed from "default" by `manage.py sync_replicas`.
+# Safe-method requests read from one synced within ONBOARDING_REPLICA_MAX_LAG seconds;
+# a client that wrote reads from the primary until a replica has caught up with it.
+ONBOARDING_READ_REPLICAS = []
+ONBOARDING_REPLICA_MAX_LAG = 5.0
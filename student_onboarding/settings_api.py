@@ -0,0 +1,55 @@
+"""
+API-only worker profile: the production profile without the browser UI.
+
+    DJANGO_SETTINGS_MODULE=student_onboarding.settings_api
+
+Drops the admin, sessions, messages and staticfiles apps, the session, CSRF,
+authentication, message and clickjacking middleware and DRF's browsable API
+renderer, so workers start faster and each request runs fewer middleware.
+Clients authenticate with HTTP Basic (the staff-only profile report
+endpoints); there are no session cookies, hence no CSRF checks.
+
+The admin runs on settings_production, which also owns the migrations of
+the dropped apps. Request profiling is installed only when
+ONBOARDING_PROFILING_SAMPLE_RATE samples traffic: the X-Profile header needs
+the authenticated user that AuthenticationMiddleware sets.
+"""
+from .settings_production import *  # noqa: F401,F403
+from .settings_production import INSTALLED_APPS, MIDDLEWARE, ONBOARDING_PROFILING_SAMPLE_RATE, REST_FRAMEWORK, TEMPLATES
+
+UI_APPS = (
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+)
+UI_MIDDLEWARE = (
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+)
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in UI_APPS]
+
+MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in UI_MIDDLEWARE]
+if not ONBOARDING_PROFILING_SAMPLE_RATE:
+    MIDDLEWARE.remove('onboarding.profiling.RequestProfilingMiddleware')
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'context_processors': [
+            processor for processor in TEMPLATES[0]['OPTIONS']['context_processors']
+            if processor != 'django.contrib.messages.context_processors.messages'
+        ],
+    },
+}]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+    'DEFAULT_AUTHENTICATION_CLASSES': ['rest_framework.authentication.BasicAuthentication'],
+}
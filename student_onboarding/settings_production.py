@@ -0,0 +1,45 @@
+"""
+Production profile for the SQLite backend.
+
+    DJANGO_SETTINGS_MODULE=student_onboarding.settings_production
+
+WAL lets readers run alongside the single writer, connections are kept
+across requests instead of reopened (and re-tuned) for each one, and API
+writes go through onboarding.database.run_write. Read replicas are listed
+in ONBOARDING_REPLICA_PATHS (comma separated files, kept in sync by
+``manage.py sync_replicas``).
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, SECRET_KEY
+
+DEBUG = False
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', SECRET_KEY)
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
+
+DATABASES['default'].update({
+    # Each worker thread keeps its connection for 10 minutes; broken ones are replaced
+    'CONN_MAX_AGE': 600,
+    'CONN_HEALTH_CHECKS': True,
+})
+
+ONBOARDING_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    # Durable at each checkpoint rather than each commit; safe with WAL
+    'synchronous': 'NORMAL',
+    # Wait up to 5s for another process's write lock before "database is locked"
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    # Negative values are KiB: a 64 MiB page cache per connection
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+ONBOARDING_SERIALIZE_WRITES = True
+
+ONBOARDING_READ_REPLICAS = []
+for index, path in enumerate(filter(None, os.environ.get('ONBOARDING_REPLICA_PATHS', '').split(','))):
+    # Tests read the primary rather than a copy of it
+    DATABASES[f'replica{index + 1}'] = {**DATABASES['default'], 'NAME': path, 'TEST': {'MIRROR': 'default'}}
+    ONBOARDING_READ_REPLICAS.append(f'replica{index + 1}')
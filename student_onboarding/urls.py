@@ -1,7 +1,15 @@
-from django.contrib import admin
+from django.apps import apps
+from django.conf import settings
 from django.urls import path, include
+from onboarding.views import prometheus_metrics
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('api/', include('onboarding.urls')),
-] 
\ No newline at end of file
+    path('metrics', prometheus_metrics, name='metrics'),
+    path('api/', include('onboarding.async_urls' if getattr(settings, 'ONBOARDING_ASYNC_VIEWS', False) else 'onboarding.urls')),
+]
+
+# API-only workers (settings_api) run without the admin
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))